@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from django.db.utils import OperationalError
 
 from utils.loggerhelper import LOGGER
+from utils.notificationhelper import unscheduling_batch
 
 
 class CustomUser(AbstractBaseUser):
@@ -77,6 +78,11 @@ class CustomUser(AbstractBaseUser):
         except (ValueError, IntegrityError, OperationalError) as err:
             LOGGER.error(f'Unsuccessful user creating. {err}')
 
+    def delete(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Delete user account and unschedule notifications of its ways with a single command."""
+        with unscheduling_batch():
+            return super().delete(*args, **kwargs)
+
     @classmethod
     def delete_by_id(cls, obj_id):
         """Delete user account found by id."""
@@ -0,0 +1,136 @@
+"""
+This module provides AsyncDaemon class that executes its jobs on a fixed-rate clock
+and EventLoopMixin that runs coroutines of a daemon with the thread pool.
+"""
+
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from daemons.base_daemon import Daemon
+from utils.loggerhelper import LOGGER
+
+
+STATS_INTERVAL = 60
+
+class EventLoopMixin:  # pylint: disable=too-few-public-methods
+    """
+    Provides running of coroutine function of a daemon in the new event loop,
+    whose blocking calls are executed in the thread pool of `max_workers` threads
+    available as `executor` while the loop is running.
+    """
+
+    max_workers = None
+    executor = None
+
+    def run_loop(self, coroutine_function):
+        """Run `coroutine_function` called with the event loop until it is complete."""
+        loop = asyncio.new_event_loop()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as self.executor:
+            try:
+                return loop.run_until_complete(coroutine_function(loop))
+            finally:
+                loop.close()
+
+
+class AsyncDaemon(EventLoopMixin, Daemon):  # pylint: disable=abstract-method
+    """
+    Provides daemon that starts its jobs every `frequency` seconds regardless
+    of duration of the previous executions. Jobs are executed concurrently in
+    a thread pool, so blocking network I/O of one job overlaps with the others,
+    and every execution is awaited no longer than `timeout` seconds.
+    Statistics of executions are reported every `stats_interval` seconds.
+    """
+
+    def __init__(self, frequency, timeout=None, max_workers=None, stats_interval=STATS_INTERVAL):
+        """Initializes the new AsyncDaemon instance."""
+        super().__init__(frequency)
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.stats_interval = stats_interval
+        self.executor = None
+        self.running_jobs = {}
+        self.skipped_executions = 0
+        self.timed_out_executions = 0
+
+    def get_jobs(self):
+        """
+        Return dictionary where key is name of job and value is callable
+        which is executed on every tick of the clock.
+        """
+        return {self.name: self.execute}
+
+    async def run_job(self, loop, name, job):
+        """Execute job in the thread pool and wait for it no longer than timeout."""
+        future = loop.run_in_executor(self.executor, job)
+        self.running_jobs[name] = future
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout or self.frequency)
+        except asyncio.TimeoutError:
+            self.timed_out_executions += 1
+            LOGGER.error(f'{self.name} job {name} was not finished in time.')
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.error(f'{self.name} job {name} was failed. {err}')
+
+    def tick(self, loop):
+        """
+        Start every job which is not still running since the previous tick.
+        Return list of started asyncio tasks.
+        """
+        started_tasks = []
+        for name, job in self.get_jobs().items():
+            running_job = self.running_jobs.get(name)
+            if running_job and not running_job.done():
+                self.skipped_executions += 1
+                LOGGER.warning(f'{self.name} job {name} was skipped as it is still running.')
+                continue
+
+            started_tasks.append(asyncio.ensure_future(self.run_job(loop, name, job), loop=loop))
+
+        return started_tasks
+
+    def get_stats(self):
+        """Return dictionary with counters of executions which were skipped or timed out."""
+        return {
+            'skipped_executions': self.skipped_executions,
+            'timed_out_executions': self.timed_out_executions
+        }
+
+    def report_stats(self):
+        """Log statistics of executions of the daemon."""
+        LOGGER.info(f'{self.name} stats: {self.get_stats()}')
+        return True
+
+    async def schedule(self, loop):
+        """
+        Tick while daemon is processed with period that does not drift by jobs duration.
+        Statistics are reported in the thread pool, so reporting does not delay ticks.
+        """
+        next_tick = loop.time()
+        next_report = next_tick + self.stats_interval
+        while self.is_processed:
+            self.tick(loop)
+            if loop.time() >= next_report:
+                next_report += self.stats_interval
+                loop.run_in_executor(self.executor, self.report_stats)
+
+            next_tick += self.frequency
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick += math.ceil(-delay / self.frequency) * self.frequency
+                delay = next_tick - loop.time()
+
+            await asyncio.sleep(delay)
+
+        running_jobs = [job for job in self.running_jobs.values() if not job.done()]
+        if running_jobs:
+            await asyncio.wait(running_jobs)
+
+        await loop.run_in_executor(self.executor, self.report_stats)
+
+    def run(self):
+        """Implements permanent execution of jobs on the fixed-rate clock."""
+        self.start()
+        self.run_loop(self.schedule)
+        self.stop()
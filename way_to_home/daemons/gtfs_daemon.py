@@ -3,8 +3,8 @@
 # pylint: disable=wrong-import-position
 
 import os
-import pickle
 import sys
+import time
 import django
 
 
@@ -15,43 +15,148 @@ django.setup()
 
 
 from django.conf import settings
-from utils.file_handlers import load_file
-from utils.easy_way import compile_file
-from utils.redishelper import REDIS_HELPER
+from utils.file_handlers import load_content, save_content, NOT_MODIFIED
+from utils.easy_way import compile_feed
+from utils.feeds import get_city_key, get_feeds
+from utils.gtfs_snapshot import pack_route, publish_snapshot, GTFS_DATA_KEY
 from utils.loggerhelper import LOGGER
-from daemons.base_daemon import Daemon
+from utils.redishelper import REDIS_HELPER
+from utils.vehicle_history import VehicleHistory, VEHICLES_HISTORY_KEY
+from daemons.async_daemon import AsyncDaemon
 from daemons.helper import parse_args
 
 
-class GTFSDaemon(Daemon):
-    """Daemon class that provides preparing GTFS data from EasyWay."""
+GTFS_STATS_KEY = 'gtfs_stats'
 
-    def execute(self):
+
+class FeedPoller:  # pylint: disable=too-many-instance-attributes
+    """Provides preparing GTFS realtime data of a single city from EasyWay."""
+
+    def __init__(self, city, url):
+        """Initializes the new FeedPoller instance."""
+        self.city = city
+        self.url = url
+        self.published_blocks = {}
+        self.published_version = None
+        self.feed_validators = {}
+        self.feed_timestamps = (0, 0)
+        self.applied_polls = 0
+        self.skipped_polls = 0
+        self.vehicle_history = VehicleHistory()
+        self.is_history_published = False
+
+    def poll(self):
         """
-        Defines commands to download file with data about Lviv
-        transport geolocation, compile the loaded file and insert
-        parsed necessary data into Redis in pickled representation.
+        Defines commands to download feed with data about transport geolocation
+        of the city into memory, compile the loaded feed and publish changed
+        routes into Redis namespace of the city in columnar snapshot representation.
+        Feed is downloaded only if it was changed since the last published one
+        and it is published only if its header or vehicles timestamps are newer.
         """
-        url = 'http://track.ua-gis.com/gtfs/lviv/vehicle_position'
-        redis_gtfs_key = 'gtfs_data'
-
-        loaded_file = load_file(url, save_to=settings.EASY_WAY_DIR)
-        if not loaded_file:
-            LOGGER.error('Unsuccessful gtfs data file load.')
+        feed_validators = dict(self.feed_validators)
+        loaded_content = load_content(self.url, validators=feed_validators)
+        if loaded_content == NOT_MODIFIED:
+            self.skipped_polls += 1
+            return True
+        if not loaded_content:
+            LOGGER.error(f'Unsuccessful gtfs data file load of {self.city}.')
             return False
 
-        gtfs_data = compile_file(loaded_file)
+        if settings.GTFS_ARCHIVE_FEEDS:
+            self.archive_feed(loaded_content)
+
+        compiled_feed = compile_feed(loaded_content, self.feed_timestamps)
+        feed_timestamps, gtfs_data = compiled_feed or (self.feed_timestamps, {})
+        if gtfs_data is None:
+            self.feed_timestamps = feed_timestamps
+            self.feed_validators = feed_validators
+            self.skipped_polls += 1
+            return True
+
         if not gtfs_data:
-            LOGGER.error('Unsuccessful compilation of gtfs data file.')
+            LOGGER.error(f'Unsuccessful compilation of gtfs data file of {self.city}.')
             return False
 
-        gtfs_data = pickle.dumps(gtfs_data)
-        if not REDIS_HELPER.set(redis_gtfs_key, gtfs_data):
-            LOGGER.error('Unsuccessful sets gtfs data in redis.')
+        version = feed_timestamps[0] or int(time.time())
+        blocks = {route_id: pack_route(vehicles) for route_id, vehicles in gtfs_data.items()}
+        snapshot_key = get_city_key(self.city, GTFS_DATA_KEY)
+        if not publish_snapshot(blocks, self.published_blocks, version=version, key=snapshot_key,
+                                published_version=self.published_version):
+            LOGGER.error(f'Unsuccessful sets gtfs data of {self.city} in redis.')
+            return False
+
+        updated_vehicles, stale_vehicles = self.vehicle_history.update(gtfs_data, version)
+        self.is_history_published = self.vehicle_history.publish(
+            updated_vehicles,
+            stale_vehicles,
+            replace=not self.is_history_published,
+            key=get_city_key(self.city, VEHICLES_HISTORY_KEY)
+        )
+        if not self.is_history_published:
+            LOGGER.error(f'Unsuccessful sets vehicles history of {self.city} in redis.')
+
+        self.published_blocks = blocks
+        self.published_version = version
+        self.feed_validators = feed_validators
+        self.feed_timestamps = feed_timestamps
+        self.applied_polls += 1
+        return True
+
+    def publish_stats(self):
+        """
+        Write counters of applied and skipped polls and version of the published
+        snapshot into Redis namespace of the city, so they are seen outside the daemon.
+        """
+        stats = {
+            'applied_polls': self.applied_polls,
+            'skipped_polls': self.skipped_polls,
+            'published_version': self.published_version or 0,
+            'reported_at': int(time.time())
+        }
+        if not REDIS_HELPER.update_hash(get_city_key(self.city, GTFS_STATS_KEY), mapping=stats):
+            LOGGER.error(f'Unsuccessful sets gtfs stats of {self.city} in redis.')
             return False
 
         return True
 
+    def archive_feed(self, content):
+        """Save raw content of the feed into EasyWay directory for debugging."""
+        file_name = f'{self.city}_vehicle_position_{int(time.time())}'
+        file_path = os.path.join(settings.EASY_WAY_DIR, file_name)
+        try:
+            save_content([content], file_path)
+        except OSError:
+            LOGGER.error(f'Raw gtfs feed was not archived to {file_path}.')
+
+
+class GTFSDaemon(AsyncDaemon):
+    """
+    Daemon class that provides preparing GTFS data from EasyWay
+    of every registered city concurrently in a single process.
+    """
+
+    def __init__(self, frequency, feeds=None):
+        """Initializes the new GTFSDaemon instance."""
+        super().__init__(frequency)
+        feeds = get_feeds() if feeds is None else feeds
+        self.pollers = {city: FeedPoller(city, feed['realtime_url'])
+                        for city, feed in feeds.items()}
+
+    def get_jobs(self):
+        """Return dictionary with polling job of every city."""
+        return {city: poller.poll for city, poller in self.pollers.items()}
+
+    def report_stats(self):
+        """Log statistics of executions and publish statistics of polls of every city."""
+        super().report_stats()
+        results = [poller.publish_stats() for poller in self.pollers.values()]
+        return all(results)
+
+    def execute(self):
+        """Defines commands to poll feeds of every city one by one."""
+        results = [poller.poll() for poller in self.pollers.values()]
+        return all(results)
+
 
 if __name__ == '__main__':
     FREQUENCY = parse_args()
@@ -5,7 +5,6 @@
 import os
 import sys
 import django
-from kombu.exceptions import OperationalError
 
 SOURCE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, SOURCE_PATH)
@@ -15,46 +14,35 @@ django.setup()
 
 from notification.models import Notification
 from daemons.base_daemon import Daemon
-from utils.celery_tasks import prepare_notification
 from utils.loggerhelper import LOGGER
 from utils.notificationhelper import (get_prepare_task_time,
                                       get_seconds_until_midnight,
-                                      set_notifications_tasks)
+                                      schedule_notifications)
 
 
 class NotifierDaemon(Daemon):
     """
-    Daemon class that provides assigning celery tasks to
-    parse the arrival time of certain public transport
-    before sending a notification to the user.
+    Daemon class that provides scheduling of today notifications
+    into the wheel from which celery tasks are dispatched to parse
+    the arrival time of certain public transport before sending
+    a notification to the user.
     """
 
     def execute(self):
         """
-        Defines commands to assign celery tasks to prepare notification
-        and insert dictionary with notifications ids and appropriate
-        identifiers of planned tasks in Redis in pickled representation.
+        Defines commands to put today notifications into minute buckets of
+        notifications wheel in Redis sorted set according to times at which
+        they have to be prepared. Wheel of the previous day is replaced.
         """
-        notifications_tasks = {}
-
-        today_notifications = Notification.get_today_scheduled()
-        for notification in today_notifications:
-            first_route = notification.way.get_route_by_position(position=0)
-            time_to_stop = first_route.time if first_route else None
-            task_time = get_prepare_task_time(notification.time, time_to_stop)
-
-            try:
-                celery_task = prepare_notification.apply_async(
-                    eta=task_time,
-                    kwargs={'notification_id': notification.id}
-                )
-                notifications_tasks[notification.id] = celery_task
-            except(TypeError, OperationalError) as err:
-                LOGGER.error(f'Failed to assign task for notification (id={notification.id}).{err}')
+        notifications_times = {
+            notification_id: get_prepare_task_time(notification_time, time_to_stop)
+            for notification_id, notification_time, time_to_stop
+            in Notification.get_today_schedule()
+        }
 
         self.frequency = get_seconds_until_midnight()
-        if not set_notifications_tasks(notifications_tasks):
-            LOGGER.error('Failed to set notifications tasks into redis.')
+        if not schedule_notifications(notifications_times, replace=True):
+            LOGGER.error('Failed to schedule notifications into redis.')
             return False
 
         return True
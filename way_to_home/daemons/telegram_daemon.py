@@ -0,0 +1,166 @@
+"""This module provides daemon to deliver queued telegram messages."""
+
+# pylint: disable=wrong-import-position
+
+import asyncio
+import os
+import sys
+import time
+import django
+
+SOURCE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SOURCE_PATH)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "way_to_home.settings")
+django.setup()
+
+
+from utils.loggerhelper import LOGGER
+from utils.senderhelper import deliver_telegram_message, CHANNEL_WORKERS, TELEGRAM_CHANNEL
+from utils.telegram_queue import (dequeue_telegram_messages, enqueue_telegram_messages,
+                                  acknowledge_telegram_message, restore_telegram_messages,
+                                  TokenBucket, GLOBAL_RATE, CHAT_RATE)
+from daemons.async_daemon import EventLoopMixin, STATS_INTERVAL
+from daemons.base_daemon import Daemon
+
+
+DEQUEUE_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+POLL_INTERVAL = 1
+
+
+class TelegramDaemon(EventLoopMixin, Daemon):  # pylint: disable=too-many-instance-attributes
+    """
+    Daemon class that provides delivering of telegram messages from the queue
+    by asyncio consumer within global and per chat rate limits of Telegram.
+    Sending of every message is executed in the thread pool, so the consumer
+    keeps as many requests in flight as the rate limits and the pool allow.
+    Message is acknowledged only after it was delivered, dropped or enqueued
+    again, so messages in flight are restored into the queue on the next start.
+    Statistics of delivering are logged every `stats_interval` seconds.
+    """
+
+    def __init__(self, frequency=POLL_INTERVAL, max_workers=CHANNEL_WORKERS[TELEGRAM_CHANNEL],
+                 stats_interval=STATS_INTERVAL):
+        """Initializes the new TelegramDaemon instance."""
+        super().__init__(frequency)
+        self.max_workers = max_workers
+        self.stats_interval = stats_interval
+        self.executor = None
+        self.global_bucket = TokenBucket(GLOBAL_RATE)
+        self.chat_buckets = {}
+        self.paused_until = 0
+        self.delivered_messages = 0
+        self.failed_messages = 0
+        self.rate_limited_messages = 0
+
+    def get_delay(self, chat_id):
+        """Reserve tokens to send message to the chat and return number of seconds to wait."""
+        chat_bucket = self.chat_buckets.get(chat_id)
+        if chat_bucket is None:
+            chat_bucket = self.chat_buckets[chat_id] = TokenBucket(CHAT_RATE)
+
+        return max(self.global_bucket.reserve(),
+                   chat_bucket.reserve(),
+                   self.paused_until - time.monotonic())
+
+    def handle_failure(self, message, retry_after):
+        """
+        Put message back into the queue unless all attempts of its sending were made.
+        Return False if message was not enqueued again, so it can not be acknowledged.
+        """
+        chat_id, text, attempt = message
+        if retry_after:
+            self.rate_limited_messages += 1
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            LOGGER.warning(f'{self.name} was rate limited by Telegram for {retry_after} seconds.')
+
+        if attempt + 1 >= MAX_ATTEMPTS:
+            self.failed_messages += 1
+            LOGGER.error(f'Telegram message was not delivered to chat with id={chat_id}')
+            return True
+
+        if not enqueue_telegram_messages([(chat_id, text)], attempt=attempt + 1):
+            LOGGER.error(f'Telegram message to chat with id={chat_id} was not enqueued again')
+            return False
+
+        return True
+
+    async def deliver(self, loop, message):
+        """
+        Wait for rate limits and send message in the thread pool. Pause set by
+        `retry_after` of Telegram while waiting is awaited before sending as well.
+        """
+        delay = self.get_delay(message[0])
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.paused_until - time.monotonic()
+
+        was_sent, retry_after = await loop.run_in_executor(
+            self.executor, deliver_telegram_message, message[0], message[1]
+        )
+        if was_sent:
+            self.delivered_messages += 1
+        elif not self.handle_failure(message, retry_after):
+            return
+
+        acknowledge_telegram_message(message)
+
+    def drop_idle_buckets(self):
+        """Drop buckets of chats which are full, so they do not grow in memory."""
+        self.chat_buckets = {chat_id: bucket for chat_id, bucket in self.chat_buckets.items()
+                             if not bucket.is_idle()}
+
+    async def drain(self, loop):
+        """Deliver batches of messages from the queue until it is empty."""
+        messages = dequeue_telegram_messages(DEQUEUE_BATCH_SIZE)
+        while messages:
+            await asyncio.wait([self.deliver(loop, message) for message in messages])
+            messages = dequeue_telegram_messages(DEQUEUE_BATCH_SIZE)
+
+    def get_stats(self):
+        """Return dictionary with counters of delivered, failed and rate limited messages."""
+        return {
+            'delivered_messages': self.delivered_messages,
+            'failed_messages': self.failed_messages,
+            'rate_limited_messages': self.rate_limited_messages
+        }
+
+    def report_stats(self):
+        """Log statistics of delivering of messages."""
+        LOGGER.info(f'{self.name} stats: {self.get_stats()}')
+        return True
+
+    async def consume(self, loop):
+        """
+        Drain the queue every `frequency` seconds while daemon is processed
+        and report statistics every `stats_interval` seconds and on stop.
+        """
+        next_report = loop.time() + self.stats_interval
+        while self.is_processed:
+            await self.drain(loop)
+            self.drop_idle_buckets()
+            if loop.time() >= next_report:
+                next_report = loop.time() + self.stats_interval
+                self.report_stats()
+            await asyncio.sleep(self.frequency)
+
+        self.report_stats()
+
+    def execute(self):
+        """Defines commands to deliver messages from the queue until it is empty."""
+        self.run_loop(self.drain)
+        return True
+
+    def run(self):
+        """Implements permanent delivering of messages from the queue."""
+        self.start()
+        restored = restore_telegram_messages()
+        if restored:
+            LOGGER.warning(f'{restored} not acknowledged telegram messages were restored.')
+        self.run_loop(self.consume)
+        self.stop()
+
+
+if __name__ == '__main__':
+    TELEGRAM_DAEMON = TelegramDaemon()
+    TELEGRAM_DAEMON.run()
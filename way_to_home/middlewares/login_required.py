@@ -17,6 +17,10 @@ GUESTS_PATHS = [
     '/api/v1/user/confirm_reset_password'
 ]
 
+PUBLIC_PATHS = [
+    '/api/v1/telegram/webhook'
+]
+
 
 class LoginRequiredMiddleware:  # pylint: disable=too-few-public-methods
     """
@@ -28,7 +32,7 @@ class LoginRequiredMiddleware:  # pylint: disable=too-few-public-methods
         """Initialize middleware instance."""
         self.get_response = get_response
 
-    def __call__(self, request):
+    def __call__(self, request):  # pylint: disable=too-many-return-statements
         """Provide JSON check and authentication validations."""
         if not request.path_info.startswith('/api'):
             response = self.get_response(request)
@@ -40,6 +44,11 @@ class LoginRequiredMiddleware:  # pylint: disable=too-few-public-methods
             except json.JSONDecodeError:
                 return RESPONSE_400_INVALID_DATA
 
+        for path in PUBLIC_PATHS:
+            if request.path_info.startswith(path):
+                response = self.get_response(request)
+                return response
+
         for path in GUESTS_PATHS:
             if request.path_info.startswith(path):
                 if request.user.is_authenticated:
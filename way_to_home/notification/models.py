@@ -2,11 +2,14 @@
 
 from datetime import date
 
-from django.db import models, IntegrityError
+from django.db import models, router, IntegrityError
+from django.db.models import OuterRef, Subquery
 from django.db.utils import OperationalError
 
 from utils.abstract_models import AbstractModel
 from utils.loggerhelper import LOGGER
+from utils.notificationhelper import unschedule_notifications
+from route.models import Route
 from way.models import Way
 
 
@@ -61,6 +64,31 @@ class Notification(AbstractModel):
         except (ValueError, IntegrityError, OperationalError) as err:
             LOGGER.error(f'Unsuccessful notification creating. {err}')
 
+    @classmethod
+    def delete_by_ids(cls, obj_ids):
+        """
+        Delete notifications, found by ids, with a single statement without sending
+        delete signals for every notification, so ones scheduled for today are removed
+        from notifications wheel with a single command. Return number of deleted
+        notifications or None.
+        """
+        notifications = cls.objects.filter(id__in=obj_ids)
+        try:
+            today_ids = list(cls.get_today_scheduled().filter(
+                id__in=obj_ids
+            ).values_list('id', flat=True))
+            deleted = notifications._raw_delete(  # pylint: disable=protected-access
+                using=router.db_for_write(cls)
+            )
+        except OperationalError as err:
+            LOGGER.error(f'Notifications with ids={obj_ids} were not deleted. {err}')
+            return None
+
+        if today_ids and not unschedule_notifications(today_ids):
+            LOGGER.error(f'Failed to unschedule notifications (ids={today_ids}).')
+
+        return deleted
+
     @classmethod
     def get_expired(cls):
         """Retrieve all notifications with expired datetime."""
@@ -80,3 +108,34 @@ class Notification(AbstractModel):
         )
 
         return notifications
+
+    @classmethod
+    def get_today_schedule(cls):
+        """
+        Retrieve list of tuples with id and time of every notification that is scheduled
+        for today and time of the first route of its way in a single query.
+        """
+        first_route_time = Route.objects.filter(
+            way=OuterRef('way'),
+            position=0
+        ).values('time')[:1]
+
+        schedule = cls.get_today_scheduled().annotate(
+            time_to_stop=Subquery(first_route_time, output_field=models.TimeField())
+        ).values_list('id', 'time', 'time_to_stop')
+
+        return list(schedule)
+
+    @classmethod
+    def get_with_routes(cls, notifications_ids):
+        """
+        Retrieve notifications with `notifications_ids` along with
+        routes of their ways and start places of the routes.
+        """
+        notifications = cls.objects.filter(id__in=notifications_ids).select_related(
+            'way'
+        ).prefetch_related(
+            'way__routes__start_place'
+        )
+
+        return notifications
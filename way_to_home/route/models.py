@@ -32,9 +32,9 @@ class Route(AbstractModel):
             'time': self.time,
             'transport_name': self.transport_name,
             'position': self.position,
-            'way': self.way.id,
-            'start_place': self.start_place.id,
-            'end_place': self.end_place.id
+            'way': self.way_id,
+            'start_place': self.start_place_id,
+            'end_place': self.end_place_id
         }
 
     @classmethod
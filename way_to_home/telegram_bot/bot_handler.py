@@ -1,18 +1,10 @@
-"""This module provides handling of messages sent to telegram bot."""
+"""
+This module provides handling of messages sent to telegram bot. Updates are
+delivered by Telegram to the webhook view, so bot does not poll them itself.
+"""
 
-# pylint: disable=wrong-import-position
-
-import os
-import sys
 import re
 
-import django
-
-SOURCE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, SOURCE_PATH)
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "way_to_home.settings")
-django.setup()
-
 from django.conf import settings
 from telebot import TeleBot
 from custom_user.models import CustomUser
@@ -23,7 +15,7 @@ from telegram_bot.bot_helper import (get_user_id_by_access_token,
                                      UNAUTHORIZED_ACCESS_MESSAGE)
 
 
-BOT = TeleBot(token=settings.TELEGRAM_BOT_TOKEN)
+BOT = TeleBot(token=settings.TELEGRAM_BOT_TOKEN, threaded=False)
 
 
 @BOT.message_handler(commands=['start'])
@@ -66,7 +58,3 @@ def handle_help(message):
     BOT.send_message(chat_id=message.chat.id,
                      text='В цьому чаті телеграму ви будете отримувати сповіщення,'
                           ' які ви зберегли на сайті WayToHome.')
-
-
-if __name__ == '__main__':
-    BOT.infinity_polling(True)
@@ -1,45 +1,58 @@
-"""This module provides helping functions for telegram bot."""
-
-import pickle
+"""
+This module provides helping functions for telegram bot. Access tokens which link
+telegram chat to the user are stored in redis under the key of every token with
+reverse key of the user, so both of them are found without scanning other tokens
+and expire in `ACCESS_TOKEN_TTL` seconds.
+"""
 
 from utils.redishelper import REDIS_HELPER
 
 
-TELEGRAM_REDIS_KEY = 'telegram'
+ACCESS_TOKEN_KEY = 'telegram_token'
+USER_TOKEN_KEY = 'telegram_user'
+ACCESS_TOKEN_TTL = 60 * 60
 UNAUTHORIZED_ACCESS_MESSAGE = 'Для активації сповіщень через телеграм' \
                               ' необхідно скористатись посиланням на нашому сайті.'
 
 
-def get_access_tokens():
-    """Retrieve dictionary with pairs of user id and token from redis."""
-    telegram_pickled = REDIS_HELPER.get(TELEGRAM_REDIS_KEY)
-    telegram_data = pickle.loads(telegram_pickled) if telegram_pickled else {}
+def get_token_key(token):
+    """Return redis key which stores id of user linked to the access token."""
+    return f'{ACCESS_TOKEN_KEY}:{token}'
+
+
+def get_user_key(user_id):
+    """Return redis key which stores access token of the user."""
+    return f'{USER_TOKEN_KEY}:{user_id}'
 
-    return telegram_data
 
+def get_user_access_token(user_id):
+    """Retrieve access token of the user from redis or None."""
+    token = REDIS_HELPER.get(get_user_key(user_id))
+    return token.decode() if token else None
 
-def set_access_tokens(data):
-    """Retrieve dictionary with pairs of user id and token from redis."""
-    telegram_pickled = pickle.dumps(data)
-    inserted = REDIS_HELPER.set(TELEGRAM_REDIS_KEY, telegram_pickled)
+
+def set_user_access_token(user_id, token):
+    """Store access token of the user in redis replacing the previous one."""
+    previous_token = get_user_access_token(user_id)
+    inserted = REDIS_HELPER.set_many({get_token_key(token): user_id,
+                                      get_user_key(user_id): token},
+                                     cache_time=ACCESS_TOKEN_TTL)
+    if inserted and previous_token and previous_token != token:
+        REDIS_HELPER.delete([get_token_key(previous_token)])
 
     return inserted
 
 
 def remove_user_access_token(user):
     """Remove redis record about telegram access token."""
-    telegram_data = get_access_tokens()
-    if not telegram_data.pop(user.id, False):
+    token = get_user_access_token(user.id)
+    if not token:
         return False
 
-    set_access_tokens(telegram_data)
-    return True
+    return REDIS_HELPER.delete([get_user_key(user.id), get_token_key(token)])
 
 
 def get_user_id_by_access_token(token_check):
     """Find user_id by access token in redis."""
-    for user_id, token in get_access_tokens().items():
-        if token == token_check:
-            return user_id
-
-    return None
+    user_id = REDIS_HELPER.get(get_token_key(token_check))
+    return int(user_id) if user_id else None
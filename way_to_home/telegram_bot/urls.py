@@ -0,0 +1,10 @@
+"""The module that provide URL configuration for telegram bot."""
+
+from django.urls import path
+
+from telegram_bot.views import webhook
+
+
+urlpatterns = [
+    path('webhook/<str:secret>', webhook, name='telegram_webhook')
+]
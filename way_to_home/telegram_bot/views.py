@@ -0,0 +1,47 @@
+"""
+This module provides webhook view which receives updates of telegram bot.
+Updates are acknowledged right away and handled concurrently by the pool of
+at most `TELEGRAM_WEBHOOK_WORKERS` threads of the current process.
+"""
+
+import hmac
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.views.decorators.http import require_http_methods
+from telebot.types import Update
+
+from telegram_bot.bot_handler import BOT
+from utils.executorhelper import LazyExecutor
+from utils.loggerhelper import LOGGER
+from utils.responsehelper import (RESPONSE_200_OK,
+                                  RESPONSE_400_INVALID_DATA,
+                                  RESPONSE_403_ACCESS_DENIED)
+
+
+_EXECUTOR = LazyExecutor(max_workers=settings.TELEGRAM_WEBHOOK_WORKERS)
+
+
+def process_update(update):
+    """Handle update by the bot and release database connection of the worker thread."""
+    try:
+        BOT.process_new_updates([update])
+    except Exception as err:  # pylint: disable=broad-except
+        LOGGER.error(f'Telegram update with id={update.update_id} was not processed. {err}')
+    finally:
+        close_old_connections()
+
+
+@require_http_methods(["POST"])
+def webhook(request, secret):
+    """Receive update of telegram bot and pass it to the worker pool."""
+    if not hmac.compare_digest(secret, settings.TELEGRAM_WEBHOOK_SECRET):
+        return RESPONSE_403_ACCESS_DENIED
+
+    try:
+        update = Update.de_json(request.body)
+    except (KeyError, TypeError, ValueError):
+        return RESPONSE_400_INVALID_DATA
+
+    _EXECUTOR.get().submit(process_update, update)
+    return RESPONSE_200_OK
@@ -0,0 +1,104 @@
+"""This module provides tests for AsyncDaemon."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from daemons.async_daemon import AsyncDaemon
+
+
+class MockAsyncDaemon(AsyncDaemon):
+    """AsyncDaemon which counts its executions."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executions = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def execute(self):
+        self.executions += 1
+        self.release.wait(1)
+        if self.executions >= 3:
+            self.is_processed = False
+        return True
+
+
+class AsyncDaemonTestCase(TestCase):
+    """TestCase for providing AsyncDaemon testing."""
+
+    def setUp(self):
+        """Provide preparation data for testing of AsyncDaemon."""
+        self.loop = asyncio.new_event_loop()
+        self.daemon = MockAsyncDaemon(0.01, timeout=0.05)
+        self.daemon.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        """Release resources of AsyncDaemon tests."""
+        self.daemon.release.set()
+        self.daemon.executor.shutdown()
+        self.loop.close()
+
+    def test_daemon_initialization(self):
+        """Provide tests for proper initialization of daemon instance."""
+        self.assertEqual(0.01, self.daemon.frequency)
+        self.assertEqual(0.05, self.daemon.timeout)
+        self.assertDictEqual({'MockAsyncDaemon': self.daemon.execute}, self.daemon.get_jobs())
+
+    def test_tick_skips_running_job(self):
+        """Provide tests for `tick` method in case of job is still running."""
+        self.daemon.release.clear()
+
+        started_tasks = self.daemon.tick(self.loop)
+        self.loop.run_until_complete(asyncio.wait(started_tasks))
+        self.assertEqual(1, self.daemon.timed_out_executions)
+
+        self.assertEqual([], self.daemon.tick(self.loop))
+        self.assertEqual(1, self.daemon.skipped_executions)
+
+        self.daemon.release.set()
+        self.loop.run_until_complete(self.daemon.running_jobs['MockAsyncDaemon'])
+        self.assertEqual(1, len(self.daemon.tick(self.loop)))
+
+    @patch('daemons.async_daemon.LOGGER.error')
+    def test_run_job_fail(self, logger_error):
+        """Provide tests for `run_job` method in case of job raised an exception."""
+        def failed_job():
+            raise ValueError('failed')
+
+        self.loop.run_until_complete(self.daemon.run_job(self.loop, 'job', failed_job))
+        self.assertTrue(logger_error.called)
+        self.assertEqual(0, self.daemon.timed_out_executions)
+
+    def test_run_loop(self):
+        """Provide tests for `run_loop` method executing blocking calls in the thread pool."""
+        async def coroutine_function(loop):
+            return await loop.run_in_executor(self.daemon.executor, threading.current_thread)
+
+        thread = self.daemon.run_loop(coroutine_function)
+        self.assertIsNot(threading.current_thread(), thread)
+
+    def test_run(self):
+        """Provide tests for `run` method executing jobs on the clock until daemon is stopped."""
+        self.daemon.run()
+        self.assertEqual(3, self.daemon.executions)
+        self.assertFalse(self.daemon.is_processed)
+        self.assertIsNotNone(self.daemon.pid)
+
+    @patch('daemons.async_daemon.LOGGER.info')
+    def test_run_reports_stats(self, logger_info):
+        """Provide tests for `run` method reporting statistics every `stats_interval` seconds."""
+        self.daemon.stats_interval = 0.01
+        self.daemon.skipped_executions = 2
+
+        self.daemon.run()
+        stats_messages = [call[0][0] for call in logger_info.call_args_list
+                          if 'stats' in call[0][0]]
+        self.assertGreaterEqual(len(stats_messages), 2)
+        self.assertEqual(
+            "MockAsyncDaemon stats: {'skipped_executions': 2, 'timed_out_executions': 0}",
+            stats_messages[-1]
+        )
@@ -3,6 +3,7 @@
 from django.test import TestCase
 
 from daemons.gtfs_daemon import GTFSDaemon
+from utils.file_handlers import NOT_MODIFIED
 from unittest.mock import patch
 
 
@@ -13,6 +14,7 @@ class GTFSDaemonTestCase(TestCase):
         """Provide preparation data for testing of GTFS daemon."""
         self.frequency = 11
         self.gtfs_daemon = GTFSDaemon(self.frequency)
+        self.poller = self.gtfs_daemon.pollers['lviv']
 
     def test_daemon_initialization(self):
         """Provide tests for proper initialization of daemon instance."""
@@ -37,10 +39,22 @@ class GTFSDaemonTestCase(TestCase):
         self.gtfs_daemon.stop()
         self.assertFalse(self.gtfs_daemon.is_processed)
 
+    def test_daemon_jobs(self):
+        """Provide tests for polling job of every registered city."""
+        gtfs_daemon = GTFSDaemon(self.frequency, feeds={
+            'lviv': {'realtime_url': 'http://lviv.test'},
+            'kyiv': {'realtime_url': 'http://kyiv.test'},
+        })
+
+        jobs = gtfs_daemon.get_jobs()
+        self.assertSetEqual({'lviv', 'kyiv'}, set(jobs))
+        self.assertEqual('http://kyiv.test', jobs['kyiv'].__self__.url)
+
+    @patch('daemons.gtfs_daemon.GTFSDaemon.report_stats')
     @patch('daemons.gtfs_daemon.GTFSDaemon.start')
     @patch('daemons.gtfs_daemon.GTFSDaemon.stop')
     @patch('daemons.gtfs_daemon.GTFSDaemon.execute')
-    def test_daemon_running(self, execute, stop, start):
+    def test_daemon_running(self, execute, stop, start, report_stats):
         """Provide tests for execution of `running` method in case of `is_processed` is False."""
         self.gtfs_daemon.is_processed = False
 
@@ -48,45 +62,140 @@ class GTFSDaemonTestCase(TestCase):
         self.assertTrue(start.called)
         self.assertTrue(stop.called)
         self.assertFalse(execute.called)
-
-    @patch('utils.redishelper.RedisWorker.set')
-    @patch('daemons.gtfs_daemon.load_file')
-    @patch('daemons.gtfs_daemon.compile_file')
-    def test_execute_success(self, compile_file, load_file, redis_set):
+        self.assertTrue(report_stats.called)
+
+    @patch('daemons.gtfs_daemon.time.time', return_value=1000)
+    @patch('utils.redishelper.RedisWorker.update_hash')
+    def test_report_stats(self, update_hash, mock_time):
+        """Provide tests for `report_stats` method publishing counters of polls of every city."""
+        update_hash.return_value = True
+        self.poller.applied_polls = 3
+        self.poller.skipped_polls = 2
+        self.poller.published_version = 900
+
+        self.assertTrue(self.gtfs_daemon.report_stats())
+        update_hash.assert_any_call('lviv:gtfs_stats', mapping={'applied_polls': 3,
+                                                                 'skipped_polls': 2,
+                                                                 'published_version': 900,
+                                                                 'reported_at': 1000})
+
+        update_hash.return_value = False
+        self.assertFalse(self.gtfs_daemon.report_stats())
+
+    @patch('utils.gtfs_snapshot.is_snapshot_published', return_value=True)
+    @patch('daemons.gtfs_daemon.VehicleHistory.publish', return_value=True)
+    @patch('utils.redishelper.RedisWorker.update_hash')
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_success(self, compile_feed, load_content, update_hash, publish_history,
+                             is_snapshot_published):
         """Provide tests for execute method in case of success."""
-        redis_set.return_value = True
-        load_file.return_value = 'loaded file'
-        compile_file.return_value = 'compiled file'
+        update_hash.return_value = True
+        load_content.return_value = b'loaded content'
+        compile_feed.return_value = ((100, 90), {'100': []})
+
+        successful_executed = self.gtfs_daemon.execute()
+        self.assertTrue(successful_executed)
+        self.assertIn('100', self.poller.published_blocks)
+        self.assertTrue(update_hash.call_args[1]['replace'])
+        self.assertEqual('lviv:gtfs_data', update_hash.call_args[0][0])
+        self.assertEqual('lviv:vehicles_history', publish_history.call_args[1]['key'])
 
         successful_executed = self.gtfs_daemon.execute()
         self.assertTrue(successful_executed)
+        self.assertFalse(update_hash.call_args[1]['replace'])
+        self.assertNotIn('100', update_hash.call_args[1]['mapping'])
+        self.assertEqual(100, update_hash.call_args[1]['mapping']['_version'])
+        is_snapshot_published.assert_called_with(self.poller.published_blocks, 100,
+                                                 'lviv:gtfs_data')
+        self.assertEqual((100, 90), self.poller.feed_timestamps)
+        self.assertEqual(2, self.poller.applied_polls)
+        self.assertTrue(publish_history.call_args_list[0][1]['replace'])
+        self.assertFalse(publish_history.call_args_list[1][1]['replace'])
+
+    @patch('utils.redishelper.RedisWorker.update_hash')
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_skip_not_newer_feed(self, compile_feed, load_content, update_hash):
+        """Provide tests for execute method in case of feed is not newer than published one."""
+        load_content.return_value = b'loaded content'
+        compile_feed.return_value = ((110, 90), None)
+        self.poller.feed_timestamps = (100, 90)
+
+        successful_executed = self.gtfs_daemon.execute()
+        self.assertTrue(successful_executed)
+        self.assertFalse(update_hash.called)
+        compile_feed.assert_called_with(b'loaded content', (100, 90))
+        self.assertEqual((110, 90), self.poller.feed_timestamps)
+        self.assertEqual(1, self.poller.skipped_polls)
+        self.assertEqual(0, self.poller.applied_polls)
+
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_not_modified(self, compile_feed, load_content):
+        """Provide tests for execute method in case of file was not modified."""
+        load_content.return_value = NOT_MODIFIED
+
+        successful_executed = self.gtfs_daemon.execute()
+        self.assertTrue(successful_executed)
+        self.assertFalse(compile_feed.called)
+        self.assertEqual(1, self.poller.skipped_polls)
+
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_keeps_validators_on_fail(self, compile_feed, load_content):
+        """Provide tests for execute method that validators are kept only for published file."""
+        load_content.side_effect = lambda url, validators: validators.update(ETag='"v2"') or b'loaded content'
+        compile_feed.return_value = None
+        self.poller.feed_validators = {'ETag': '"v1"'}
+
+        self.gtfs_daemon.execute()
+        self.assertDictEqual({'ETag': '"v1"'}, self.poller.feed_validators)
+
+    @patch('daemons.gtfs_daemon.settings.GTFS_ARCHIVE_FEEDS', True)
+    @patch('daemons.gtfs_daemon.save_content')
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_archive_feed(self, compile_feed, load_content, save_content):
+        """Provide tests for execute method in case of archiving of raw feeds is enabled."""
+        load_content.return_value = b'loaded content'
+        compile_feed.return_value = None
+        save_content.side_effect = PermissionError()
+
+        successful_executed = self.gtfs_daemon.execute()
+        self.assertFalse(successful_executed)
+        self.assertEqual([b'loaded content'], save_content.call_args[0][0])
+        self.assertTrue(compile_feed.called)
 
-    @patch('daemons.gtfs_daemon.load_file')
-    def test_execute_fail_load_operation(self, load_file):
+    @patch('daemons.gtfs_daemon.load_content')
+    def test_execute_fail_load_operation(self, load_content):
         """Provide tests for execute method in case of fail load file operation."""
-        load_file.return_value = None
+        load_content.return_value = None
 
         successful_executed = self.gtfs_daemon.execute()
         self.assertFalse(successful_executed)
+        self.assertDictEqual({}, self.poller.published_blocks)
 
-    @patch('daemons.gtfs_daemon.load_file')
-    @patch('daemons.gtfs_daemon.compile_file')
-    def test_execute_fail_compile_operation(self, compile_file, load_file):
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_fail_compile_operation(self, compile_feed, load_content):
         """Provide tests for execute method in case of fail compile file operation."""
-        load_file.return_value = 'loaded file'
-        compile_file.return_value = None
+        load_content.return_value = b'loaded content'
+        compile_feed.return_value = None
 
         successful_executed = self.gtfs_daemon.execute()
         self.assertFalse(successful_executed)
+        self.assertDictEqual({}, self.poller.published_blocks)
 
-    @patch('utils.redishelper.RedisWorker.set')
-    @patch('daemons.gtfs_daemon.load_file')
-    @patch('daemons.gtfs_daemon.compile_file')
-    def test_execute_fail_redis_set_operation(self, compile_file, load_file, redis_set):
+    @patch('utils.redishelper.RedisWorker.update_hash')
+    @patch('daemons.gtfs_daemon.load_content')
+    @patch('daemons.gtfs_daemon.compile_feed')
+    def test_execute_fail_redis_set_operation(self, compile_feed, load_content, update_hash):
         """Provide tests for execute method in case of fail Redis set operation."""
-        redis_set.return_value = False
-        load_file.return_value = 'loaded file'
-        compile_file.return_value = 'compiled file'
+        update_hash.return_value = False
+        load_content.return_value = b'loaded content'
+        compile_feed.return_value = ((100, 90), {'100': []})
 
         successful_executed = self.gtfs_daemon.execute()
         self.assertFalse(successful_executed)
+        self.assertDictEqual({}, self.poller.published_blocks)
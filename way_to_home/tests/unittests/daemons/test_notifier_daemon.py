@@ -5,7 +5,6 @@ from datetime import date, timedelta
 from django.test import TestCase
 from unittest.mock import patch
 from django.db.models import signals
-from kombu.exceptions import OperationalError
 
 from daemons.notifier_daemon import NotifierDaemon
 from notification.models import Notification
@@ -74,48 +73,28 @@ class NotifierDaemonTestCase(TestCase):
         self.assertTrue(stop.called)
         self.assertFalse(execute.called)
 
-    @patch('daemons.notifier_daemon.prepare_notification.apply_async')
-    @patch('daemons.notifier_daemon.set_notifications_tasks')
+    @patch('daemons.notifier_daemon.schedule_notifications')
     @patch('daemons.notifier_daemon.get_seconds_until_midnight')
-    def test_execute_success(self, time_until_midnight, redis_set, assign_task):
+    def test_execute_success(self, time_until_midnight, schedule_notifications):
         """Provide tests for proper execution of method `execute` method in case of success."""
         time_until_midnight.return_value = TIME_UNTIL_MIDNIGHT
-        redis_set.return_value = True
-        assign_task.return_value = True
+        schedule_notifications.return_value = True
 
-        successful_executed = self.notifier_daemon.execute()
+        with self.assertNumQueries(1):
+            successful_executed = self.notifier_daemon.execute()
         self.assertTrue(successful_executed)
 
         expected_frequency = time_until_midnight.return_value
         self.assertEqual(expected_frequency, self.notifier_daemon.frequency)
 
-    @patch('daemons.notifier_daemon.prepare_notification.apply_async')
-    @patch('daemons.notifier_daemon.set_notifications_tasks')
-    @patch('daemons.notifier_daemon.get_seconds_until_midnight')
-    def test_execute_fail_assign_tasks(self, time_until_midnight, redis_set, assign_task):
-        """
-        Provide tests for proper execution of method `execute`
-        method in case of fail celery assigning tasks.
-        """
-        time_until_midnight.return_value = TIME_UNTIL_MIDNIGHT
-        redis_set.return_value = True
-
-        assign_task.side_effect = TypeError()
-        executed = self.notifier_daemon.execute()
-        self.assertTrue(executed)
+        notifications_times = schedule_notifications.call_args[0][0]
+        self.assertListEqual([100], list(notifications_times))
+        self.assertTrue(schedule_notifications.call_args[1]['replace'])
 
-        assign_task.side_effect = OperationalError()
-        executed = self.notifier_daemon.execute()
-        self.assertTrue(executed)
-
-    @patch('daemons.notifier_daemon.prepare_notification.apply_async', return_value=True)
-    @patch('daemons.notifier_daemon.set_notifications_tasks', return_value=False)
+    @patch('daemons.notifier_daemon.schedule_notifications', return_value=False)
     @patch('daemons.notifier_daemon.get_seconds_until_midnight', return_value=TIME_UNTIL_MIDNIGHT)
-    def test_execute_fail_redis_set_operation(self, time_until_midnight, redis_set, assign_task):
+    def test_execute_fail_redis_set_operation(self, time_until_midnight, schedule_notifications):
         """Provide tests for execute method in case of fail Redis set operation."""
-        time_until_midnight.return_value = TIME_UNTIL_MIDNIGHT
-        redis_set.return_value = False
-        assign_task.return_value = True
-
         successful_executed = self.notifier_daemon.execute()
         self.assertFalse(successful_executed)
+        self.assertTrue(schedule_notifications.called)
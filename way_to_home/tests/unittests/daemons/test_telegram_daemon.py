@@ -0,0 +1,127 @@
+"""This module provides tests for Telegram daemon."""
+
+import time
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from daemons.telegram_daemon import TelegramDaemon, MAX_ATTEMPTS
+
+
+class TelegramDaemonTestCase(TestCase):
+    """TestCase for providing Telegram daemon testing."""
+
+    def setUp(self):
+        """Provide preparation data for testing of Telegram daemon."""
+        self.telegram_daemon = TelegramDaemon()
+
+        patcher = patch('daemons.telegram_daemon.acknowledge_telegram_message', return_value=True)
+        self.acknowledge_message = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_daemon_initialization(self):
+        """Provide tests for proper initialization of daemon instance."""
+        self.assertEqual(1, self.telegram_daemon.frequency)
+        self.assertFalse(self.telegram_daemon.is_processed)
+        self.assertEqual('TelegramDaemon', self.telegram_daemon.name)
+
+    @patch('daemons.telegram_daemon.deliver_telegram_message', return_value=(True, None))
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_execute_success(self, dequeue_messages, deliver_message):
+        """Provide tests for execute method in case of every message was delivered."""
+        dequeue_messages.side_effect = [[(100, 'first', 0), (101, 'second', 0)], []]
+
+        successful_executed = self.telegram_daemon.execute()
+        self.assertTrue(successful_executed)
+        self.assertEqual(2, self.telegram_daemon.delivered_messages)
+        deliver_message.assert_any_call(101, 'second')
+        self.acknowledge_message.assert_any_call((101, 'second', 0))
+
+    @patch('daemons.telegram_daemon.enqueue_telegram_messages', return_value=True)
+    @patch('daemons.telegram_daemon.deliver_telegram_message', return_value=(False, 3))
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_execute_rate_limited(self, dequeue_messages, deliver_message, enqueue_messages):
+        """Provide tests for execute method in case of Telegram returned `retry_after` hint."""
+        dequeue_messages.side_effect = [[(100, 'text', 0)], []]
+
+        self.telegram_daemon.execute()
+        enqueue_messages.assert_called_with([(100, 'text')], attempt=1)
+        self.assertEqual(1, self.telegram_daemon.rate_limited_messages)
+        self.assertGreater(self.telegram_daemon.get_delay(101), 2)
+
+    @patch('daemons.telegram_daemon.enqueue_telegram_messages')
+    @patch('daemons.telegram_daemon.deliver_telegram_message', return_value=(False, None))
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_execute_last_attempt(self, dequeue_messages, deliver_message, enqueue_messages):
+        """Provide tests for execute method in case of the last attempt was failed."""
+        dequeue_messages.side_effect = [[(100, 'text', MAX_ATTEMPTS - 1)], []]
+
+        self.telegram_daemon.execute()
+        self.assertFalse(enqueue_messages.called)
+        self.assertEqual(1, self.telegram_daemon.failed_messages)
+        self.assertTrue(self.acknowledge_message.called)
+
+    @patch('daemons.telegram_daemon.enqueue_telegram_messages', return_value=False)
+    @patch('daemons.telegram_daemon.deliver_telegram_message', return_value=(False, None))
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_execute_enqueue_fail(self, dequeue_messages, deliver_message, enqueue_messages):
+        """Provide tests for execute method in case of failed message was not enqueued again."""
+        dequeue_messages.side_effect = [[(100, 'text', 0)], []]
+
+        self.telegram_daemon.execute()
+        self.assertTrue(enqueue_messages.called)
+        self.assertFalse(self.acknowledge_message.called)
+
+    @patch('daemons.telegram_daemon.TelegramDaemon.get_delay', return_value=0.01)
+    @patch('daemons.telegram_daemon.deliver_telegram_message')
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_execute_paused_while_waiting(self, dequeue_messages, deliver_message, get_delay):
+        """Provide tests for execute method in case of pause was set while message was waiting."""
+        dequeue_messages.side_effect = [[(100, 'text', 0)], []]
+        sent_at = []
+        deliver_message.side_effect = lambda *args: sent_at.append(time.monotonic()) or (True, None)
+        self.telegram_daemon.paused_until = time.monotonic() + 0.2
+
+        self.telegram_daemon.execute()
+        self.assertTrue(get_delay.called)
+        self.assertGreaterEqual(sent_at[0], self.telegram_daemon.paused_until)
+
+    def test_get_delay_per_chat(self):
+        """Provide tests for `get_delay` method spreads messages to the same chat."""
+        self.assertEqual(0, self.telegram_daemon.get_delay(100))
+        self.assertEqual(0, self.telegram_daemon.get_delay(101))
+        self.assertAlmostEqual(1, self.telegram_daemon.get_delay(100), delta=0.1)
+
+    @patch('daemons.telegram_daemon.TelegramDaemon.start')
+    @patch('daemons.telegram_daemon.TelegramDaemon.stop')
+    @patch('daemons.telegram_daemon.restore_telegram_messages', return_value=2)
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_daemon_running(self, dequeue_messages, restore_messages, stop, start):
+        """Provide tests for execution of `running` method in case of `is_processed` is False."""
+        self.telegram_daemon.run()
+        self.assertTrue(start.called)
+        self.assertTrue(restore_messages.called)
+        self.assertTrue(stop.called)
+        self.assertFalse(dequeue_messages.called)
+
+    @patch('daemons.telegram_daemon.LOGGER.info')
+    @patch('daemons.telegram_daemon.deliver_telegram_message', return_value=(True, None))
+    @patch('daemons.telegram_daemon.dequeue_telegram_messages')
+    def test_consume_reports_stats(self, dequeue_messages, deliver_message, logger_info):
+        """Provide tests for `consume` method reporting statistics every `stats_interval` seconds."""
+        telegram_daemon = TelegramDaemon(frequency=0.01, stats_interval=0)
+        telegram_daemon.is_processed = True
+
+        def dequeue(count):
+            if deliver_message.call_count:
+                telegram_daemon.is_processed = False
+                return []
+            return [(100, 'text', 0)]
+
+        dequeue_messages.side_effect = dequeue
+
+        telegram_daemon.run_loop(telegram_daemon.consume)
+        expected_message = "TelegramDaemon stats: {'delivered_messages': 1, " \
+                           "'failed_messages': 0, 'rate_limited_messages': 0}"
+        self.assertListEqual([expected_message, expected_message],
+                             [call[0][0] for call in logger_info.call_args_list])
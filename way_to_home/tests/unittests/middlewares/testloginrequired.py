@@ -5,6 +5,7 @@ from django.urls import reverse
 
 from custom_user.models import CustomUser
 from middlewares.login_required import GUESTS_PATHS
+from utils.responsehelper import RESPONSE_403_ACCESS_DENIED
 
 
 class LoginRequiredTestCase(TestCase):
@@ -77,3 +78,11 @@ class LoginRequiredTestCase(TestCase):
 
         response = self.user_client.get(path)
         self.assertEqual(response.status_code, 200)
+
+    def test_public_request(self):
+        """Provide tests for requests with paths that are available both for users and guests."""
+        path = reverse('telegram_webhook', args=['invalid'])
+
+        for client in [self.guest_client, self.user_client]:
+            response = client.post(path, {}, content_type='application/json')
+            self.assertEqual(response.content, RESPONSE_403_ACCESS_DENIED.content)
@@ -2,12 +2,16 @@
 
 import datetime
 
+from django.db.utils import OperationalError
 from django.test import TestCase
+from unittest.mock import patch
 from django.db.models import signals
 
 from custom_user.models import CustomUser
 from notification.models import Notification
 from notification.signals import create_notification_task, revoke_notification_task
+from place.models import Place
+from route.models import Route
 from way.models import Way
 
 
@@ -49,6 +53,43 @@ class NotificationModelTestCase(TestCase):
         is_deleted = Notification.delete_by_id(obj_id=999)
         self.assertFalse(is_deleted)
 
+    def test_delete_by_ids(self):
+        """Provide tests for `delete_by_ids` method of Notification model."""
+        deleted = Notification.delete_by_ids([self.notification.id, 999])
+        self.assertEqual(1, deleted)
+        self.assertFalse(Notification.objects.filter(id=self.notification.id).exists())
+
+        with patch('django.db.models.query.QuerySet._raw_delete', side_effect=OperationalError):
+            self.assertIsNone(Notification.delete_by_ids([999]))
+
+    @patch('notification.models.unschedule_notifications')
+    def test_delete_by_ids_today_scheduled(self, mock_unschedule_notifications):
+        """
+        Provide tests for `delete_by_ids` method of Notification model in case of notifications
+        scheduled for today, which are unscheduled with a single command.
+        """
+        signals.post_delete.connect(revoke_notification_task, sender=Notification)
+        self.addCleanup(signals.post_delete.disconnect, revoke_notification_task, sender=Notification)
+        today = datetime.date.today()
+        notifications_ids = [self.notification.id]
+        for notification_id in range(101, 104):
+            Notification.objects.create(
+                id=notification_id,
+                way=self.way,
+                start_time=today,
+                end_time=today,
+                week_day=today.weekday(),
+                time=datetime.time(23, 58, 59)
+            )
+            notifications_ids.append(notification_id)
+
+        with self.assertNumQueries(2):
+            deleted = Notification.delete_by_ids(notifications_ids)
+
+        self.assertEqual(4, deleted)
+        self.assertFalse(Notification.objects.filter(id__in=notifications_ids).exists())
+        mock_unschedule_notifications.assert_called_once_with([101, 102, 103])
+
     def test_to_dict(self):
         """Provide tests for `to_dict` method of certain Notification instance."""
         notification = Notification.objects.get(id=self.notification.id)
@@ -173,6 +214,41 @@ class NotificationModelTestCase(TestCase):
         self.assertIn(today_notification, actual_query)
         self.assertNotIn(another_day_notification, actual_query)
 
+    def test_get_today_schedule(self):
+        """Provides tests for `get_today_schedule` method."""
+        today = datetime.date.today()
+        another_way = Way.objects.create(id=101, user=self.way.user)
+        place = Place.objects.create(longitude=24.0311, latitude=49.8419)
+        Route.objects.create(way=self.way, start_place=place, end_place=place,
+                             time='00:15:00', position=0)
+        Route.objects.create(way=self.way, start_place=place, end_place=place,
+                             time='00:40:00', position=1)
+        for notification_id, way in ((201, self.way), (202, another_way)):
+            Notification.objects.create(
+                id=notification_id,
+                way=way,
+                start_time=today - datetime.timedelta(days=1),
+                end_time=today + datetime.timedelta(days=31),
+                week_day=today.weekday(),
+                time='8:30:00'
+            )
+
+        with self.assertNumQueries(1):
+            schedule = Notification.get_today_schedule()
+
+        self.assertListEqual([
+            (201, datetime.time(8, 30), datetime.time(0, 15)),
+            (202, datetime.time(8, 30), None)
+        ], sorted(schedule))
+
+    def test_get_with_routes(self):
+        """Provides tests for `get_with_routes` method."""
+        notifications = Notification.get_with_routes([self.notification.id, 999])
+
+        self.assertListEqual([self.notification], list(notifications))
+        with self.assertNumQueries(0):
+            self.assertListEqual([], list(notifications[0].way.routes.all()))
+
     def test_is_for_today(self):
         """Provides tests for `is_for_today` method of certain Notification instance."""
         today = datetime.date.today()
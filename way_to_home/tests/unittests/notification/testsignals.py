@@ -2,9 +2,6 @@
 
 from datetime import date, timedelta, time, datetime
 
-from kombu.exceptions import OperationalError
-from celery.exceptions import TaskError
-from celery.result import AsyncResult
 from django.db.models import signals
 from django.test import TestCase
 from unittest.mock import patch
@@ -41,19 +38,15 @@ class NotificationSignalsTestCase(TestCase):
             'created': True,
             'update_fields': []
         }
-        self.notifications_tasks = {self.notification.id: AsyncResult(self.notification.id)}
 
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_revoke_notification_success(self, get_notifications_tasks, set_notifications_tasks, revoke_task):
+    @patch('notification.signals.unschedule_notifications')
+    def test_revoke_notification_success(self, unschedule_notifications):
         """Provide tests for proper execution of post delete callback function in case of success."""
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = True
-        revoke_task.return_value = True
+        unschedule_notifications.return_value = True
 
         successful_executed = revoke_notification_task(Notification, self.notification)
         self.assertTrue(successful_executed)
+        unschedule_notifications.assert_called_with([self.notification.id])
 
     def test_revoke_notification_task_another_weekday(self):
         """
@@ -65,80 +58,65 @@ class NotificationSignalsTestCase(TestCase):
         successful_executed = revoke_notification_task(Notification, self.notification)
         self.assertFalse(successful_executed)
 
-    @patch('notification.signals.get_notifications_tasks')
-    def test_revoke_notification_task_key_error(self, get_notifications_tasks):
-        """
-        Provide tests for proper execution of post delete callback function
-        in case of notification`s data doesn't exist in Redis.
-        """
-        get_notifications_tasks.return_value = {}
-
-        successful_executed = revoke_notification_task(Notification, self.notification)
-        self.assertFalse(successful_executed)
-
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_revoke_notification_task_revoke_error(self, get_notifications_tasks, revoke_task):
+    @patch('notification.signals.unschedule_notifications')
+    def test_revoke_notification_task_redis_error(self, unschedule_notifications):
         """
         Provide tests for proper execution of post delete callback
-        function in case of celery revoke task is failed.
+        function in case of fail Redis remove operation.
         """
-        get_notifications_tasks.return_value = self.notifications_tasks
-        revoke_task.side_effect = TaskError()
+        unschedule_notifications.return_value = False
 
         successful_executed = revoke_notification_task(Notification, self.notification)
         self.assertFalse(successful_executed)
 
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_revoke_notification_task_set_error(self, get_notifications_tasks,
-                                                set_notifications_tasks, revoke_task):
-        """
-        Provide tests for proper execution of post delete callback
-        function in case of fail Redis set operation.
-        """
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = False
-        revoke_task.return_value = True
+    @patch('utils.redishelper.REDIS_HELPER.zrem')
+    def test_revoke_notification_task_way_cascade(self, redis_zrem):
+        """
+        Provide tests for post delete callback function in case of deleting of the way,
+        so notifications of the way are unscheduled with a single command.
+        """
+        signals.post_delete.connect(revoke_notification_task, sender=Notification)
+        self.addCleanup(signals.post_delete.disconnect, revoke_notification_task, sender=Notification)
+        second_notification = Notification.objects.create(
+            id=101,
+            way=self.notification.way,
+            start_time=self.notification.start_time,
+            end_time=self.notification.end_time,
+            week_day=self.notification.week_day,
+            time=self.notification.time
+        )
 
-        successful_executed = revoke_notification_task(Notification, self.notification)
-        self.assertFalse(successful_executed)
+        self.notification.way.delete()
+        redis_zrem.assert_called_once()
+        key, notifications_ids = redis_zrem.call_args[0]
+        self.assertEqual('notifications_wheel', key)
+        self.assertCountEqual([self.notification.id, second_notification.id], notifications_ids)
 
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('utils.celery_tasks.prepare_notification.apply_async')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_success_after_create(self, get_notifications_tasks,
-                                                           set_notifications_tasks,
-                                                           assign_task, revoke_task):
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_success_after_create(self, schedule_notifications):
         """Provide tests for proper execution of post save callback function in case success."""
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = True
-        assign_task.return_value = True
+        schedule_notifications.return_value = True
 
         successful_executed = create_notification_task(**self.post_save_params)
         self.assertTrue(successful_executed)
+        self.assertListEqual([self.notification.id], list(schedule_notifications.call_args[0][0]))
 
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('utils.celery_tasks.prepare_notification.apply_async')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_success_after_update(self, get_notifications_tasks,
-                                                           set_notifications_tasks,
-                                                           assign_task, revoke_task):
+    @patch('notification.signals.unschedule_notifications')
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_success_after_update(self, schedule_notifications,
+                                                           unschedule_notifications):
         """Provide tests for proper execution of post update callback function in case success."""
         post_save_params = self.post_save_params.copy()
         post_save_params['created'] = False
         post_save_params['update_fields'] = ['time']
 
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = True
-        assign_task.return_value = True
-        revoke_task.return_value = True
+        schedule_notifications.return_value = True
+        unschedule_notifications.return_value = True
 
         successful_executed = create_notification_task(**post_save_params)
         self.assertTrue(successful_executed)
+        self.assertFalse(unschedule_notifications.called)
+        self.assertListEqual([self.notification.id], list(schedule_notifications.call_args[0][0]))
 
     @patch('notification.models.Notification.is_for_today')
     def test_create_notification_task_invalid_date(self, is_for_today):
@@ -151,95 +129,58 @@ class NotificationSignalsTestCase(TestCase):
         successful_executed = create_notification_task(**self.post_save_params)
         self.assertFalse(successful_executed)
 
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_time_not_updated(self, get_notifications_tasks):
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_time_not_updated(self, schedule_notifications):
         """
         Provide tests for proper execution of post save callback
         function in case of notification time field was not updated.
         """
         post_save_params = self.post_save_params.copy()
         post_save_params['created'] = False
-        get_notifications_tasks.return_value = {}
 
         successful_executed = create_notification_task(**post_save_params)
         self.assertFalse(successful_executed)
+        self.assertFalse(schedule_notifications.called)
 
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_key_error(self, get_notifications_tasks):
+    @patch('notification.signals.unschedule_notifications')
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_passed_time_after_update(self, schedule_notifications,
+                                                               unschedule_notifications):
         """
-        Provide tests for proper execution of post save callback function
-        in case of notification`s data doesn't exist in Redis.
+        Provide tests for proper execution of post update callback function
+        in case of notification time was updated to already passed one.
         """
         post_save_params = self.post_save_params.copy()
         post_save_params['update_fields'] = ['time']
         post_save_params['created'] = False
-        get_notifications_tasks.return_value = {}
-
-        successful_executed = create_notification_task(**post_save_params)
-        self.assertFalse(successful_executed)
-
-    @patch('celery.result.AsyncResult.revoke')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_revoke_error(self, get_notifications_tasks, revoke_task):
-        """
-        Provide tests for proper execution of post save callback
-        function in case of celery revoke old task is failed.
-        """
-        post_save_params = self.post_save_params.copy()
-        post_save_params['update_fields'] = ['time']
-        post_save_params['created'] = False
-
-        get_notifications_tasks.return_value = self.notifications_tasks
-        revoke_task.side_effect = TaskError()
+        self.notification.time = datetime.now() - timedelta(seconds=1)
+        self.notification.save()
 
         successful_executed = create_notification_task(**post_save_params)
         self.assertFalse(successful_executed)
+        unschedule_notifications.assert_called_with([self.notification.id])
+        self.assertFalse(schedule_notifications.called)
 
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_invalid_time(self, get_notifications_tasks):
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_invalid_time(self, schedule_notifications):
         """
         Provide tests for proper execution of post save callback
         function in case of notification is not relevant for today.
         """
-        get_notifications_tasks.return_value = self.notifications_tasks
         self.notification.time = datetime.now() - timedelta(seconds=1)
         self.notification.save()
 
         successful_executed = create_notification_task(**self.post_save_params)
         self.assertFalse(successful_executed)
+        self.assertFalse(schedule_notifications.called)
 
-    @patch('utils.celery_tasks.prepare_notification.apply_async')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_assign_error(self, get_notifications_tasks,
-                                                   set_notifications_tasks, assign_task):
-        """
-        Provide tests for proper execution of post save callback
-        function in case of celery assign task is failed.
-        """
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = True
-
-        assign_task.side_effect = TypeError()
-        executed = create_notification_task(**self.post_save_params)
-        self.assertTrue(executed)
-
-        assign_task.side_effect = OperationalError()
-        executed = create_notification_task(**self.post_save_params)
-        self.assertTrue(executed)
-
-    @patch('utils.celery_tasks.prepare_notification.apply_async')
-    @patch('notification.signals.set_notifications_tasks')
-    @patch('notification.signals.get_notifications_tasks')
-    def test_create_notification_task_set_error(self, get_notifications_tasks,
-                                                set_notifications_tasks, assign_task):
+    @patch('notification.signals.schedule_notifications')
+    def test_create_notification_task_set_error(self, schedule_notifications):
         """
         Provide tests for proper execution of post save callback
         function in case of Redis set operation is failed.
         """
-        get_notifications_tasks.return_value = self.notifications_tasks
-        set_notifications_tasks.return_value = False
-        assign_task.return_value = True
+        schedule_notifications.return_value = False
 
         successful_executed = create_notification_task(**self.post_save_params)
         self.assertFalse(successful_executed)
@@ -0,0 +1,76 @@
+"""This module provides tests for telegram bot helper functions."""
+
+from django.test import TestCase
+from unittest.mock import MagicMock, patch
+
+from telegram_bot.bot_helper import (ACCESS_TOKEN_TTL,
+                                     get_user_access_token,
+                                     set_user_access_token,
+                                     remove_user_access_token,
+                                     get_user_id_by_access_token)
+
+
+class BotHelperTestCase(TestCase):
+    """TestCase for providing telegram bot helper functions testing."""
+
+    def setUp(self):
+        """Provides preparation before testing telegram bot helper functions."""
+        self.user = MagicMock(id=7)
+
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.get')
+    def test_get_user_access_token(self, redis_get):
+        """Provide tests for `get_user_access_token` function."""
+        redis_get.return_value = b'token'
+        self.assertEqual('token', get_user_access_token(7))
+        redis_get.assert_called_with('telegram_user:7')
+
+        redis_get.return_value = None
+        self.assertIsNone(get_user_access_token(7))
+
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.delete')
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.set_many')
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.get')
+    def test_set_user_access_token(self, redis_get, redis_set_many, redis_delete):
+        """Provide tests for `set_user_access_token` function replacing the previous token."""
+        redis_get.return_value = b'old'
+        redis_set_many.return_value = True
+
+        self.assertTrue(set_user_access_token(7, 'new'))
+        redis_set_many.assert_called_with({'telegram_token:new': 7, 'telegram_user:7': 'new'},
+                                          cache_time=ACCESS_TOKEN_TTL)
+        redis_delete.assert_called_with(['telegram_token:old'])
+
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.delete')
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.set_many')
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.get')
+    def test_set_user_access_token_fail(self, redis_get, redis_set_many, redis_delete):
+        """Provide tests for `set_user_access_token` function in case of failed insert."""
+        redis_get.return_value = b'old'
+        redis_set_many.return_value = False
+
+        self.assertFalse(set_user_access_token(7, 'new'))
+        self.assertFalse(redis_delete.called)
+
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.delete')
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.get')
+    def test_remove_user_access_token(self, redis_get, redis_delete):
+        """Provide tests for `remove_user_access_token` function."""
+        redis_get.return_value = b'token'
+        redis_delete.return_value = True
+        self.assertTrue(remove_user_access_token(self.user))
+        redis_delete.assert_called_with(['telegram_user:7', 'telegram_token:token'])
+
+        redis_get.return_value = None
+        redis_delete.reset_mock()
+        self.assertFalse(remove_user_access_token(self.user))
+        self.assertFalse(redis_delete.called)
+
+    @patch('telegram_bot.bot_helper.REDIS_HELPER.get')
+    def test_get_user_id_by_access_token(self, redis_get):
+        """Provide tests for `get_user_id_by_access_token` function."""
+        redis_get.return_value = b'7'
+        self.assertEqual(7, get_user_id_by_access_token('token'))
+        redis_get.assert_called_with('telegram_token:token')
+
+        redis_get.return_value = None
+        self.assertIsNone(get_user_id_by_access_token('token'))
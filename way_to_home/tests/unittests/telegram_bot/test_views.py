@@ -0,0 +1,147 @@
+"""This module provides tests for telegram bot webhook view."""
+
+import json
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.test import TestCase, Client
+from django.urls import reverse
+from telebot import apihelper
+from unittest.mock import MagicMock, patch
+
+from custom_user.models import CustomUser
+from telegram_bot.views import process_update
+from user_profile.models import UserProfile
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """Handler of fake Telegram Bot API server which records called methods."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Record called method with its params and respond with sent message."""
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path.split('/')[-1], params))
+
+        body = json.dumps({
+            'ok': True,
+            'result': {
+                'message_id': len(self.server.requests),
+                'date': 0,
+                'chat': {'id': int(params['chat_id']), 'type': 'private'},
+                'text': params['text']
+            }
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Do not log requests to the fake server."""
+
+
+class WebhookTestCase(TestCase):
+    """TestCase for providing telegram bot webhook testing."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start fake Telegram Bot API server."""
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), FakeTelegramHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop fake Telegram Bot API server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        """Provides preparation before testing webhook."""
+        self.server.requests.clear()
+        self.user = CustomUser.objects.create(id=10, email='user@mail.com', is_active=True)
+        UserProfile.objects.create(id=10, user=self.user)
+
+        self.client = Client()
+        self.url = reverse('telegram_webhook', args=[settings.TELEGRAM_WEBHOOK_SECRET])
+        self.update = {
+            'update_id': 1,
+            'message': {
+                'message_id': 1,
+                'date': 0,
+                'chat': {'id': 555, 'type': 'private'},
+                'from': {'id': 555, 'is_bot': False, 'first_name': 'John'},
+                'text': '/start token',
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}]
+            }
+        }
+
+        base_url = f'http://127.0.0.1:{self.server.server_port}/bot{{0}}/{{1}}'
+        make_request = partial(apihelper._make_request, base_url=base_url)
+        patchers = [
+            patch('telebot.apihelper._make_request', make_request),
+            patch('telegram_bot.views._EXECUTOR.get', return_value=MagicMock(
+                submit=lambda function, *args: function(*args))),
+            patch('telegram_bot.bot_handler.get_user_id_by_access_token', return_value=10),
+            patch('telegram_bot.bot_handler.remove_user_access_token', return_value=True),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_webhook_start(self):
+        """Provide tests for webhook processing `/start` command through fake Telegram server."""
+        response = self.client.post(self.url, json.dumps(self.update),
+                                    content_type='application/json')
+        self.assertEqual(200, response.status_code)
+
+        self.assertEqual(555, UserProfile.objects.get(id=10).telegram_id)
+        self.assertEqual(1, len(self.server.requests))
+        method, params = self.server.requests[0]
+        self.assertEqual('sendMessage', method)
+        self.assertEqual('555', params['chat_id'])
+        self.assertIn('user@mail.com', params['text'])
+
+    def test_webhook_help(self):
+        """Provide tests for webhook processing `/help` command through fake Telegram server."""
+        self.update['message']['text'] = '/help'
+        self.update['message']['entities'][0]['length'] = 5
+
+        response = self.client.post(self.url, json.dumps(self.update),
+                                    content_type='application/json')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([('sendMessage', self.server.requests[0][1])], self.server.requests)
+        self.assertIsNone(UserProfile.objects.get(id=10).telegram_id)
+
+    def test_webhook_invalid_secret(self):
+        """Provide tests for webhook in case of invalid secret."""
+        url = reverse('telegram_webhook', args=['invalid'])
+        response = self.client.post(url, json.dumps(self.update), content_type='application/json')
+        self.assertEqual(403, response.status_code)
+        self.assertListEqual([], self.server.requests)
+
+    def test_webhook_invalid_update(self):
+        """Provide tests for webhook in case of invalid update."""
+        response = self.client.post(self.url, json.dumps({'message': {}}),
+                                    content_type='application/json')
+        self.assertEqual(400, response.status_code)
+
+    def test_webhook_invalid_method(self):
+        """Provide tests for webhook in case of not allowed HTTP method."""
+        response = self.client.get(self.url)
+        self.assertEqual(405, response.status_code)
+
+    @patch('telegram_bot.views.LOGGER.error')
+    @patch('telegram_bot.views.BOT.process_new_updates')
+    def test_process_update_fail(self, process_new_updates, logger_error):
+        """Provide tests for `process_update` function in case of failed handler."""
+        process_new_updates.side_effect = ValueError
+        process_update(MagicMock(update_id=1))
+        self.assertTrue(logger_error.called)
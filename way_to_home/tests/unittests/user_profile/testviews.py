@@ -121,30 +121,37 @@ class UserProfileViewTest(TestCase):
         response = self.second_client.put(url, {}, content_type='application/json')
         self.assertEqual(400, response.status_code)
 
-    @mock.patch('user_profile.views.get_access_tokens')
-    @mock.patch('user_profile.views.set_access_tokens')
-    def test_put_access_token_set_fail(self, set_access_tokens, get_access_tokens):
+    @mock.patch('user_profile.views.set_user_access_token')
+    def test_put_access_token_set_fail(self, set_user_access_token):
         """Method that tests the unsuccessful request to set telegram token for user
         in case of data not passing validation."""
-        get_access_tokens.return_value = {}
-        set_access_tokens.return_value = False
+        set_user_access_token.return_value = False
         test_data = {'token': 'test_token'}
         url = reverse('telegram_redis')
 
         response = self.client.put(url, json.dumps(test_data), content_type='application/json')
         self.assertEqual(response.status_code, 400)
 
-    @mock.patch('user_profile.views.get_access_tokens')
-    @mock.patch('user_profile.views.set_access_tokens')
-    def test_put_access_token_success(self, set_access_tokens, get_access_tokens):
+    @mock.patch('user_profile.views.set_user_access_token')
+    def test_put_access_token_success(self, set_user_access_token):
         """Method that tests the successful request to set telegram token for user."""
-        get_access_tokens.return_value = {}
-        set_access_tokens.return_value = True
+        set_user_access_token.return_value = True
         test_data = {'token': 'test_token'}
         url = reverse('telegram_redis')
 
         response = self.client.put(url, json.dumps(test_data), content_type='application/json')
         self.assertEqual(response.status_code, 200)
+        set_user_access_token.assert_called_with(self.first_user.id, 'test_token')
+
+    @mock.patch('user_profile.views.set_user_access_token')
+    def test_put_access_token_without_token(self, set_user_access_token):
+        """Method that tests the unsuccessful request to set telegram token for user
+        in case when token is not given."""
+        url = reverse('telegram_redis')
+
+        response = self.client.put(url, json.dumps({}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(set_user_access_token.called)
 
     def test_update_telegram_id_fail(self):
         """Method that tests the unsuccessful request to update telegram token for user
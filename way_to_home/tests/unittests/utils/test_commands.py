@@ -1,22 +1,50 @@
 """This module provides tests for custom commands."""
 
-from unittest.mock import patch
+from unittest.mock import call, patch
 
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
-
-from utils.management.commands.prepare_data import Command
+from telebot.apihelper import ApiException
 
 
 class CustomCommandsTestCase(TestCase):
     """TestCase for providing custom commands testing."""
 
+    @patch('builtins.print')
+    @patch('utils.management.commands.prepare_data.get_feeds')
+    @patch('utils.management.commands.prepare_data.prepare_static_easyway_data.run')
+    def test_prepare_data(self, prepare_static_easyway_data, get_feeds, mock_print):
+        """Provide tests for `prepare_data` custom command preparing every city."""
+        get_feeds.return_value = {'lviv': {}, 'kyiv': {}}
+
+        call_command('prepare_data')
+        self.assertListEqual([call('lviv'), call('kyiv')],
+                             prepare_static_easyway_data.call_args_list)
+        self.assertEqual(2, mock_print.call_count)
+
     @patch('builtins.print')
     @patch('utils.management.commands.prepare_data.prepare_static_easyway_data.run')
-    def test_prepare_data(self, prepare_static_easyway_data, mock_print):
-        """Provide tests for `prepare_data` custom command."""
-        prepare_static_easyway_data.return_value = True
-        mock_print.return_value = True
+    def test_prepare_data_city(self, prepare_static_easyway_data, mock_print):
+        """Provide tests for `prepare_data` custom command preparing the given city."""
+        call_command('prepare_data', city='lviv')
+        prepare_static_easyway_data.assert_called_once_with('lviv')
+        self.assertTrue(mock_print.called)
 
-        Command().handle()
-        self.assertTrue(prepare_static_easyway_data.called)
+    @patch('builtins.print')
+    @patch('utils.management.commands.set_telegram_webhook.BOT.set_webhook')
+    def test_set_telegram_webhook(self, set_webhook, mock_print):
+        """Provide tests for `set_telegram_webhook` custom command."""
+        call_command('set_telegram_webhook', domain='waytohome.com')
+        set_webhook.assert_called_with(
+            url='https://waytohome.com/api/v1/telegram/webhook/TELEGRAM_WEBHOOK_SECRET',
+            max_connections=8
+        )
         self.assertTrue(mock_print.called)
+
+    @patch('utils.management.commands.set_telegram_webhook.BOT.set_webhook')
+    def test_set_telegram_webhook_fail(self, set_webhook):
+        """Provide tests for `set_telegram_webhook` custom command in case of API error."""
+        set_webhook.side_effect = ApiException('error', 'setWebhook', None)
+        with self.assertRaises(CommandError):
+            call_command('set_telegram_webhook')
@@ -0,0 +1,67 @@
+"""This module provides tests for Google Directions client."""
+
+from requests.exceptions import Timeout
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.directionshelper import DirectionsClient, _get_cache_key
+
+
+class MockResponse:
+    def json(self):
+        return {'routes': [{'legs': [{'duration': {'value': 123}}]}]}
+
+
+class DirectionsClientTestCase(TestCase):
+    """TestCase for providing Google Directions client testing."""
+
+    def setUp(self):
+        """Method that provides preparation before testing Directions client."""
+        self.client = DirectionsClient(max_workers=2)
+        self.origin = (49.870570, 24.031429)
+        self.destination = (49.84, 24.02)
+
+    def test_get_cache_key(self):
+        """Provide tests for `_get_cache_key` function."""
+        expected_key = 'directions:49.871,24.031:49.84,24.02'
+        self.assertEqual(expected_key, _get_cache_key(self.origin, self.destination))
+        self.assertEqual(expected_key, _get_cache_key((49.8706, 24.0312), self.destination))
+
+    @patch('utils.directionshelper.REDIS_HELPER.set')
+    @patch('utils.directionshelper.REDIS_HELPER.get', return_value=None)
+    @patch('requests.Session.get', return_value=MockResponse())
+    def test_get_duration_success(self, session_get, redis_get, redis_set):
+        """Provide tests for `get_duration` method in case of success."""
+        duration = self.client.get_duration(self.origin, self.destination)
+        self.assertEqual(123, duration)
+        self.assertTrue(session_get.called)
+        redis_set.assert_called_with(_get_cache_key(self.origin, self.destination),
+                                     123, cache_time=60)
+
+    @patch('utils.directionshelper.REDIS_HELPER.get', return_value=b'321')
+    @patch('requests.Session.get')
+    def test_get_duration_cached(self, session_get, redis_get):
+        """Provide tests for `get_duration` method in case of cached duration."""
+        duration = self.client.get_duration(self.origin, self.destination)
+        self.assertEqual(321, duration)
+        self.assertFalse(session_get.called)
+
+    @patch('utils.directionshelper.REDIS_HELPER.get', return_value=None)
+    @patch('requests.Session.get')
+    def test_get_duration_fail(self, session_get, redis_get):
+        """Provide tests for `get_duration` method in case of failed request."""
+        session_get.side_effect = Timeout()
+        self.assertIsNone(self.client.get_duration(self.origin, self.destination))
+
+        session_get.side_effect = None
+        session_get.return_value.json.return_value = {'routes': []}
+        self.assertIsNone(self.client.get_duration(self.origin, self.destination))
+
+    @patch('utils.directionshelper.DirectionsClient.get_duration', side_effect=[100, None, 300])
+    def test_get_durations(self, get_duration):
+        """Provide tests for `get_durations` method."""
+        origins = [self.origin, self.origin, self.origin]
+        durations = self.client.get_durations(origins, self.destination)
+        self.assertEqual([100, None, 300], durations)
+        self.assertEqual(3, get_duration.call_count)
@@ -1,17 +1,20 @@
 """This module provides tests for Easy Way helpers functions."""
 
 from google.transit import gtfs_realtime_pb2
-from collections import defaultdict
 
 from django.test import TestCase
 from unittest.mock import patch
 
-from utils.easy_way import (compile_file,
+from utils.easy_way import (compile_feed,
+                            get_header_timestamp,
                             parse_trips_data,
                             parse_routes_data,
                             parse_stops_data,
-                            _parse_vehicle_data,
-                            prettify_gtfs)
+                            parse_stop_times_data,
+                            build_route_patterns,
+                            normalize_route_name,
+                            build_routes_index,
+                            _parse_vehicle_data)
 
 
 class EasyWayTestCase(TestCase):
@@ -22,27 +25,44 @@ class EasyWayTestCase(TestCase):
         self.feed = gtfs_realtime_pb2.FeedMessage()
         self.path_to_gtfs_file = 'tests/unittests/utils/test_vehicle_position'
 
-    def test_compile_file_success(self):
-        """Provide tests for `compile_file` function in case of success."""
+    def test_compile_feed_success(self):
+        """Provide tests for `compile_feed` function in case of success."""
         with open(self.path_to_gtfs_file, 'rb') as file:
             content = file.read()
 
         self.feed.ParseFromString(content)
         expected_gtfs_data = _parse_vehicle_data(self.feed.entity)
 
-        actual_gtfs_data = compile_file(self.path_to_gtfs_file)
+        timestamps, actual_gtfs_data = compile_feed(content)
         self.assertEqual(expected_gtfs_data, actual_gtfs_data)
+        self.assertEqual((1549367055, 1549367053), timestamps)
 
-    def test_compile_file_open_error(self):
-        """Provide tests for `compile_file` function in case of open operations is failed."""
-        with patch('builtins.open') as open_file:
-            open_file.side_effect = FileNotFoundError()
-            result = compile_file(self.path_to_gtfs_file)
-            self.assertIsNone(result)
+    def test_get_header_timestamp(self):
+        """Provide tests for `get_header_timestamp` function."""
+        with open(self.path_to_gtfs_file, 'rb') as file:
+            content = file.read()
+
+        self.assertEqual(1549367055, get_header_timestamp(content))
+        self.assertIsNone(get_header_timestamp(b''))
+        self.assertIsNone(get_header_timestamp(b'\x12\x00'))
+        self.assertIsNone(get_header_timestamp(b'\x0a\xff'))
+
+    def test_compile_feed_not_newer(self):
+        """Provide tests for `compile_feed` function in case of feed is not newer."""
+        with open(self.path_to_gtfs_file, 'rb') as file:
+            content = file.read()
 
-            open_file.side_effect = PermissionError()
-            result = compile_file(self.path_to_gtfs_file)
-            self.assertIsNone(result)
+        with patch('utils.easy_way._parse_vehicle_data') as parse_vehicle_data:
+            self.assertEqual(((1549367055, 0), None), compile_feed(content, (1549367055, 0)))
+            self.assertEqual(((1549367056, 1549367053), None),
+                             compile_feed(content, (1549367056, 1549367053)))
+
+            timestamps, gtfs_data = compile_feed(content, (1549367000, 1549367053))
+            self.assertEqual((1549367055, 1549367053), timestamps)
+            self.assertIsNone(gtfs_data)
+            self.assertFalse(parse_vehicle_data.called)
+
+        self.assertIsNone(compile_feed(b'\x0a\x05invalid'))
 
     def test_parse_vehicle_data(self):
         """Provide tests for `parse_vehicle_data` function in case of success."""
@@ -62,82 +82,129 @@ class EasyWayTestCase(TestCase):
                 'trip_id': entity.vehicle.trip.trip_id,
                 'lat': entity.vehicle.position.latitude,
                 'lon': entity.vehicle.position.longitude,
-                'vehicle_id': entity.vehicle.vehicle.id
+                'vehicle_id': entity.vehicle.vehicle.id,
+                'timestamp': entity.vehicle.timestamp
             })
 
         actual_vehicle_data = _parse_vehicle_data(feed.entity)
         self.assertDictEqual(expected_vehicle_data, actual_vehicle_data)
 
-    @patch('utils.easy_way.parse_csv_file')
-    def test_parse_trips_data(self, parse_csv):
+    @patch('utils.easy_way.iter_csv_file')
+    def test_parse_trips_data(self, iter_csv):
         """Provide tests for `parse_trips_data` function in case of success."""
-        parse_csv_file_data = [
-            {'route_id': '129', 'trip_id': '8446_3_1'},
-            {'route_id': '129', 'trip_id': '8446_4_0'},
-            {'route_id': '129', 'trip_id': '8446_4_1'},
-        ]
-        parse_csv.return_value = parse_csv_file_data
-
-        expected_trips = defaultdict(list)
-        for trip in parse_csv_file_data:
-            key = trip.get('route_id')
-            value = trip.get('trip_id')
-            expected_trips[key].append(value)
+        iter_csv.return_value = iter([
+            ('129', '8446_3_1'),
+            ('129', '8446_4_0'),
+            ('130', '8447_1_0'),
+        ])
+
+        expected_trips = {'129': ['8446_3_1', '8446_4_0'], '130': ['8447_1_0']}
 
         actual_trips = parse_trips_data('path/to/trips/file')
         self.assertDictEqual(expected_trips, actual_trips)
+        iter_csv.assert_called_with('path/to/trips/file', ['route_id', 'trip_id'])
 
-    @patch('utils.easy_way.parse_csv_file')
-    def test_parse_routes_data(self, parse_csv):
+    @patch('utils.easy_way.iter_csv_file')
+    def test_parse_routes_data(self, iter_csv):
         """Provide tests for `parse_routes_data` function if case of success."""
-        parse_csv_file_data = [
-            {'route_id': '88', 'route_short_name': 'А48'},
-            {'route_id': '90', 'route_short_name': 'А01'},
-            {'route_id': '91', 'route_short_name': 'Н-А01'},
-        ]
-        parse_csv.return_value = parse_csv_file_data
-
-        expected_routes = {}
-        for route in parse_csv_file_data:
-            key = route.get('route_id')
-            value = route.get('route_short_name')
-            expected_routes[key] = value
+        iter_csv.return_value = iter([
+            ('88', 'А48'),
+            ('90', 'А01'),
+            ('91', 'Н-А01'),
+        ])
+
+        expected_routes = {'88': 'А48', '90': 'А01', '91': 'Н-А01'}
 
         actual_routes = parse_routes_data('path/to/routes/file')
         self.assertDictEqual(expected_routes, actual_routes)
 
-    @patch('utils.easy_way.parse_csv_file')
-    def test_parse_stops_data(self, parse_csv):
+    @patch('utils.easy_way.iter_csv_file')
+    def test_parse_stops_data(self, iter_csv):
         """Provide tests for `parse_stops_data` function if case of success."""
-        parse_csv_file_data = [
-            {'stop_id': '5179', 'stop_lat': '49.782854', 'stop_lon': '24.096483'},
-            {'stop_id': '5181', 'stop_lat': '49.818161', 'stop_lon': '24.057797'},
-            {'stop_id': '5182', 'stop_lat': '49.818116', 'stop_lon': '24.057961'},
-        ]
-        parse_csv.return_value = parse_csv_file_data
-
-        expected_stops = {}
-        for stop in parse_csv_file_data:
-            key = stop.get('stop_id')
-            latitude = stop.get('stop_lat')
-            longitude = stop.get('stop_lon')
-            expected_stops[key] = (latitude, longitude)
+        iter_csv.return_value = iter([
+            ('5179', 49.782854, 24.096483),
+            ('5181', 49.818161, 24.057797),
+        ])
+
+        expected_stops = {'5179': (49.782854, 24.096483), '5181': (49.818161, 24.057797)}
 
         actual_stops = parse_stops_data('path/to/stops/file')
         self.assertDictEqual(expected_stops, actual_stops)
-
-    def test_prettify_gtfs(self):
-        """Provide tests for `prettify_gtfs` function if case of success."""
-        gtfs_data = [{
-            'trip_id': '8274_11_0',
-            'lat': 49.80548858642578,
-            'lon': 24.121530532836914,
-            'vehicle_id': '2541'
-        }]
-
-        expected_prettified_data = []
-        for vehicle in gtfs_data:
-            expected_prettified_data.append(f'{vehicle["lat"]},{vehicle["lon"]}')
-
-        actual_prettified_data = prettify_gtfs(gtfs_data)
-        self.assertEqual(expected_prettified_data, actual_prettified_data)
+        self.assertIs(float, iter_csv.call_args[1]['converters']['stop_lat'])
+
+    @patch('utils.easy_way.iter_csv_file')
+    def test_parse_stop_times_data(self, iter_csv):
+        """Provide tests for `parse_stop_times_data` function if case of success."""
+        iter_csv.return_value = iter([
+            ('8446_3_1', 2, '5181', 86370),
+            ('8446_3_1', 1, '5179', 86280),
+            ('8446_3_1', 3, '5182', 86460),
+        ])
+
+        expected_stop_times = {'8446_3_1': [('5179', 0), ('5181', 90), ('5182', 180)]}
+
+        actual_stop_times = parse_stop_times_data('path/to/stop_times/file')
+        self.assertDictEqual(expected_stop_times, actual_stop_times)
+
+        arrival_time_converter = iter_csv.call_args[1]['converters']['arrival_time']
+        self.assertEqual(86460, arrival_time_converter('24:01:00'))
+        self.assertIsNone(arrival_time_converter(''))
+
+    @patch('utils.easy_way.iter_csv_file')
+    def test_parse_stop_times_data_empty_times(self, iter_csv):
+        """Provide tests for `parse_stop_times_data` function with stops which are not timepoints."""
+        iter_csv.return_value = iter([
+            ('8446_3_1', 1, '5179', None),
+            ('8446_3_1', 2, '5180', 86280),
+            ('8446_3_1', 3, '5181', None),
+            ('8446_3_1', 4, '5182', None),
+            ('8446_3_1', 5, '5183', 86460),
+            ('8446_3_1', 6, '5184', None),
+            ('8446_4_0', 1, '5179', None),
+        ])
+
+        expected_stop_times = {
+            '8446_3_1': [('5180', 0), ('5181', 60), ('5182', 120), ('5183', 180)]
+        }
+
+        actual_stop_times = parse_stop_times_data('path/to/stop_times/file')
+        self.assertDictEqual(expected_stop_times, actual_stop_times)
+
+    def test_build_route_patterns(self):
+        """Provide tests for `build_route_patterns` function if case of success."""
+        trips = {'129': ['8446_3_1', '8446_4_0', '8446_4_1'], '130': ['8447_1_0']}
+        stops = {'5179': (49.782854, 24.096483), '5181': (49.818161, 24.057797)}
+        stop_times = {
+            '8446_3_1': [('5179', 0), ('5181', 90)],
+            '8446_4_0': [('5181', 0), ('5179', 120)],
+            '8446_4_1': [('5179', 0), ('5181', 90)],
+        }
+
+        expected_patterns = {'129': {
+            'patterns': [
+                [('5179', 49.782854, 24.096483, 0), ('5181', 49.818161, 24.057797, 90)],
+                [('5181', 49.818161, 24.057797, 0), ('5179', 49.782854, 24.096483, 120)],
+            ],
+            'trips': {'8446_3_1': 0, '8446_4_0': 1, '8446_4_1': 0}
+        }}
+
+        actual_patterns = build_route_patterns(trips, stops, stop_times)
+        self.assertDictEqual(expected_patterns, actual_patterns)
+
+    def test_normalize_route_name(self):
+        """Provide tests for `normalize_route_name` function."""
+        self.assertEqual('ТР05', normalize_route_name('Тр5'))
+        self.assertEqual('ТР05', normalize_route_name(' Tр05 '))
+        self.assertEqual('А48', normalize_route_name('A48'))
+        self.assertEqual('Т06', normalize_route_name('Т06'))
+        self.assertEqual('Н-А01', normalize_route_name('Н-А1'))
+        self.assertEqual('А100', normalize_route_name('А100'))
+        self.assertEqual('ЗЕЛЕНИЙ', normalize_route_name('Зелений'))
+
+    def test_build_routes_index(self):
+        """Provide tests for `build_routes_index` function."""
+        routes = {'88': 'А48', '90': 'Тр5', '91': 'Тр05', '92': 'Н-А01'}
+
+        expected_routes_index = {'А48': '88', 'ТР05': '90,91', 'Н-А01': '92'}
+        actual_routes_index = build_routes_index(routes)
+        self.assertDictEqual(expected_routes_index, actual_routes_index)
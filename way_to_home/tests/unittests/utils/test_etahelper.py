@@ -0,0 +1,107 @@
+"""This module provides tests for ETA helper functions."""
+
+import pickle
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.etahelper import (haversine,
+                             get_bearing,
+                             is_heading_away,
+                             find_stop_position,
+                             get_vehicle_progress,
+                             estimate_arrival_times,
+                             get_route_patterns)
+
+
+class ETAHelperTestCase(TestCase):
+    """TestCase for providing ETA helper functions testing."""
+
+    def setUp(self):
+        """Provides preparation before testing ETA helper functions."""
+        self.pattern = [
+            ('1', 49.8400, 24.0000, 0),
+            ('2', 49.8400, 24.0100, 120),
+            ('3', 49.8400, 24.0200, 240),
+        ]
+        self.route_patterns = {'patterns': [self.pattern], 'trips': {'8446_3_1': 0}}
+
+    def test_haversine(self):
+        """Provide tests for `haversine` function."""
+        self.assertEqual(0, haversine(49.84, 24.02, 49.84, 24.02))
+        self.assertAlmostEqual(111195, haversine(49.0, 24.0, 50.0, 24.0), delta=1)
+
+    def test_get_bearing(self):
+        """Provide tests for `get_bearing` function."""
+        self.assertAlmostEqual(0, get_bearing(49.0, 24.0, 50.0, 24.0))
+        self.assertAlmostEqual(90, get_bearing(49.84, 24.0, 49.84, 24.01), delta=0.1)
+        self.assertAlmostEqual(180, get_bearing(50.0, 24.0, 49.0, 24.0))
+
+    def test_is_heading_away(self):
+        """Provide tests for `is_heading_away` function."""
+        vehicle = {'lat': 49.84, 'lon': 24.0}
+        stop_coords = (49.84, 24.01)
+
+        self.assertFalse(is_heading_away(vehicle, stop_coords, (7, 80)))
+        self.assertTrue(is_heading_away(vehicle, stop_coords, (7, 260)))
+        self.assertFalse(is_heading_away(vehicle, stop_coords, (0.5, 260)))
+        self.assertFalse(is_heading_away(vehicle, stop_coords, (7, None)))
+        self.assertFalse(is_heading_away(vehicle, stop_coords, None))
+
+    def test_find_stop_position(self):
+        """Provide tests for `find_stop_position` function."""
+        self.assertEqual(1, find_stop_position(self.pattern, (49.8401, 24.0101)))
+        self.assertIsNone(find_stop_position(self.pattern, (49.9, 24.1)))
+        self.assertEqual(2, find_stop_position(self.pattern, (49.9, 24.1), stop_id=3))
+        self.assertEqual(1, find_stop_position(self.pattern, (49.8401, 24.0101), stop_id=4))
+
+    def test_get_vehicle_progress(self):
+        """Provide tests for `get_vehicle_progress` function."""
+        self.assertAlmostEqual(60, get_vehicle_progress(self.pattern, 49.8401, 24.0050), delta=1)
+        self.assertAlmostEqual(180, get_vehicle_progress(self.pattern, 49.8399, 24.0150), delta=1)
+        self.assertEqual(0, get_vehicle_progress(self.pattern[:1], 49.8399, 24.0150))
+
+    def test_estimate_arrival_times(self):
+        """Provide tests for `estimate_arrival_times` function."""
+        vehicles = [
+            {'trip_id': '8446_3_1', 'lat': 49.8400, 'lon': 24.0050},
+            {'trip_id': '8446_3_1', 'lat': 49.8400, 'lon': 24.0150},
+            {'trip_id': 'unknown', 'lat': 49.8400, 'lon': 24.0100},
+        ]
+
+        vehicles_time = estimate_arrival_times(vehicles, (49.8400, 24.0200), self.route_patterns)
+        self.assertEqual(3, len(vehicles_time))
+        self.assertAlmostEqual(180, vehicles_time[0], delta=1)
+        self.assertAlmostEqual(60, vehicles_time[1], delta=1)
+
+    def test_estimate_arrival_times_with_motions(self):
+        """Provide tests for `estimate_arrival_times` function with motions of vehicles."""
+        vehicles = [
+            {'trip_id': 'unknown', 'lat': 49.8400, 'lon': 24.0100, 'vehicle_id': '1'},
+            {'trip_id': 'unknown', 'lat': 49.8400, 'lon': 24.0100, 'vehicle_id': '2'},
+        ]
+        motions = {'1': (10, 90), '2': (10, 270)}
+
+        vehicles_time = estimate_arrival_times(vehicles, (49.8400, 24.0200),
+                                               self.route_patterns, motions=motions)
+        self.assertEqual(1, len(vehicles_time))
+        self.assertAlmostEqual(93, vehicles_time[0], delta=1)
+
+    def test_estimate_arrival_times_passed_stop(self):
+        """Provide tests for `estimate_arrival_times` function in case of vehicle passed the stop."""
+        vehicles = [{'trip_id': '8446_3_1', 'lat': 49.8400, 'lon': 24.0150}]
+
+        vehicles_time = estimate_arrival_times(vehicles, (49.8400, 24.0000), self.route_patterns)
+        self.assertEqual([], vehicles_time)
+
+        vehicles_time = estimate_arrival_times(vehicles, (49.9, 24.1), self.route_patterns)
+        self.assertEqual([], vehicles_time)
+
+    @patch('utils.etahelper.REDIS_HELPER.hget')
+    def test_get_route_patterns(self, redis_hget):
+        """Provide tests for `get_route_patterns` function."""
+        redis_hget.return_value = pickle.dumps(self.route_patterns)
+        self.assertDictEqual(self.route_patterns, get_route_patterns('129'))
+
+        redis_hget.return_value = None
+        self.assertIsNone(get_route_patterns('129'))
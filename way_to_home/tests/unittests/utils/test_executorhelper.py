@@ -0,0 +1,20 @@
+"""This module provides tests for executor helper module."""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from utils.executorhelper import LazyExecutor
+
+
+class ExecutorHelperTestCase(TestCase):
+    """TestCase for providing executor helper module testing."""
+
+    @patch('utils.executorhelper.ThreadPoolExecutor')
+    def test_lazy_executor(self, thread_pool_executor):
+        """Provide tests for `LazyExecutor` creating thread pool once on the first use."""
+        executor = LazyExecutor(max_workers=3)
+        self.assertFalse(thread_pool_executor.called)
+
+        self.assertIs(executor.get(), executor.get())
+        thread_pool_executor.assert_called_once_with(max_workers=3)
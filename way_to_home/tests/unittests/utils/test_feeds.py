@@ -0,0 +1,30 @@
+"""This module provides tests for registry of GTFS feeds."""
+
+from django.test import TestCase, override_settings
+
+from utils.feeds import get_feeds, get_city_key, find_city
+
+
+TEST_FEEDS = {
+    'lviv': {'realtime_url': 'http://lviv.test', 'bounds': (49.75, 23.85, 49.92, 24.15)},
+    'kyiv': {'realtime_url': 'http://kyiv.test', 'bounds': (50.2, 30.2, 50.6, 30.85)},
+}
+
+
+@override_settings(GTFS_FEEDS=TEST_FEEDS)
+class FeedsTestCase(TestCase):
+    """TestCase for providing feeds registry functions testing."""
+
+    def test_get_feeds(self):
+        """Provide tests for `get_feeds` function."""
+        self.assertDictEqual(TEST_FEEDS, get_feeds())
+
+    def test_get_city_key(self):
+        """Provide tests for `get_city_key` function."""
+        self.assertEqual('lviv:routes_index', get_city_key('lviv', 'routes_index'))
+
+    def test_find_city(self):
+        """Provide tests for `find_city` function."""
+        self.assertEqual('lviv', find_city(49.8419, 24.0311))
+        self.assertEqual('kyiv', find_city('50.4501', '30.5234'))
+        self.assertIsNone(find_city(34.1234, 43.1234))
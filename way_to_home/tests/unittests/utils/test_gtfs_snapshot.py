@@ -0,0 +1,128 @@
+"""This module provides tests for GTFS snapshot functions."""
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.gtfs_snapshot import (pack_route,
+                                 unpack_route,
+                                 is_snapshot_published,
+                                 publish_snapshot,
+                                 get_route_vehicles,
+                                 GTFS_DATA_KEY,
+                                 SNAPSHOT_VERSION_FIELD)
+
+
+class GTFSSnapshotTestCase(TestCase):
+    """TestCase for providing GTFS snapshot functions testing."""
+
+    def setUp(self):
+        """Provides preparation before testing GTFS snapshot functions."""
+        self.vehicle_data = {
+            '129': [
+                {'trip_id': '8446_3_1', 'lat': 49.80548858642578,
+                 'lon': 24.121530532836914, 'vehicle_id': '2541'},
+                {'trip_id': '8446_3_1', 'lat': 49.84391784667969,
+                 'lon': 24.02617073059082, 'vehicle_id': '2542'},
+            ],
+            '90': [
+                {'trip_id': '1085_0_0', 'lat': 49.80695724487305,
+                 'lon': 24.010440826416016, 'vehicle_id': '3012'},
+            ],
+            '91': []
+        }
+
+    def test_pack_unpack_route(self):
+        """Provide tests for `pack_route` and `unpack_route` functions in case of success."""
+        vehicles = self.vehicle_data['129']
+
+        block = pack_route(vehicles)
+        self.assertIsInstance(block, bytes)
+        self.assertEqual(vehicles, unpack_route(block))
+
+    def test_pack_unpack_route_long_id(self):
+        """Provide tests for `pack_route` and `unpack_route` functions in case of long ids."""
+        vehicles = [dict(vehicle, vehicle_id='ід' * 200) for vehicle in self.vehicle_data['129']]
+
+        block = pack_route(vehicles)
+        self.assertEqual(vehicles, unpack_route(block))
+
+    def test_unpack_route_corrupted(self):
+        """Provide tests for `unpack_route` function in case of corrupted block."""
+        block = pack_route(self.vehicle_data['129'])
+        self.assertIsNone(unpack_route(block[:10]))
+
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.update_hash')
+    def test_publish_snapshot_initial(self, update_hash):
+        """Provide tests for `publish_snapshot` function in case of the first publication."""
+        update_hash.return_value = True
+        blocks = {route_id: pack_route(vehicles) for route_id, vehicles in self.vehicle_data.items()}
+
+        successful_published = publish_snapshot(blocks, {}, version=100)
+        self.assertTrue(successful_published)
+
+        mapping = update_hash.call_args[1]['mapping']
+        self.assertEqual(100, mapping.pop(SNAPSHOT_VERSION_FIELD))
+        self.assertDictEqual(blocks, mapping)
+        self.assertTrue(update_hash.call_args[1]['replace'])
+
+    @patch('utils.gtfs_snapshot.is_snapshot_published', return_value=True)
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.update_hash')
+    def test_publish_snapshot_changed_routes(self, update_hash, is_snapshot_published):
+        """Provide tests for `publish_snapshot` function in case of partially changed routes."""
+        update_hash.return_value = True
+        published_blocks = {route_id: pack_route(vehicles)
+                            for route_id, vehicles in self.vehicle_data.items()}
+        blocks = published_blocks.copy()
+        blocks['90'] = pack_route(self.vehicle_data['129'])
+        del blocks['91']
+
+        publish_snapshot(blocks, published_blocks, version=101, published_version=100)
+
+        call_kwargs = update_hash.call_args[1]
+        self.assertDictEqual({'90': blocks['90'], SNAPSHOT_VERSION_FIELD: 101}, call_kwargs['mapping'])
+        self.assertEqual(['91'], call_kwargs['removed_keys'])
+        self.assertFalse(call_kwargs['replace'])
+        is_snapshot_published.assert_called_with(published_blocks, 100, GTFS_DATA_KEY)
+
+    @patch('utils.gtfs_snapshot.is_snapshot_published', return_value=False)
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.update_hash')
+    def test_publish_snapshot_lost(self, update_hash, is_snapshot_published):
+        """Provide tests for `publish_snapshot` function in case of snapshot was lost in redis."""
+        update_hash.return_value = True
+        published_blocks = {route_id: pack_route(vehicles)
+                            for route_id, vehicles in self.vehicle_data.items()}
+
+        publish_snapshot(published_blocks, published_blocks, version=101, published_version=100)
+
+        call_kwargs = update_hash.call_args[1]
+        self.assertDictEqual(dict(published_blocks, **{SNAPSHOT_VERSION_FIELD: 101}),
+                             call_kwargs['mapping'])
+        self.assertTrue(call_kwargs['replace'])
+        self.assertTrue(is_snapshot_published.called)
+
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.hlen')
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.hget')
+    def test_is_snapshot_published(self, redis_hget, redis_hlen):
+        """Provide tests for `is_snapshot_published` function."""
+        published_blocks = {'129': b'block', '130': b'block'}
+        redis_hget.return_value = b'100'
+        redis_hlen.return_value = 3
+        self.assertTrue(is_snapshot_published(published_blocks, 100))
+
+        redis_hlen.return_value = 2
+        self.assertFalse(is_snapshot_published(published_blocks, 100))
+
+        redis_hlen.return_value = 3
+        self.assertFalse(is_snapshot_published(published_blocks, 99))
+
+        redis_hget.return_value = None
+        self.assertFalse(is_snapshot_published(published_blocks, 100))
+
+    @patch('utils.gtfs_snapshot.REDIS_HELPER.hget')
+    def test_get_route_vehicles(self, redis_hget):
+        """Provide tests for `get_route_vehicles` function."""
+        redis_hget.return_value = pack_route(self.vehicle_data['129'])
+        self.assertEqual(self.vehicle_data['129'], get_route_vehicles('129'))
+
+        redis_hget.return_value = None
+        self.assertIsNone(get_route_vehicles('100'))
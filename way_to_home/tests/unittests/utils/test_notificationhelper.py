@@ -5,9 +5,7 @@ This module provides complete testing for all notification functions.
 """
 
 import pytz
-import pickle
 
-from celery.result import AsyncResult
 from freezegun import freeze_time
 from unittest import mock
 from datetime import datetime, date, timedelta, time
@@ -15,8 +13,12 @@ from django.test import TestCase
 
 from utils.notificationhelper import (get_seconds_until_midnight,
                                       get_prepare_task_time,
-                                      set_notifications_tasks,
-                                      get_notifications_tasks,
+                                      get_wheel_bucket,
+                                      schedule_notifications,
+                                      unschedule_notifications,
+                                      unscheduling_batch,
+                                      defer_unscheduling,
+                                      pop_due_notifications,
                                       get_route_id_by_name,
                                       get_preparing_time,
                                       DEFAULT_PREPARING_TIME)
@@ -49,38 +51,65 @@ class NotificationTestCase(TestCase):
         gotten_time = get_seconds_until_midnight()
         self.assertEqual(expected_time, gotten_time)
 
-    @mock.patch('utils.redishelper.REDIS_HELPER.get')
-    def test_get_notifications_tasks_if_nonexistent(self, redis_get):
-        """Provide tests for `get_notifications_tasks` method
-        in case if notification task not exist."""
-        redis_get.return_value = None
-        gotten_result = get_notifications_tasks()
-        self.assertDictEqual(gotten_result, {})
-
-    @mock.patch('utils.redishelper.REDIS_HELPER.get')
-    def test_get_notifications_tasks(self, redis_get):
-        """Provide tests for `get_notifications_tasks` method."""
-        notification_id = 100
-        notifications_tasks = {notification_id: AsyncResult(notification_id)}
-        redis_get.return_value = pickle.dumps(notifications_tasks)
-        gotten_result = get_notifications_tasks()
-        self.assertDictEqual(gotten_result, notifications_tasks)
-
-    @mock.patch('utils.notificationhelper.get_seconds_until_midnight')
-    @mock.patch('utils.redishelper.REDIS_HELPER.set')
-    def test_set_notifications_tasks(self, redis_set, get_seconds_until_midnight):
-        """Provide tests for `set_notifications_tasks` method."""
-        redis_set.return_value = True
-        expected_result = set_notifications_tasks({'test_key': 'test_value'})
-        self.assertTrue(get_seconds_until_midnight.called)
-        self.assertTrue(redis_set.called)
+    def test_get_wheel_bucket(self):
+        """Provide tests for `get_wheel_bucket` method."""
+        task_time = datetime(2019, 1, 1, 10, 30, 59, tzinfo=pytz.utc)
+        expected_bucket = int(datetime(2019, 1, 1, 10, 30, tzinfo=pytz.utc).timestamp())
+        self.assertEqual(expected_bucket, get_wheel_bucket(task_time))
+        self.assertEqual(expected_bucket + 60, get_wheel_bucket(task_time + timedelta(seconds=1)))
+
+    @mock.patch('utils.redishelper.REDIS_HELPER.zadd')
+    def test_schedule_notifications(self, redis_zadd):
+        """Provide tests for `schedule_notifications` method."""
+        redis_zadd.return_value = True
+        expected_result = schedule_notifications({100: self.task_time}, replace=True)
         self.assertTrue(expected_result)
-
-        redis_set.return_value = False
-        expected_result = set_notifications_tasks({'test_key': 'test_value'})
-        self.assertTrue(get_seconds_until_midnight.called)
-        self.assertTrue(redis_set.called)
-        self.assertFalse(expected_result)
+        redis_zadd.assert_called_with('notifications_wheel',
+                                      mapping={100: get_wheel_bucket(self.task_time)},
+                                      replace=True)
+
+    @mock.patch('utils.redishelper.REDIS_HELPER.zrem')
+    def test_unschedule_notifications(self, redis_zrem):
+        """Provide tests for `unschedule_notifications` method."""
+        redis_zrem.return_value = True
+        self.assertTrue(unschedule_notifications([100]))
+        redis_zrem.assert_called_with('notifications_wheel', [100])
+
+    @mock.patch('utils.redishelper.REDIS_HELPER.zrem')
+    def test_unscheduling_batch(self, redis_zrem):
+        """Provide tests for `unscheduling_batch` and `defer_unscheduling` methods."""
+        self.assertFalse(defer_unscheduling(100))
+
+        with unscheduling_batch():
+            self.assertTrue(defer_unscheduling(100))
+            with unscheduling_batch():
+                self.assertTrue(defer_unscheduling(101))
+            redis_zrem.assert_not_called()
+
+        redis_zrem.assert_called_once_with('notifications_wheel', [100, 101])
+        self.assertFalse(defer_unscheduling(102))
+
+    @mock.patch('utils.redishelper.REDIS_HELPER.zrem')
+    def test_unscheduling_batch_error(self, redis_zrem):
+        """Provide tests for `unscheduling_batch` method in case of failed block."""
+        with self.assertRaises(ValueError):
+            with unscheduling_batch():
+                defer_unscheduling(100)
+                raise ValueError
+
+        redis_zrem.assert_not_called()
+        self.assertFalse(defer_unscheduling(100))
+
+    @mock.patch('utils.redishelper.REDIS_HELPER.pop_range_by_score')
+    def test_pop_due_notifications(self, redis_pop_range):
+        """Provide tests for `pop_due_notifications` method."""
+        redis_pop_range.return_value = [b'100', b'101']
+        gotten_result = pop_due_notifications(self.task_time)
+        self.assertListEqual([100, 101], gotten_result)
+        redis_pop_range.assert_called_with('notifications_wheel', get_wheel_bucket(self.task_time))
+
+        redis_pop_range.return_value = None
+        self.assertIsNone(pop_due_notifications())
 
     def test_get_prepare_task_time(self):
         """Provide tests for `get_prepare_task_time` method."""
@@ -110,20 +139,23 @@ class NotificationTestCase(TestCase):
         )
         self.assertEqual(expected_task_time, gotten_task_time)
 
-    def test_get_route_id_by_name_success(self):
+    @mock.patch('utils.notificationhelper.REDIS_HELPER.hget')
+    def test_get_route_id_by_name_success(self, redis_hget):
         """Provide tests for `get_route_id_by_name` method."""
-        routes_data = {'test_route_id': 'test_short_name'}
-        route_name = 'test_short_name'
-        expected_result = 'test_route_id'
-        gotten_result = get_route_id_by_name(routes_data, route_name)
-        self.assertEqual(expected_result, gotten_result)
+        redis_hget.return_value = b'88,89'
+        gotten_result = get_route_id_by_name('Тр5')
+        self.assertEqual('88', gotten_result)
+        redis_hget.assert_called_with('routes_index', 'ТР05')
+
+        get_route_id_by_name('Тр5', key='lviv:routes_index')
+        redis_hget.assert_called_with('lviv:routes_index', 'ТР05')
 
-    def test_get_route_id_by_name_fail(self):
+    @mock.patch('utils.notificationhelper.REDIS_HELPER.hget')
+    def test_get_route_id_by_name_fail(self, redis_hget):
         """Provide tests for `get_route_id_by_name` method in the case when
         `route_name` parameter not exist."""
-        routes_data = {'test_route_id': 'test_short_name'}
-        route_name = 'nonexistent_name'
-        gotten_result = get_route_id_by_name(routes_data, route_name)
+        redis_hget.return_value = None
+        gotten_result = get_route_id_by_name('nonexistent_name')
         self.assertIsNone(gotten_result)
 
     def test_get_preparing_time(self):
@@ -45,6 +45,156 @@ class RedisWorkerTestCase(TestCase):
         expected_value = self.redis_helper.get(self.key)
         self.assertFalse(expected_value)
 
+    @patch('redis.client.Pipeline.execute')
+    def test_set_many(self, pipeline_execute):
+        """Provide tests for `set_many` method."""
+        pipeline_execute.return_value = [True, True]
+        self.assertTrue(self.redis_helper.set_many({'first': 1, 'second': 2}, 60))
+
+        pipeline_execute.side_effect = RedisError
+        self.assertFalse(self.redis_helper.set_many({'first': 1}))
+
+    @patch('redis.Redis.delete')
+    def test_delete(self, redis_delete):
+        """Provide tests for `delete` method."""
+        self.assertTrue(self.redis_helper.delete(['first', 'second']))
+        redis_delete.assert_called_with('first', 'second')
+
+        redis_delete.side_effect = RedisError
+        self.assertFalse(self.redis_helper.delete(['first']))
+
+    @patch('redis.Redis.incr')
+    def test_incr(self, redis_incr):
+        """Provide tests for `incr` method."""
+        redis_incr.return_value = 2
+        self.assertEqual(2, self.redis_helper.incr(self.key))
+
+        redis_incr.side_effect = RedisError
+        self.assertIsNone(self.redis_helper.incr(self.key))
+
+    @patch('redis.Redis.hget')
+    def test_hget_success(self, redis_hget):
+        """Provide tests for `hget` method in case of success."""
+        redis_hget.return_value = self.value
+        expected_value = self.redis_helper.hget(self.key, 'test field')
+        self.assertEqual(self.value, expected_value)
+
+    @patch('redis.Redis.hget')
+    def test_hget_redis_error(self, redis_hget):
+        """Provide tests for `hget` method in case of raised RedisError."""
+        redis_hget.side_effect = RedisError
+        expected_value = self.redis_helper.hget(self.key, 'test field')
+        self.assertIsNone(expected_value)
+
+    @patch('redis.Redis.hlen')
+    def test_hlen(self, redis_hlen):
+        """Provide tests for `hlen` method."""
+        redis_hlen.return_value = 3
+        self.assertEqual(3, self.redis_helper.hlen(self.key))
+
+        redis_hlen.side_effect = RedisError
+        self.assertIsNone(self.redis_helper.hlen(self.key))
+
+    @patch('redis.Redis.hmget')
+    def test_hmget_success(self, redis_hmget):
+        """Provide tests for `hmget` method in case of success."""
+        redis_hmget.return_value = [self.value, None]
+        expected_values = self.redis_helper.hmget(self.key, ['first field', 'second field'])
+        self.assertEqual([self.value, None], expected_values)
+
+    @patch('redis.Redis.hmget')
+    def test_hmget_redis_error(self, redis_hmget):
+        """Provide tests for `hmget` method in case of raised RedisError."""
+        redis_hmget.side_effect = RedisError
+        expected_values = self.redis_helper.hmget(self.key, ['test field'])
+        self.assertIsNone(expected_values)
+
+    @patch('redis.client.Pipeline.execute')
+    def test_update_hash_success(self, pipeline_execute):
+        """Provide tests for `update_hash` method in case of success."""
+        pipeline_execute.return_value = [True]
+        successful_updated = self.redis_helper.update_hash(
+            self.key,
+            mapping={'test field': self.value},
+            removed_keys=['old field']
+        )
+        self.assertTrue(successful_updated)
+        self.assertTrue(pipeline_execute.called)
+
+    @patch('redis.client.Pipeline.execute')
+    def test_update_hash_redis_error(self, pipeline_execute):
+        """Provide tests for `update_hash` method in case of raised RedisError."""
+        pipeline_execute.side_effect = RedisError
+        successful_updated = self.redis_helper.update_hash(self.key, mapping={'test field': self.value},
+                                                           replace=True)
+        self.assertFalse(successful_updated)
+
+    @patch('redis.client.Pipeline.execute')
+    def test_zadd_success(self, pipeline_execute):
+        """Provide tests for `zadd` method in case of success."""
+        pipeline_execute.return_value = [True, 1]
+        successful_added = self.redis_helper.zadd(self.key, mapping={'member': 60}, replace=True)
+        self.assertTrue(successful_added)
+        self.assertTrue(pipeline_execute.called)
+
+    @patch('redis.client.Pipeline.execute')
+    def test_zadd_redis_error(self, pipeline_execute):
+        """Provide tests for `zadd` method in case of raised RedisError."""
+        pipeline_execute.side_effect = RedisError
+        successful_added = self.redis_helper.zadd(self.key, mapping={'member': 60})
+        self.assertFalse(successful_added)
+
+    @patch('redis.Redis.zrem')
+    def test_zrem(self, redis_zrem):
+        """Provide tests for `zrem` method."""
+        redis_zrem.return_value = 1
+        self.assertTrue(self.redis_helper.zrem(self.key, ['member']))
+        redis_zrem.assert_called_with(self.key, 'member')
+
+        redis_zrem.side_effect = RedisError
+        self.assertFalse(self.redis_helper.zrem(self.key, ['member']))
+
+    @patch('redis.client.Pipeline.execute')
+    def test_pop_range_by_score_success(self, pipeline_execute):
+        """Provide tests for `pop_range_by_score` method in case of success."""
+        pipeline_execute.return_value = [[b'first', b'second'], 2]
+        members = self.redis_helper.pop_range_by_score(self.key, 120)
+        self.assertListEqual([b'first', b'second'], members)
+
+    @patch('redis.client.Pipeline.execute')
+    def test_pop_range_by_score_redis_error(self, pipeline_execute):
+        """Provide tests for `pop_range_by_score` method in case of raised RedisError."""
+        pipeline_execute.side_effect = RedisError
+        self.assertIsNone(self.redis_helper.pop_range_by_score(self.key, 120))
+
+    @patch('redis.Redis.lpush')
+    def test_lpush(self, redis_lpush):
+        """Provide tests for `lpush` method."""
+        self.assertTrue(self.redis_helper.lpush(self.key, ['first', 'second']))
+        redis_lpush.assert_called_with(self.key, 'first', 'second')
+
+        redis_lpush.side_effect = RedisError
+        self.assertFalse(self.redis_helper.lpush(self.key, ['first']))
+
+    @patch('redis.client.Pipeline.execute')
+    def test_move_many(self, pipeline_execute):
+        """Provide tests for `move_many` method."""
+        pipeline_execute.return_value = [b'first', b'second', None]
+        self.assertListEqual([b'first', b'second'],
+                             self.redis_helper.move_many(self.key, 'processing', 3))
+
+        pipeline_execute.side_effect = RedisError
+        self.assertIsNone(self.redis_helper.move_many(self.key, 'processing', 3))
+
+    @patch('redis.Redis.lrem')
+    def test_lrem(self, redis_lrem):
+        """Provide tests for `lrem` method."""
+        self.assertTrue(self.redis_helper.lrem(self.key, 'first'))
+        redis_lrem.assert_called_with(self.key, 1, 'first')
+
+        redis_lrem.side_effect = RedisError
+        self.assertFalse(self.redis_helper.lrem(self.key, 'first'))
+
     def test_new_success(self):
         """Provide test for proper executions of `__new__` method."""
         new_worker = RedisWorker()
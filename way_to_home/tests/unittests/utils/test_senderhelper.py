@@ -4,13 +4,15 @@ import smtplib
 
 from django.template.loader import render_to_string
 from django.test import TestCase
+from requests.exceptions import ConnectionError
 from telebot.apihelper import ApiException
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from django.conf import settings
 from custom_user.models import CustomUser
 from utils.jwthelper import create_token
-from utils.senderhelper import send_sms, send_email, send_telegram_message
+from utils.senderhelper import (send_sms, send_email, send_batch,
+                                deliver_telegram_message, get_channels_stats, ChannelStats)
 
 
 class SenderHelperTestCase(TestCase):
@@ -48,6 +50,25 @@ class SenderHelperTestCase(TestCase):
         successful_sent = send_sms(self.phone_number, self.message_text)
         self.assertFalse(successful_sent)
 
+    @patch('requests.Session.post')
+    def test_send_sms_keep_alive_session(self, session_post):
+        """Provide tests for `send_sms` method sends request through the session."""
+        session_post.return_value.status_code = 200
+        session_post.return_value.headers = {'content-type': 'application/json'}
+        session_post.return_value.json.return_value = {'messages': [{'status': '0'}]}
+
+        successful_sent = send_sms(self.phone_number, self.message_text)
+        self.assertTrue(successful_sent)
+        self.assertEqual('https://rest.nexmo.com/sms/json', session_post.call_args[0][0])
+        self.assertEqual(self.phone_number, session_post.call_args[1]['data']['to'])
+
+    @patch('requests.Session.post')
+    def test_send_sms_request_error(self, session_post):
+        """Provide tests for `send_sms` method in case of request was failed."""
+        session_post.side_effect = ConnectionError()
+        successful_sent = send_sms(self.phone_number, self.message_text)
+        self.assertFalse(successful_sent)
+
     @patch('utils.senderhelper.send_mail')
     def test_send_email_success(self, send_email_mock):
         """Provide tests for `send_email` method in case of success."""
@@ -73,15 +94,46 @@ class SenderHelperTestCase(TestCase):
         self.assertFalse(successful_sent)
 
     @patch('telebot.TeleBot.send_message')
-    def test_send_telegram_message_fail(self, send_message):
-        """Provide tests for `send_telegram_message` method in case of fail."""
+    def test_deliver_telegram_message_fail(self, send_message):
+        """Provide tests for `deliver_telegram_message` method in case of fail."""
         send_message.side_effect = ApiException('exception_message', 'callback_func', 'test_result')
-        successful_sent = send_telegram_message(100, 'test_text')
-        self.assertFalse(successful_sent)
+        self.assertEqual((False, None), deliver_telegram_message(100, 'test_text'))
 
     @patch('telebot.TeleBot.send_message')
-    def test_send_telegram_message_success(self, send_message):
-        """Provide tests for `send_telegram_message` method in case of success."""
+    def test_deliver_telegram_message_success(self, send_message):
+        """Provide tests for `deliver_telegram_message` method in case of success."""
         send_message.return_value = True
-        successful_sent = send_telegram_message(100, 'test_text')
-        self.assertTrue(successful_sent)
+        self.assertEqual((True, None), deliver_telegram_message(100, 'test_text'))
+
+    @patch('nexmo.Client.send_message')
+    def test_send_batch(self, nexmo_send_message):
+        """Provide tests for `send_batch` method."""
+        nexmo_send_message.side_effect = [{'messages': [{'status': '0'}]},
+                                          {'messages': [{'status': 'fail status'}]}]
+
+        results = send_batch('sms', [(self.phone_number, 'first'), (self.phone_number, 'second')])
+        self.assertEqual(2, len(results))
+        self.assertEqual(1, results.count(True))
+        self.assertEqual(2, nexmo_send_message.call_count)
+        self.assertIn('sms', get_channels_stats())
+
+    def test_channel_stats(self):
+        """Provide tests for `ChannelStats` class."""
+        stats = ChannelStats()
+        self.assertEqual(0.0, stats.average_time)
+
+        stats.observe(0.1, True)
+        stats.observe(0.3, False)
+        self.assertDictEqual({'sent': 1, 'failed': 1, 'average_time': 0.2, 'max_time': 0.3},
+                             stats.to_dict())
+
+    @patch('telebot.TeleBot.send_message')
+    def test_deliver_telegram_message_retry_after(self, send_message):
+        """Provide tests for `deliver_telegram_message` method in case of rate limits."""
+        response = Mock(status_code=429)
+        response.json.return_value = {'ok': False, 'parameters': {'retry_after': 7}}
+        send_message.side_effect = ApiException('exception_message', 'callback_func', response)
+        self.assertEqual((False, 7), deliver_telegram_message(100, 'test_text'))
+
+        response.status_code = 400
+        self.assertEqual((False, None), deliver_telegram_message(100, 'test_text'))
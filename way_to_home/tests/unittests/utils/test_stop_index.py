@@ -0,0 +1,83 @@
+"""This module provides tests for spatial index of stops."""
+
+import pickle
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.etahelper import haversine
+from utils.stop_index import StopIndex, get_stop_index, find_stop_id, _STOP_INDEX_CACHE
+
+
+class StopIndexTestCase(TestCase):
+    """TestCase for providing stop index testing."""
+
+    def setUp(self):
+        """Provides preparation before testing stop index."""
+        _STOP_INDEX_CACHE.clear()
+        self.stops = {
+            '5179': (49.782854, 24.096483),
+            '5181': (49.818161, 24.057797),
+            '5182': (49.818116, 24.057961),
+            '5183': (49.841000, 24.031000),
+            '5184': (49.900000, 23.900000),
+        }
+        self.stop_index = StopIndex(self.stops)
+
+    def _scan_nearest(self, latitude, longitude):
+        """Return stops sorted by the distance from the point by linear scan."""
+        distances = [(haversine(latitude, longitude, *coords), stop_id)
+                     for stop_id, coords in self.stops.items()]
+        return [(stop_id, distance) for distance, stop_id in sorted(distances)]
+
+    def test_len(self):
+        """Provide tests for number of indexed stops."""
+        self.assertEqual(len(self.stops), len(self.stop_index))
+
+    def test_nearest(self):
+        """Provide tests for `nearest` method against the linear scan."""
+        points = [(49.8181, 24.0578), (49.84, 24.03), (49.78, 24.1), (50.2, 23.5), (49.0, 25.0)]
+        for latitude, longitude in points:
+            expected_stops = self._scan_nearest(latitude, longitude)
+            self.assertEqual(expected_stops[:1], self.stop_index.nearest(latitude, longitude))
+            self.assertEqual(expected_stops[:3], self.stop_index.nearest(latitude, longitude, k=3))
+
+    def test_nearest_empty(self):
+        """Provide tests for `nearest` method in case of empty index."""
+        self.assertEqual([], StopIndex({}).nearest(49.84, 24.03))
+
+    def test_within_radius(self):
+        """Provide tests for `within_radius` method."""
+        stops = self.stop_index.within_radius(49.8181, 24.0578, 100)
+        self.assertEqual(['5181', '5182'], [stop_id for stop_id, _ in stops])
+
+        stops = self.stop_index.within_radius(49.8181, 24.0578, 5000)
+        expected_stops = [stop_id for stop_id, distance in self._scan_nearest(49.8181, 24.0578)
+                          if distance <= 5000]
+        self.assertEqual(expected_stops, [stop_id for stop_id, _ in stops])
+
+    @patch('utils.stop_index.REDIS_HELPER.get')
+    def test_get_stop_index(self, redis_get):
+        """Provide tests for `get_stop_index` function."""
+        redis_get.return_value = None
+        self.assertIsNone(get_stop_index('lviv:stops_index'))
+
+        redis_get.return_value = pickle.dumps(self.stop_index)
+        self.assertEqual(len(self.stops), len(get_stop_index('lviv:stops_index')))
+
+        redis_get.return_value = None
+        self.assertIsNotNone(get_stop_index('lviv:stops_index'))
+        self.assertIsNone(get_stop_index('kyiv:stops_index'))
+        self.assertEqual(3, redis_get.call_count)
+
+    @patch('utils.stop_index.get_stop_index')
+    def test_find_stop_id(self, get_stop_index_mock):
+        """Provide tests for `find_stop_id` function."""
+        get_stop_index_mock.return_value = self.stop_index
+        self.assertEqual('5183', find_stop_id(49.8410, 24.0311))
+        get_stop_index_mock.assert_called_with('lviv:stops_index')
+        self.assertIsNone(find_stop_id(49.85, 24.05))
+        self.assertIsNone(find_stop_id(50.45, 30.52))
+
+        get_stop_index_mock.return_value = None
+        self.assertIsNone(find_stop_id(49.8410, 24.0311))
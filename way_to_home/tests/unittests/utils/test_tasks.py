@@ -1,11 +1,13 @@
 """This module provides tests for Celery tasks."""
 
 import datetime
+import pickle
 
 from unittest.mock import patch
 from django.test import TestCase
 from django.db.models import signals
 from celery.exceptions import Retry
+from kombu.exceptions import OperationalError
 
 from custom_user.models import CustomUser
 from notification.models import Notification
@@ -14,15 +16,22 @@ from place.models import Place
 from route.models import Route
 from user_profile.models import UserProfile
 from way.models import Way
+from utils.file_handlers import NOT_MODIFIED
 from utils.celery_tasks import (delete_expired_notifications,
+                                prepare_static_feeds,
                                 prepare_static_easyway_data,
                                 send_notification,
-                                prepare_notification)
+                                send_notifications,
+                                prepare_notification,
+                                prepare_notifications,
+                                dispatch_notifications,
+                                DISPATCH_BATCH_SIZE)
 
-MOCK_EASYWAY_PARSERS = {
-    'stops': lambda file_path: 'parsed stops',
-    'routes': lambda file_path: 'parsed routes',
-    'trips': lambda file_path: 'parsed trips'
+MOCK_PARSED_MEMBERS = {
+    'stops.txt': 'parsed stops',
+    'routes.txt': 'parsed routes',
+    'trips.txt': 'parsed trips',
+    'stop_times.txt': 'parsed stop times'
 }
 
 
@@ -40,8 +49,8 @@ class CeleryTasksTestCase(TestCase):
                                               phone_number='+380111111111')
         self.user_profile = UserProfile.objects.create(id=100, user=self.user)
         way = Way.objects.create(id=100, user=self.user)
-        point_A = Place.objects.create(longitude=43.1234, latitude=34.1234)
-        point_B = Place.objects.create(longitude=43.1234, latitude=34.1234)
+        point_A = Place.objects.create(longitude=24.0311, latitude=49.8419)
+        point_B = Place.objects.create(longitude=24.0311, latitude=49.8419)
         first_route = Route.objects.create(way=way,
                                            start_place=point_A,
                                            end_place=point_B,
@@ -72,47 +81,145 @@ class CeleryTasksTestCase(TestCase):
                           Notification.objects.get,
                           id=self.expired_notification.id)
 
-    @patch('utils.celery_tasks.Notification.delete_by_id')
-    def test_delete_expired_notification_fail_delete(self, mock_delete_by_id):
+    @patch('utils.celery_tasks.CLEANER_BATCH_SIZE', 1)
+    def test_delete_expired_notification_batches(self):
+        """
+        Provide tests for `delete_expired_notifications` Celery periodic
+        task in case of expired notifications are deleted in several batches.
+        """
+        Notification.objects.create(
+            id=101,
+            way=self.expired_notification.way,
+            start_time=self.expired_notification.start_time,
+            end_time=self.expired_notification.end_time,
+            week_day=1,
+            time='8:30:00'
+        )
+
+        with patch('utils.celery_tasks.Notification.delete_by_ids',
+                   wraps=Notification.delete_by_ids) as mock_delete_by_ids:
+            successful_deleted = delete_expired_notifications.run()
+
+        self.assertTrue(successful_deleted)
+        self.assertEqual(2, mock_delete_by_ids.call_count)
+        self.assertFalse(Notification.objects.filter(id__in=[100, 101]).exists())
+
+    @patch('utils.celery_tasks.Notification.delete_by_ids')
+    def test_delete_expired_notification_fail_delete(self, mock_delete_by_ids):
         """
         Provide tests for `delete_expired_notifications` Celery periodic
         task in case of notification delete operation was failed.
         """
-        mock_delete_by_id.return_value = False
+        mock_delete_by_ids.return_value = None
         self.assertRaises(Retry, delete_expired_notifications.run)
 
+    @patch('utils.celery_tasks.prepare_static_easyway_data.delay')
+    def test_prepare_static_feeds(self, mock_delay_task):
+        """Provide tests for `prepare_static_feeds` periodic task."""
+        successful_assigned = prepare_static_feeds.run()
+        self.assertTrue(successful_assigned)
+        mock_delay_task.assert_called_with('lviv')
+
     @patch('utils.celery_tasks.load_file')
     def test_prepare_static_easyway_data_fail_load(self, mock_load_file):
         """Provide tests for `prepare_static_easyway_data` in case of load operation was failed."""
         mock_load_file.return_value = None
-        self.assertRaises(Retry, prepare_static_easyway_data.run)
+        self.assertRaises(Retry, prepare_static_easyway_data.run, 'lviv')
+
+    @patch('utils.celery_tasks.load_file')
+    @patch('utils.celery_tasks.parse_zip_members')
+    @patch('utils.celery_tasks.REDIS_HELPER.get')
+    def test_prepare_static_easyway_data_not_modified(self, mock_redis_get, mock_parse_zip_members,
+                                                      mock_load_file):
+        """Provide tests for `prepare_static_easyway_data` in case of archive was not modified."""
+        mock_redis_get.return_value = pickle.dumps({'ETag': '"v1"'})
+        mock_load_file.return_value = NOT_MODIFIED
+
+        successful_prepared = prepare_static_easyway_data.run('lviv')
+        self.assertTrue(successful_prepared)
+        self.assertDictEqual({'ETag': '"v1"'}, mock_load_file.call_args[1]['validators'])
+        self.assertFalse(mock_parse_zip_members.called)
 
     @patch('utils.celery_tasks.load_file')
-    @patch('utils.celery_tasks.unzip_file')
-    def test_prepare_static_easyway_data_fail_unzip(self, mock_unzip_file, mock_load_file):
-        """Provide tests for `prepare_static_easyway_data` in case of unzip operation was failed."""
+    @patch('utils.celery_tasks.parse_zip_members')
+    def test_prepare_static_easyway_data_fail_zip(self, mock_parse_zip_members, mock_load_file):
+        """Provide tests for `prepare_static_easyway_data` in case of zip archive was not read."""
         mock_load_file.return_value = 'loaded file'
-        mock_unzip_file.return_value = False
+        mock_parse_zip_members.return_value = None
 
-        self.assertRaises(Retry, prepare_static_easyway_data.run)
+        self.assertRaises(Retry, prepare_static_easyway_data.run, 'lviv')
 
-    @patch('utils.celery_tasks.EASYWAY_PARSERS', MOCK_EASYWAY_PARSERS)
     @patch('utils.celery_tasks.load_file')
-    @patch('utils.celery_tasks.unzip_file')
+    @patch('utils.celery_tasks.parse_zip_members')
+    @patch('utils.celery_tasks.build_routes_index')
+    @patch('utils.celery_tasks.StopIndex', str)
+    @patch('utils.celery_tasks.build_route_patterns')
+    @patch('utils.celery_tasks.REDIS_HELPER.update_hash')
     @patch('utils.celery_tasks.REDIS_HELPER.set')
-    def test_prepare_static_easyway_data_fail_success(self, mock_redis_set,
-                                                      mock_unzip_file, mock_load_file):
+    def test_prepare_static_easyway_data_fail_success(self, mock_redis_set, mock_update_hash,
+                                                      mock_build_patterns, mock_build_routes_index,
+                                                      mock_parse_zip_members, mock_load_file):
         """Provide tests for `prepare_static_easyway_data` in case of success."""
         mock_load_file.return_value = 'loaded file'
-        mock_unzip_file.return_value = True
+        mock_parse_zip_members.return_value = MOCK_PARSED_MEMBERS
         mock_redis_set.return_value = True
+        mock_build_patterns.return_value = {'100': 'route patterns'}
+        mock_update_hash.return_value = True
+        mock_build_routes_index.return_value = {'А48': '88'}
 
-        successful_prepared = prepare_static_easyway_data.run()
+        successful_prepared = prepare_static_easyway_data.run('lviv')
         self.assertTrue(successful_prepared)
+        mock_build_routes_index.assert_called_with('parsed routes')
+        mock_build_patterns.assert_called_with('parsed trips', 'parsed stops', 'parsed stop times')
+        mock_redis_set.assert_any_call('lviv:stops', pickle.dumps('parsed stops'))
+        self.assertEqual('lviv:routes_index', mock_update_hash.call_args_list[0][0][0])
+
+    @patch('utils.celery_tasks.load_file')
+    @patch('utils.celery_tasks.parse_zip_members')
+    @patch('utils.celery_tasks.build_routes_index')
+    @patch('utils.celery_tasks.StopIndex', str)
+    @patch('utils.celery_tasks.build_route_patterns')
+    @patch('utils.celery_tasks.REDIS_HELPER.update_hash')
+    @patch('utils.celery_tasks.REDIS_HELPER.set')
+    def test_prepare_static_easyway_data_fail_patterns(self, mock_redis_set, mock_update_hash,
+                                                       mock_build_patterns, mock_build_routes_index,
+                                                       mock_parse_zip_members, mock_load_file):
+        """
+        Provide tests for `prepare_static_easyway_data` in case
+        of insertion of route patterns into redis was failed.
+        """
+        mock_load_file.return_value = 'loaded file'
+        mock_parse_zip_members.return_value = MOCK_PARSED_MEMBERS
+        mock_redis_set.return_value = True
+        mock_build_patterns.return_value = {}
+        mock_build_routes_index.return_value = {}
+        mock_update_hash.side_effect = [True, False]
+
+        self.assertRaises(Retry, prepare_static_easyway_data.run, 'lviv')
 
-    @patch('utils.celery_tasks.send_telegram_message')
+    @patch('utils.celery_tasks.load_file')
+    @patch('utils.celery_tasks.parse_zip_members')
+    @patch('utils.celery_tasks.build_routes_index')
+    @patch('utils.celery_tasks.REDIS_HELPER.update_hash')
+    @patch('utils.celery_tasks.REDIS_HELPER.set')
+    def test_prepare_static_easyway_data_fail_routes_index(self, mock_redis_set, mock_update_hash,
+                                                           mock_build_routes_index,
+                                                           mock_parse_zip_members, mock_load_file):
+        """
+        Provide tests for `prepare_static_easyway_data` in case
+        of insertion of routes index into redis was failed.
+        """
+        mock_load_file.return_value = 'loaded file'
+        mock_parse_zip_members.return_value = MOCK_PARSED_MEMBERS
+        mock_redis_set.return_value = True
+        mock_build_routes_index.return_value = {}
+        mock_update_hash.return_value = False
+
+        self.assertRaises(Retry, prepare_static_easyway_data.run, 'lviv')
+
+    @patch('utils.celery_tasks.enqueue_telegram_messages')
     @patch('utils.celery_tasks.send_sms')
-    def test_send_notification_success(self, mock_send_sms, mock_send_telegram_message):
+    def test_send_notification_success(self, mock_send_sms, mock_enqueue_telegram_messages):
         """Provide tests for `send_notification` task in case of success."""
         mock_send_sms.return_value = True
 
@@ -120,7 +227,7 @@ class CeleryTasksTestCase(TestCase):
                                                 arriving_time=10, route_name='A45')
         self.assertTrue(successful_sent)
 
-        mock_send_telegram_message.return_value = True
+        mock_enqueue_telegram_messages.return_value = True
         self.user_profile.telegram_id = 100
         self.user_profile.save()
 
@@ -128,73 +235,203 @@ class CeleryTasksTestCase(TestCase):
                                                 arriving_time=10, route_name='A45')
         self.assertTrue(successful_sent)
 
-    @patch('utils.celery_tasks.send_telegram_message')
+    @patch('utils.celery_tasks.enqueue_telegram_messages')
     @patch('utils.celery_tasks.send_sms')
-    def test_send_notification_fail(self, mock_send_sms, mock_send_telegram_message):
+    def test_send_notification_fail(self, mock_send_sms, mock_enqueue_telegram_messages):
         """Provide tests for `send_notification` task in case of send operation was failed."""
         mock_send_sms.return_value = False
 
         self.assertRaises(Retry, send_notification.run,
                           user_id=self.user.id, arriving_time=10, route_name='A45')
 
-        mock_send_telegram_message.return_value = False
+        mock_enqueue_telegram_messages.return_value = False
         self.user_profile.telegram_id = 100
         self.user_profile.save()
 
         self.assertRaises(Retry, send_notification.run,
                           user_id=self.user.id, arriving_time=10, route_name='A45')
 
-    @patch('pickle.loads')
+    @patch('utils.celery_tasks.send_notification.apply_async')
+    @patch('utils.celery_tasks.enqueue_telegram_messages', return_value=True)
+    @patch('utils.celery_tasks.send_batch')
+    def test_send_notifications(self, mock_send_batch, mock_enqueue, mock_apply_async):
+        """Provide tests for `send_notifications` task."""
+        telegram_user = CustomUser.objects.create(id=101,
+                                                  email='telegramuser@mail.com',
+                                                  password='testpassword')
+        UserProfile.objects.create(id=101, user=telegram_user, telegram_id=200)
+        mock_send_batch.return_value = [False]
+
+        successful_sent = send_notifications.run([(self.user.id, 10, 'A45'),
+                                                  (telegram_user.id, 5, 'A45'),
+                                                  (999, 5, 'A45')])
+        self.assertFalse(successful_sent)
+        mock_enqueue.assert_called_once_with([(200, 'Ваш транспорт A45 прибуде через 5 хвилин')])
+        mock_send_batch.assert_called_once_with(
+            'sms',
+            [('+380111111111', 'Ваш транспорт A45 прибуде через 10 хвилин')]
+        )
+        mock_apply_async.assert_called_once_with(args=(self.user.id, 10, 'A45'), countdown=5)
+
+    @patch('utils.celery_tasks.LOGGER.error')
+    @patch('utils.celery_tasks.send_batch')
+    def test_send_notifications_without_recipient(self, mock_send_batch, mock_logger_error):
+        """Provide tests for `send_notifications` task in case of user has no telegram and phone."""
+        user = CustomUser.objects.create(id=102, email='nophone@mail.com', password='testpassword')
+        UserProfile.objects.create(id=102, user=user)
+
+        successful_sent = send_notifications.run([(user.id, 10, 'A45')])
+        self.assertTrue(successful_sent)
+        self.assertFalse(mock_send_batch.called)
+        mock_logger_error.assert_called_once_with(
+            'Notification was not sent to user with id=102 without telegram and phone number'
+        )
+
     @patch('utils.celery_tasks.get_route_id_by_name')
-    @patch('utils.celery_tasks.REDIS_HELPER.get')
-    def test_prepare_notification_fail_route_id(self, mock_redis_get, mock_route_id, mock_pickle_loads):
+    def test_prepare_notification_fail_route_id(self, mock_route_id):
         """Provide tests for `prepare_notification` task in case of route id equals `None`."""
-        mock_redis_get.return_value = 'data from redis'
-        mock_pickle_loads.return_value = 'unpickled data'
         mock_route_id.return_value = None
 
         successful_prepared = prepare_notification.run(self.expired_notification.id)
         self.assertFalse(successful_prepared)
-        self.assertTrue(mock_redis_get)
-        self.assertTrue(mock_pickle_loads)
-        self.assertTrue(mock_route_id)
+        self.assertTrue(mock_route_id.called)
 
-    @patch('pickle.loads')
+    @patch('utils.celery_tasks.find_city')
     @patch('utils.celery_tasks.get_route_id_by_name')
-    @patch('utils.celery_tasks.REDIS_HELPER.get')
-    def test_prepare_notification_fail_buses(self, mock_redis_get, mock_route_id, mock_pickle_loads):
+    def test_prepare_notification_fail_city(self, mock_route_id, mock_find_city):
+        """Provide tests for `prepare_notification` task in case of stop is out of served cities."""
+        mock_find_city.return_value = None
+
+        successful_prepared = prepare_notification.run(self.expired_notification.id)
+        self.assertFalse(successful_prepared)
+        self.assertFalse(mock_route_id.called)
+
+    @patch('utils.celery_tasks.get_route_vehicles')
+    @patch('utils.celery_tasks.get_route_id_by_name')
+    def test_prepare_notification_fail_buses(self, mock_route_id, mock_route_vehicles):
         """Provide tests for `prepare_notification` task in case of buses equals `None`."""
-        mock_redis_get.return_value = 'data from redis'
-        mock_pickle_loads.return_value = {10: 'first route data', 20: 'second route data'}
+        mock_route_vehicles.return_value = None
         mock_route_id.return_value = '100'
 
         successful_prepared = prepare_notification.run(self.expired_notification.id)
         self.assertFalse(successful_prepared)
-        self.assertTrue(mock_redis_get)
-        self.assertTrue(mock_pickle_loads)
-        self.assertTrue(mock_route_id)
+        mock_route_vehicles.assert_called_with('100', key='lviv:gtfs_data')
 
-    @patch('pickle.loads')
+    @patch('utils.celery_tasks.get_vehicles_motion', return_value={})
+    @patch('utils.celery_tasks.get_route_patterns')
+    @patch('utils.celery_tasks.get_route_vehicles')
     @patch('utils.celery_tasks.get_route_id_by_name')
-    @patch('utils.celery_tasks.REDIS_HELPER.get')
-    @patch('utils.celery_tasks.find_closest_bus_time')
-    @patch('utils.celery_tasks.send_notification.delay')
-    def test_prepare_notification_success(self, mock_delay_task, mock_find_time, mock_redis_get,
-                                          mock_route_id, mock_pickle_loads):
+    @patch('utils.celery_tasks.get_arrival_times', return_value=[60 * 5])
+    @patch('utils.celery_tasks.find_closest_time')
+    @patch('utils.celery_tasks.send_notifications.delay')
+    def test_prepare_notification_success(self, mock_delay_task, mock_find_time, mock_arrival_times,
+                                          mock_route_id, mock_route_vehicles, mock_route_patterns,
+                                          mock_vehicles_motion):
         """Provide tests for `prepare_notification` task in case of success."""
-        mock_redis_get.return_value = 'data from redis'
+        mock_route_patterns.return_value = None
         mock_find_time.return_value = 60 * 5
         mock_delay_task.return_value = True
         mock_route_id.return_value = '100'
-        mock_pickle_loads.return_value = {'100': [{'trip_id': '1085_0_0',
-                                                   'lat': 49.80695724487305,
-                                                   'lon': 24.0104408264160}]
-                                          }
+        mock_route_vehicles.return_value = [{'trip_id': '1085_0_0', 'vehicle_id': '2541',
+                                             'lat': 49.80695724487305,
+                                             'lon': 24.0104408264160}]
+
+        successful_prepared = prepare_notification.run(self.expired_notification.id)
+        self.assertTrue(successful_prepared)
+        self.assertTrue(mock_route_vehicles.called)
+        self.assertTrue(mock_route_id.called)
+        self.assertTrue(mock_delay_task.called)
+        self.assertTrue(mock_find_time.called)
+        mock_vehicles_motion.assert_called_with(['2541'], key='lviv:vehicles_history')
+
+    @patch('utils.celery_tasks.get_vehicles_motion', return_value={})
+    @patch('utils.celery_tasks.get_route_patterns')
+    @patch('utils.celery_tasks.get_route_vehicles')
+    @patch('utils.celery_tasks.get_route_id_by_name')
+    @patch('utils.celery_tasks.get_arrival_times', return_value=[60 * 5])
+    @patch('utils.celery_tasks.find_closest_time')
+    @patch('utils.celery_tasks.send_notifications.delay')
+    def test_prepare_notification_fail_bus_time(self, mock_delay_task, mock_find_time,
+                                                mock_arrival_times, mock_route_id,
+                                                mock_route_vehicles, mock_route_patterns,
+                                                mock_vehicles_motion):
+        """Provide tests for `prepare_notification` task in case of arriving bus was not found."""
+        mock_route_id.return_value = '100'
+        mock_route_vehicles.return_value = [{'trip_id': '1085_0_0', 'vehicle_id': '2541',
+                                             'lat': 49.80695724487305,
+                                             'lon': 24.0104408264160}]
+        mock_route_patterns.return_value = None
+        mock_find_time.return_value = None
 
         successful_prepared = prepare_notification.run(self.expired_notification.id)
+        self.assertFalse(successful_prepared)
+        self.assertFalse(mock_delay_task.called)
+
+    @patch('utils.celery_tasks.get_vehicles_motion', return_value={})
+    @patch('utils.celery_tasks.get_route_patterns', return_value=None)
+    @patch('utils.celery_tasks.get_route_vehicles')
+    @patch('utils.celery_tasks.get_route_id_by_name', return_value='100')
+    @patch('utils.celery_tasks.get_arrival_times', return_value=[60 * 5, 60 * 20])
+    @patch('utils.celery_tasks.find_closest_time')
+    @patch('utils.celery_tasks.send_notifications.delay')
+    def test_prepare_notifications_grouped(self, mock_delay_task, mock_find_time, mock_arrival_times,
+                                           mock_route_id, mock_route_vehicles, mock_route_patterns,
+                                           mock_vehicles_motion):
+        """
+        Provide tests for `prepare_notifications` task in case of notifications
+        wait for the same route at the same stop.
+        """
+        notification = Notification.objects.get(id=self.expired_notification.id)
+        notification.id = 101
+        notification.save()
+        mock_route_vehicles.return_value = [{'trip_id': '1085_0_0', 'vehicle_id': '2541',
+                                             'lat': 49.80695724487305,
+                                             'lon': 24.0104408264160}]
+        mock_find_time.side_effect = [60 * 20, None]
+
+        successful_prepared = prepare_notifications.run([100, 101, 102])
+        self.assertFalse(successful_prepared)
+        self.assertEqual(1, mock_route_id.call_count)
+        self.assertEqual(1, mock_route_vehicles.call_count)
+        self.assertEqual(1, mock_arrival_times.call_count)
+        self.assertEqual(2, mock_find_time.call_count)
+        mock_delay_task.assert_called_once_with([(self.user.id, 20, '')])
+
+    @patch('utils.celery_tasks.pop_due_notifications')
+    @patch('utils.celery_tasks.prepare_notifications.delay')
+    def test_dispatch_notifications_success(self, mock_delay_task, mock_pop_due):
+        """Provide tests for `dispatch_notifications` periodic task in case of success."""
+        mock_pop_due.return_value = list(range(DISPATCH_BATCH_SIZE + 1))
+
+        successful_dispatched = dispatch_notifications.run()
+        self.assertTrue(successful_dispatched)
+        self.assertEqual(2, mock_delay_task.call_count)
+        mock_delay_task.assert_called_with([DISPATCH_BATCH_SIZE])
+
+    @patch('utils.celery_tasks.pop_due_notifications', return_value=None)
+    def test_dispatch_notifications_fail_redis(self, mock_pop_due):
+        """Provide tests for `dispatch_notifications` in case of wheel is not available."""
+        self.assertFalse(dispatch_notifications.run())
+
+    @patch('utils.celery_tasks.schedule_notifications')
+    @patch('utils.celery_tasks.pop_due_notifications')
+    @patch('utils.celery_tasks.prepare_notifications.delay')
+    def test_dispatch_notifications_fail_assign(self, mock_delay_task, mock_pop_due,
+                                                mock_schedule_notifications):
+        """
+        Provide tests for `dispatch_notifications` in case of batch task
+        was not assigned and notifications are put back into the wheel.
+        """
+        mock_pop_due.return_value = [100, 101]
+        mock_delay_task.side_effect = OperationalError()
+
+        successful_dispatched = dispatch_notifications.run()
+        self.assertFalse(successful_dispatched)
+        self.assertListEqual([100, 101], list(mock_schedule_notifications.call_args[0][0]))
+
+    @patch('utils.celery_tasks.get_route_id_by_name')
+    def test_prepare_notifications_deleted(self, mock_route_id):
+        """Provide tests for `prepare_notifications` task in case of notification was deleted."""
+        successful_prepared = prepare_notifications.run([999])
         self.assertTrue(successful_prepared)
-        self.assertTrue(mock_redis_get)
-        self.assertTrue(mock_pickle_loads)
-        self.assertTrue(mock_route_id)
-        self.assertTrue(mock_delay_task)
-        self.assertTrue(mock_find_time)
+        self.assertFalse(mock_route_id.called)
@@ -0,0 +1,86 @@
+"""This module provides tests for telegram messages queue."""
+
+import json
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.telegram_queue import (RESTORE_BATCH_SIZE,
+                                  TokenBucket,
+                                  enqueue_telegram_messages,
+                                  dequeue_telegram_messages,
+                                  acknowledge_telegram_message,
+                                  restore_telegram_messages)
+
+
+class MockClock:
+    """Clock which time is changed manually."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TelegramQueueTestCase(TestCase):
+    """TestCase for providing telegram messages queue testing."""
+
+    def test_token_bucket_reserve(self):
+        """Provide tests for `reserve` method of `TokenBucket`."""
+        clock = MockClock()
+        bucket = TokenBucket(rate=2, clock=clock)
+
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.5, bucket.reserve())
+        self.assertAlmostEqual(1.0, bucket.reserve())
+
+        clock.now += 1
+        self.assertAlmostEqual(0.5, bucket.reserve())
+
+    def test_token_bucket_is_idle(self):
+        """Provide tests for `is_idle` method of `TokenBucket`."""
+        clock = MockClock()
+        bucket = TokenBucket(rate=1, clock=clock)
+        self.assertTrue(bucket.is_idle())
+
+        bucket.reserve()
+        self.assertFalse(bucket.is_idle())
+
+        clock.now += 1
+        self.assertTrue(bucket.is_idle())
+
+    @patch('utils.telegram_queue.REDIS_HELPER.lpush', return_value=True)
+    def test_enqueue_telegram_messages(self, redis_lpush):
+        """Provide tests for `enqueue_telegram_messages` function."""
+        self.assertTrue(enqueue_telegram_messages([(100, 'text')], attempt=2))
+        redis_lpush.assert_called_with('telegram_queue', [json.dumps([100, 'text', 2])])
+
+    @patch('utils.telegram_queue.REDIS_HELPER.move_many')
+    def test_dequeue_telegram_messages(self, redis_move_many):
+        """Provide tests for `dequeue_telegram_messages` function."""
+        redis_move_many.return_value = [json.dumps([100, 'text', 0]).encode()]
+        self.assertListEqual([(100, 'text', 0)], dequeue_telegram_messages(10))
+        redis_move_many.assert_called_with('telegram_queue', 'telegram_processing', 10)
+
+        redis_move_many.return_value = None
+        self.assertIsNone(dequeue_telegram_messages(10))
+
+    @patch('utils.telegram_queue.REDIS_HELPER.lrem')
+    def test_acknowledge_telegram_message(self, redis_lrem):
+        """Provide tests for `acknowledge_telegram_message` function."""
+        redis_lrem.return_value = True
+        self.assertTrue(acknowledge_telegram_message((100, 'text', 1)))
+        redis_lrem.assert_called_with('telegram_processing', json.dumps([100, 'text', 1]))
+
+    @patch('utils.telegram_queue.REDIS_HELPER.move_many')
+    def test_restore_telegram_messages(self, redis_move_many):
+        """Provide tests for `restore_telegram_messages` function."""
+        redis_move_many.side_effect = [[b'first', b'second'], [b'third'], []]
+        self.assertEqual(3, restore_telegram_messages())
+        redis_move_many.assert_called_with('telegram_processing', 'telegram_queue',
+                                           RESTORE_BATCH_SIZE)
+
+        redis_move_many.side_effect = [None]
+        self.assertEqual(0, restore_telegram_messages())
@@ -0,0 +1,88 @@
+"""This module provides tests for vehicle history functions."""
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.vehicle_history import (pack_history,
+                                   unpack_history,
+                                   get_motion,
+                                   get_vehicles_motion,
+                                   VehicleHistory)
+
+
+class VehicleHistoryTestCase(TestCase):
+    """TestCase for providing vehicle history testing."""
+
+    def setUp(self):
+        """Provides preparation before testing vehicle history."""
+        self.positions = [
+            (1549367000, 49.8400, 24.0000),
+            (1549367010, 49.8400, 24.0010),
+            (1549367020, 49.8400, 24.0020),
+        ]
+        self.gtfs_data = {'129': [
+            {'trip_id': '8446_3_1', 'lat': 49.84, 'lon': 24.0, 'vehicle_id': '2541', 'timestamp': 0},
+        ]}
+
+    def test_pack_unpack_history(self):
+        """Provide tests for `pack_history` and `unpack_history` functions."""
+        block = pack_history(self.positions)
+        self.assertEqual(12 * len(self.positions), len(block))
+
+        unpacked_positions = unpack_history(block)
+        for expected, actual in zip(self.positions, unpacked_positions):
+            self.assertEqual(expected[0], actual[0])
+            self.assertAlmostEqual(expected[1], actual[1], places=4)
+            self.assertAlmostEqual(expected[2], actual[2], places=4)
+
+        self.assertIsNone(unpack_history(block[:-1]))
+
+    def test_get_motion(self):
+        """Provide tests for `get_motion` function."""
+        speed, bearing = get_motion(self.positions)
+        self.assertAlmostEqual(7.2, speed, delta=0.1)
+        self.assertAlmostEqual(90, bearing, delta=0.1)
+
+        speed, bearing = get_motion([self.positions[0], (1549367010, 49.8400, 24.0000)])
+        self.assertEqual(0, speed)
+        self.assertIsNone(bearing)
+
+        self.assertIsNone(get_motion(self.positions[:1]))
+        self.assertIsNone(get_motion([self.positions[0], self.positions[0]]))
+
+    def test_update(self):
+        """Provide tests for `VehicleHistory.update` method."""
+        history = VehicleHistory(size=2, stale_time=60)
+
+        self.assertEqual((['2541'], []), history.update(self.gtfs_data, 1549367000))
+        self.assertEqual(([], []), history.update(self.gtfs_data, 1549367000))
+
+        self.gtfs_data['129'][0]['timestamp'] = 1549367010
+        history.update(self.gtfs_data, 1549367011)
+        self.gtfs_data['129'][0]['timestamp'] = 1549367020
+        history.update(self.gtfs_data, 1549367021)
+        self.assertEqual([1549367010, 1549367020],
+                         [position[0] for position in history.positions['2541']])
+
+        self.assertEqual(([], ['2541']), history.update({}, 1549367100))
+        self.assertDictEqual({}, history.positions)
+
+    @patch('utils.vehicle_history.REDIS_HELPER.update_hash')
+    def test_publish(self, update_hash):
+        """Provide tests for `VehicleHistory.publish` method."""
+        history = VehicleHistory()
+        history.update(self.gtfs_data, 1549367000)
+
+        history.publish(['2541'], ['2542'])
+        self.assertEqual(['2541'], list(update_hash.call_args[1]['mapping']))
+        self.assertEqual(['2542'], update_hash.call_args[1]['removed_keys'])
+        self.assertFalse(update_hash.call_args[1]['replace'])
+
+    @patch('utils.vehicle_history.REDIS_HELPER.hmget')
+    def test_get_vehicles_motion(self, redis_hmget):
+        """Provide tests for `get_vehicles_motion` function."""
+        redis_hmget.return_value = [pack_history(self.positions), None, pack_history(self.positions[:1])]
+
+        motions = get_vehicles_motion(['2541', '2542', '2543'])
+        self.assertEqual(['2541'], list(motions))
+        self.assertDictEqual({}, get_vehicles_motion([]))
@@ -0,0 +1,60 @@
+"""This module provides tests for way cache functions."""
+
+import pickle
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from utils.way_cache import (USER_WAYS_CACHE_TIME,
+                             get_user_ways_generation,
+                             get_cached_user_ways,
+                             cache_user_ways,
+                             invalidate_user_ways)
+
+
+class WayCacheTestCase(TestCase):
+    """TestCase for providing way cache functions testing."""
+
+    def setUp(self):
+        """Provides preparation before testing way cache functions."""
+        self.ways = [{'id': 100, 'name': 'home', 'user_id': 7, 'routes': []}]
+
+    @patch('utils.way_cache.REDIS_HELPER.get')
+    def test_get_user_ways_generation(self, redis_get):
+        """Provide tests for `get_user_ways_generation` function."""
+        redis_get.return_value = b'3'
+        self.assertEqual(3, get_user_ways_generation(7))
+        redis_get.assert_called_with('user_ways_generation:7')
+
+        redis_get.return_value = None
+        self.assertEqual(0, get_user_ways_generation(7))
+
+    @patch('utils.way_cache.REDIS_HELPER.get')
+    def test_get_cached_user_ways(self, redis_get):
+        """Provide tests for `get_cached_user_ways` function."""
+        redis_get.return_value = pickle.dumps(self.ways)
+        self.assertListEqual(self.ways, get_cached_user_ways(7, 3))
+        redis_get.assert_called_with('user_ways:7:3')
+
+        redis_get.return_value = pickle.dumps([])
+        self.assertListEqual([], get_cached_user_ways(7, 3))
+
+        redis_get.return_value = None
+        self.assertIsNone(get_cached_user_ways(7, 3))
+
+    @patch('utils.way_cache.REDIS_HELPER.set')
+    def test_cache_user_ways(self, redis_set):
+        """Provide tests for `cache_user_ways` function."""
+        redis_set.return_value = True
+        self.assertTrue(cache_user_ways(7, 3, self.ways))
+        redis_set.assert_called_with('user_ways:7:3', pickle.dumps(self.ways), USER_WAYS_CACHE_TIME)
+
+    @patch('utils.way_cache.REDIS_HELPER.incr')
+    def test_invalidate_user_ways(self, redis_incr):
+        """Provide tests for `invalidate_user_ways` function."""
+        redis_incr.return_value = 4
+        self.assertTrue(invalidate_user_ways(7))
+        redis_incr.assert_called_with('user_ways_generation:7')
+
+        redis_incr.return_value = None
+        self.assertFalse(invalidate_user_ways(7))
@@ -4,61 +4,40 @@ File handlers Test
 This module provides complete testing for all file handlers.
 """
 import csv
+import os
 import pickle
+import tempfile
+import types
 from unittest.mock import patch, mock_open
-from zipfile import BadZipFile
+from zipfile import BadZipFile, ZipFile
 
 from django.test import TestCase
+from requests.exceptions import RequestException
 
-from utils.file_handlers import (unzip_file,
-                                 load_file,
+from utils.file_handlers import (load_file,
+                                 load_content,
                                  pickle_data,
                                  unpickle_data,
-                                 parse_csv_file,
-                                 _get_fields_position)
+                                 iter_csv_file,
+                                 parse_zip_members,
+                                 _get_fields_position,
+                                 NOT_MODIFIED)
 
 
-class MockZipFile:
-    def __init__(self, *args, **kwargs):
-        pass
-
-    def extractall(self, *args, **kwargs):
-        return True
-
-
-class MockRequests:
-    def success(self, *args, **kwargs):
-        return MockRequestSussess()
-
-    def error(self, *args, **kwargs):
-        return MockRequestError()
-
-
-class MockRequestError:
-    status_code = 400
-
-
-class MockRequestSussess:
-    status_code = 200
-    content = ''
+class MockResponse:
+    def __init__(self, status_code, chunks=(), headers=None):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.headers = headers or {}
 
-
-class MockCSV:
-    def __init__(self):
-        self.line_num = 0
-        self.size = 2
-
-    def __iter__(self):
+    def __enter__(self):
         return self
 
-    def __next__(self):
-        if self.line_num >= self.size:
-            raise StopIteration
-        else:
-            self.line_num += 1
-            return {1: 'value1',
-                    2: 'value2',
-                    3: 'value3'}
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, *args, **kwargs):
+        return iter(self.chunks)
 
 
 class FileHandlersTestCase(TestCase):
@@ -74,85 +53,188 @@ class FileHandlersTestCase(TestCase):
                            'field3': 1}
         self.assertEqual(result, expected_result)
 
-    @patch('utils.file_handlers.ZipFile.__init__', MockZipFile.__init__)
-    @patch('utils.file_handlers.ZipFile.extractall', MockZipFile.extractall)
-    def test_unzip_file_valid(self):
-        """Method that tests the unzip_file function with valid data"""
-        result = unzip_file('file_path')
-        self.assertTrue(result)
+    def test_parse_zip_members_valid(self):
+        """Method that tests the parse_zip_members function with valid data"""
+        with tempfile.NamedTemporaryFile(suffix='.zip') as archive:
+            with ZipFile(archive, 'w') as zip_file:
+                zip_file.writestr('routes.txt', '\ufeffroute_id,route_short_name\n88,А48\n')
+                zip_file.writestr('trips.txt', 'route_id,trip_id\n88,8446_3_1\n')
+            archive.flush()
 
-    @patch('utils.file_handlers.ZipFile.__init__', MockZipFile.__init__)
-    def test_unzip_file_extract_exception(self):
-        """Method that tests the extract exceptions in unzip_file function"""
-        exceptions = (ValueError, BadZipFile, PermissionError)
+            parsers = {'routes.txt': lambda file: list(iter_csv_file(file, ['route_short_name'])),
+                       'trips.txt': lambda file: list(iter_csv_file(file, ['trip_id']))}
+            result = parse_zip_members(archive.name, parsers)
 
-        with patch('utils.file_handlers.ZipFile.extractall') as extract:
-            for exc in exceptions:
-                extract.side_effect = exc()
-                result = unzip_file('file_path')
-                self.assertFalse(result)
+        self.assertEqual({'routes.txt': [('А48',)], 'trips.txt': [('8446_3_1',)]}, result)
 
-    def test_unzip_file_zipfile_exception(self):
-        """Method that tests the ZipFile exceptions in unzip_file function"""
-        exceptions = (FileNotFoundError, PermissionError)
+    def test_parse_zip_members_absent_member(self):
+        """Method that tests the parse_zip_members function if member is absent"""
+        with tempfile.NamedTemporaryFile(suffix='.zip') as archive:
+            with ZipFile(archive, 'w') as zip_file:
+                zip_file.writestr('routes.txt', 'route_id,route_short_name\n')
+            archive.flush()
+
+            result = parse_zip_members(archive.name, {'stops.txt': list})
+
+        self.assertIsNone(result)
+
+    def test_parse_zip_members_zipfile_exception(self):
+        """Method that tests the ZipFile exceptions in parse_zip_members function"""
+        exceptions = (BadZipFile, FileNotFoundError, PermissionError)
 
         with patch('utils.file_handlers.ZipFile.__init__') as zip_file:
             for exc in exceptions:
                 zip_file.side_effect = exc()
-                result = unzip_file('file_path')
-                self.assertFalse(result)
+                result = parse_zip_members('file_path', {'stops.txt': list})
+                self.assertIsNone(result)
 
-    @patch('utils.file_handlers.requests.get', MockRequests.success)
-    @patch('builtins.open', mock_open(read_data="data"))
-    @patch('typing.BinaryIO.write', return_value=True)
-    def test_load_file_valid(self, write):
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_valid(self, session_get):
         """Method that tests the load_file function with valid data"""
-        loaded = load_file('url')
-        self.assertIsNotNone(loaded)
-
-    @patch('utils.file_handlers.requests.get', MockRequests.success)
-    def test_load_file_permission_error(self):
+        session_get.return_value = MockResponse(200, [b'first ', b'second'], {'ETag': '"v1"'})
+
+        with tempfile.TemporaryDirectory() as save_to:
+            validators = {}
+            loaded = load_file('http://host/file.zip', save_to, validators)
+
+            self.assertEqual(os.path.join(save_to, 'file.zip'), loaded)
+            with open(loaded, 'rb') as loaded_file:
+                self.assertEqual(b'first second', loaded_file.read())
+            self.assertEqual({'ETag': '"v1"'}, validators)
+            self.assertEqual(['file.zip'], os.listdir(save_to))
+            self.assertTrue(session_get.call_args[1]['stream'])
+            self.assertIsNotNone(session_get.call_args[1]['timeout'])
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_not_modified(self, session_get):
+        """Method that tests the load_file function if file was not modified"""
+        session_get.return_value = MockResponse(304)
+
+        with tempfile.TemporaryDirectory() as save_to:
+            open(os.path.join(save_to, 'file.zip'), 'wb').close()
+            validators = {'ETag': '"v1"', 'Last-Modified': 'Mon, 03 Dec 2018 10:00:00 GMT'}
+
+            loaded = load_file('http://host/file.zip', save_to, validators)
+            self.assertEqual(NOT_MODIFIED, loaded)
+            self.assertEqual({'If-None-Match': '"v1"',
+                              'If-Modified-Since': 'Mon, 03 Dec 2018 10:00:00 GMT'},
+                             session_get.call_args[1]['headers'])
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_without_previous_file(self, session_get):
+        """Method that tests the load_file function does not revalidate absent file"""
+        session_get.return_value = MockResponse(200, [b'data'])
+
+        with tempfile.TemporaryDirectory() as save_to:
+            load_file('http://host/file.zip', save_to, {'ETag': '"v1"'})
+            self.assertEqual({}, session_get.call_args[1]['headers'])
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_permission_error(self, session_get):
         """Method that tests the PermissionError exception load_file function"""
-        with patch('builtins.open') as open_file:
-            open_file.side_effect = PermissionError()
+        session_get.return_value = MockResponse(200, [b'data'])
+
+        with patch('utils.file_handlers.tempfile.NamedTemporaryFile') as temp_file:
+            temp_file.side_effect = PermissionError()
             loaded = load_file('url')
             self.assertIsNone(loaded)
 
-    @patch('utils.file_handlers.requests.get', MockRequests.error)
-    def test_load_file_error_status_code(self):
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_request_exception(self, session_get):
+        """Method that tests the load_file function if request was failed"""
+        session_get.side_effect = RequestException()
+
+        loaded = load_file('url')
+        self.assertIsNone(loaded)
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_file_error_status_code(self, session_get):
         """Method that tests the load_file function with error status code"""
+        session_get.return_value = MockResponse(400)
+
         loaded = load_file('url')
         self.assertIsNone(loaded)
 
-    @patch('builtins.open', mock_open(read_data="data"))
-    @patch('utils.file_handlers.csv.reader')
-    @patch('utils.file_handlers._get_fields_position')
-    def test_parse_csv_file_valid(self, fields_position, csv_reader):
-        """Method that tests the parse_csv_file function with valid data"""
-        csv_reader.return_value = MockCSV()
-        fields_position.return_value = {'key1': 1,
-                                        'key2': 2,
-                                        'key3': 3}
-        result = parse_csv_file('path', [])
-        self.assertIsNotNone(result)
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_content_valid(self, session_get):
+        """Method that tests the load_content function with valid data"""
+        response = MockResponse(200, headers={'Last-Modified': 'Mon, 03 Dec 2018 10:00:00 GMT'})
+        response.content = b'content'
+        session_get.return_value = response
+
+        validators = {}
+        loaded = load_content('http://host/feed', validators)
+        self.assertEqual(b'content', loaded)
+        self.assertEqual({'Last-Modified': 'Mon, 03 Dec 2018 10:00:00 GMT'}, validators)
+        self.assertEqual({}, session_get.call_args[1]['headers'])
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_content_not_modified(self, session_get):
+        """Method that tests the load_content function if content was not modified"""
+        session_get.return_value = MockResponse(304)
+
+        loaded = load_content('http://host/feed', {'ETag': '"v1"'})
+        self.assertEqual(NOT_MODIFIED, loaded)
+        self.assertEqual({'If-None-Match': '"v1"'}, session_get.call_args[1]['headers'])
+
+    @patch('utils.file_handlers.SESSION.get')
+    def test_load_content_fail(self, session_get):
+        """Method that tests the load_content function if content was not loaded"""
+        session_get.return_value = MockResponse(500)
+        self.assertIsNone(load_content('http://host/feed'))
+
+        session_get.side_effect = RequestException()
+        self.assertIsNone(load_content('http://host/feed'))
+
+    def test_iter_csv_file_valid(self):
+        """Method that tests the iter_csv_file function with valid data"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8-sig') as csv_file:
+            csv_file.write('stop_id,stop_name,stop_lat,stop_lon\n'
+                           '5179,"Stop, 1",49.782854,24.096483\n'
+                           '5181,Stop 2,49.818161,24.057797\n')
+            csv_file.flush()
+
+            result = iter_csv_file(csv_file.name, ['stop_id', 'stop_lat'], {'stop_lat': float})
+            self.assertIsInstance(result, types.GeneratorType)
+            self.assertEqual([('5179', 49.782854), ('5181', 49.818161)], list(result))
+
+    @patch('utils.file_handlers.LOGGER.warning')
+    def test_iter_csv_file_invalid_rows(self, logger_warning):
+        """Method that tests the iter_csv_file function skipping rows which can not be read"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as csv_file:
+            csv_file.write('stop_id,stop_lat\n5179,invalid\n5180\n5181,49.818161\n')
+            csv_file.flush()
+
+            result = list(iter_csv_file(csv_file.name, ['stop_id', 'stop_lat'], {'stop_lat': float}))
+            self.assertEqual([('5181', 49.818161)], result)
+            self.assertEqual(2, logger_warning.call_count)
+
+    def test_iter_csv_file_absent_field(self):
+        """Method that tests the iter_csv_file function if required field is absent"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as csv_file:
+            csv_file.write('stop_id,stop_lat\n5179,49.782854\n')
+            csv_file.flush()
+
+            result = list(iter_csv_file(csv_file.name, ['stop_id', 'stop_lon']))
+            self.assertEqual([], result)
 
     @patch('builtins.open', mock_open(read_data="data"))
-    def test_parse_csv_csv_exception(self):
-        """Method that tests the csv.Error in parse_csv_file function"""
+    def test_iter_csv_csv_exception(self):
+        """Method that tests the csv.Error in iter_csv_file function"""
         with patch('utils.file_handlers.csv.reader') as csv_file:
             csv_file.side_effect = csv.Error()
-            result = parse_csv_file('path', [])
-            self.assertIsNone(result)
+            result = list(iter_csv_file('path', []))
+            self.assertEqual([], result)
 
-    def test_parse_csv_file_open_exception(self):
-        """Method that tests the open() exceptions in parse_csv_file function"""
+    def test_iter_csv_file_open_exception(self):
+        """Method that tests the open() exceptions in iter_csv_file function"""
         exceptions = (FileNotFoundError, PermissionError)
 
         with patch('builtins.open') as open_file:
             for exc in exceptions:
                 open_file.side_effect = exc()
-                result = parse_csv_file('path', [])
-                self.assertIsNone(result)
+                result = list(iter_csv_file('path', []))
+                self.assertEqual([], result)
 
     @patch('builtins.open', mock_open(read_data="data"))
     @patch('utils.file_handlers.pickle.dump', return_data=True)
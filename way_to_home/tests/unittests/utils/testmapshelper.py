@@ -7,42 +7,41 @@ from unittest.mock import patch
 
 from django.test import TestCase
 
-from utils.mapshelper import get_vehicle_time, find_closest_bus_time
-
-
-class MockRequests:
-    def get(self, *args, **kwargs):
-        return MockJson()
-
-
-class MockJson:
-    def json(self):
-        directions_dict = {'routes': [{'legs': [{'duration': {'value': 123}}]}]}
-        return directions_dict
+from utils.mapshelper import get_vehicles_time, get_arrival_times, find_closest_time
 
 
 class MapsHelperTestCase(TestCase):
     """Test Case that provides tests for maps helpers"""
-    @patch('utils.mapshelper.get_vehicle_time', return_value=123)
-    @patch('utils.mapshelper.get_preparing_time', return_value=100)
-    def test_find_closest_bus_time_success(self, get_vehicle_time, get_preparing_time):
-        """Method that tests the find_closest_bus_time function"""
-        test_buses = ['49.870570,24.031429']
-        expected_result = 123
-        result = find_closest_bus_time(test_buses, '', '')
-        self.assertEqual(result, expected_result)
-
-    @patch('utils.mapshelper.get_vehicle_time', return_value=123)
-    @patch('utils.mapshelper.get_preparing_time', return_value=200)
-    def test_find_closest_bus_time_fail(self, get_vehicle_time, get_preparing_time):
-        """Method that tests the find_closest_bus_time function"""
-        test_buses = ['49.870570,24.031429']
-        result = find_closest_bus_time(test_buses, '', '')
-        self.assertIsNone(result)
-
-    @patch('utils.mapshelper.requests.get', MockRequests.get)
-    def test_get_vehicle_time(self):
-        """Method that tests the get_vehicle_time function"""
-        expected_result = 123
-        result = get_vehicle_time('', '')
-        self.assertEqual(result, expected_result)
+    @patch('utils.mapshelper.get_vehicles_time', return_value=[700])
+    def test_get_arrival_times_heading_away(self, get_vehicles_time):
+        """Method that tests the get_arrival_times function skips buses heading away"""
+        test_buses = [{'lat': 49.84, 'lon': 24.0, 'vehicle_id': '1'},
+                      {'lat': 49.84, 'lon': 24.0, 'vehicle_id': '2'}]
+        motions = {'1': (7, 90), '2': (7, 270)}
+
+        result = get_arrival_times(test_buses, (49.84, 24.01), motions=motions)
+        self.assertEqual(result, [700])
+        get_vehicles_time.assert_called_with(test_buses[:1], (49.84, 24.01))
+
+    @patch('utils.mapshelper.estimate_arrival_times', return_value=[700, 300, 1200])
+    def test_get_arrival_times(self, estimate_arrival_times):
+        """Method that tests the get_arrival_times function returns sorted times"""
+        test_buses = [{'lat': 49.870570, 'lon': 24.031429}]
+        result = get_arrival_times(test_buses, (49.84, 24.02), {'patterns': []}, stop_id='1')
+        self.assertEqual(result, [300, 700, 1200])
+        estimate_arrival_times.assert_called_with(test_buses, (49.84, 24.02),
+                                                  {'patterns': []}, '1', None)
+
+    @patch('utils.mapshelper.get_preparing_time', return_value=600)
+    def test_find_closest_time(self, get_preparing_time):
+        """Method that tests the find_closest_time function"""
+        self.assertEqual(700, find_closest_time([300, 700, 1200], ''))
+        self.assertIsNone(find_closest_time([300, 600], ''))
+
+    @patch('utils.mapshelper.DIRECTIONS_CLIENT.get_durations', return_value=[123, None])
+    def test_get_vehicles_time(self, get_durations):
+        """Method that tests the get_vehicles_time function"""
+        test_buses = [{'lat': 49.870570, 'lon': 24.031429}, {'lat': 49.8, 'lon': 24.0}]
+        result = get_vehicles_time(test_buses, (49.84, 24.02))
+        self.assertEqual(result, [123])
+        get_durations.assert_called_with([(49.870570, 24.031429), (49.8, 24.0)], (49.84, 24.02))
@@ -3,10 +3,7 @@
 import datetime
 
 from django.test import TestCase
-from django.db.models import signals
 
-from notification.models import Notification
-from notification.signals import create_notification_task, revoke_notification_task
 from way.models import Way
 from custom_user.models import CustomUser
 from place.models import Place
@@ -18,9 +15,6 @@ class WayModelTestCase(TestCase):
 
     def setUp(self):
         """Method that provides preparation before testing Way model's features."""
-        signals.post_save.disconnect(create_notification_task, sender=Notification)
-        signals.post_delete.disconnect(revoke_notification_task, sender=Notification)
-
         self.user = CustomUser.objects.create(id=100, email='mail@gmail.com', password='Password1234', is_active=True)
         start_place = Place.objects.create(id=100, longitude=111.123456, latitude=84.123456)
         end_place = Place.objects.create(id=200, longitude=120.123456, latitude=89.123456)
@@ -39,14 +33,6 @@ class WayModelTestCase(TestCase):
             start_place=start_place,
             end_place=end_place
         )
-        self.notification = Notification.objects.create(
-            id=100,
-            way=self.way,
-            start_time=datetime.date(2019, 10, 29),
-            end_time=datetime.date(2019, 12, 29),
-            week_day=6,
-            time=datetime.time(23, 58, 59)
-        )
 
     def test_get_by_id(self):
         """Provide tests for `get_by_id` method of certain Way instance."""
@@ -122,6 +108,20 @@ class WayModelTestCase(TestCase):
         actual_dict = way.get_way_with_routes()
         self.assertDictEqual(expected_dict, actual_dict)
 
+    def test_get_user_ways_with_routes(self):
+        """Provide tests for `get_user_ways_with_routes` method built with two queries."""
+        Route.objects.create(id=101, time='00:10:00', position=1, way=self.way,
+                             start_place_id=200, end_place_id=100)
+        Way.objects.create(id=101, name='empty', user=self.user)
+
+        with self.assertNumQueries(2):
+            ways = Way.get_user_ways_with_routes(self.user.id)
+
+        ways = {way['id']: way for way in ways}
+        self.assertListEqual([], ways[101]['routes'])
+        self.assertListEqual([100, 101], sorted(route['id'] for route in ways[100]['routes']))
+        self.assertListEqual([], Way.get_user_ways_with_routes(200))
+
     def test_str(self):
         """Provide tests for `__str__` method of certain Way instance."""
         expected_string = f'Way id: {self.way.id}, user id: {self.way.user.id}'
@@ -137,8 +137,3 @@ class WayModelTestCase(TestCase):
         way_without_routes = Way.objects.create(user=self.user)
         expected_route = way_without_routes.get_route_by_position(position=0)
         self.assertIsNone(expected_route)
-
-    def test_get_by_notification(self):
-        """Provide tests for `get_by_notification` method of certain Way instance."""
-        expected_way = self.way.get_by_notification(notification_id=100)
-        self.assertEqual(expected_way, self.way)
@@ -0,0 +1,57 @@
+"""This module provides tests for Way signals."""
+
+from django.test import TestCase
+from unittest.mock import patch
+
+from custom_user.models import CustomUser
+from place.models import Place
+from route.models import Route
+from way.models import Way
+from way.signals import invalidate_route
+
+
+@patch('way.signals.transaction.on_commit', side_effect=lambda function: function())
+@patch('way.signals.invalidate_user_ways')
+class WaySignalsTestCase(TestCase):
+    """TestCase for providing Way signals testing."""
+
+    def setUp(self):
+        """Method that provides preparation before testing Way signals."""
+        self.user = CustomUser.objects.create(id=100, email='mail@gmail.com', is_active=True)
+        self.place = Place.objects.create(id=100, longitude=24.031111, latitude=49.842222)
+        self.way = Way.objects.create(id=100, user=self.user)
+        self.route = Route.objects.create(id=100, time='00:10:00', position=0, way=self.way,
+                                          start_place=self.place, end_place=self.place)
+
+    def test_invalidate_way(self, invalidate_user_ways, on_commit):
+        """Provide tests for invalidation of cached ways on way writes."""
+        self.way.update(name='new_name')
+        invalidate_user_ways.assert_called_with(100)
+        self.assertTrue(on_commit.called)
+
+        invalidate_user_ways.reset_mock()
+        Way.delete_by_id(100)
+        self.assertTrue(invalidate_user_ways.called)
+        invalidate_user_ways.assert_called_with(100)
+
+    def test_invalidate_route(self, invalidate_user_ways, on_commit):
+        """Provide tests for invalidation of cached ways on route writes."""
+        self.route.update(transport_name='Т06')
+        invalidate_user_ways.assert_called_with(100)
+
+        invalidate_user_ways.reset_mock()
+        Place.delete_by_id(100)
+        invalidate_user_ways.assert_called_with(100)
+
+    @patch('way.signals.LOGGER.error')
+    def test_invalidate_fail(self, logger_error, invalidate_user_ways, on_commit):
+        """Provide tests for signals in case of failed invalidation."""
+        invalidate_user_ways.return_value = False
+        self.way.update(name='new_name')
+        self.assertTrue(logger_error.called)
+
+    def test_invalidate_route_without_way(self, invalidate_user_ways, on_commit):
+        """Provide tests for route invalidation in case when way does not exist anymore."""
+        route = Route(way_id=500, start_place=self.place, end_place=self.place)
+        self.assertFalse(invalidate_route(sender=Route, instance=route))
+        self.assertFalse(invalidate_user_ways.called)
@@ -120,6 +120,32 @@ class WayViewsTestCase(TestCase):
 
 		self.assertJSONEqual(json.dumps(expected_response), actual_response)
 
+	@mock.patch('way.views.get_user_ways_generation', return_value=3)
+	@mock.patch('way.views.cache_user_ways')
+	@mock.patch('way.views.get_cached_user_ways')
+	def test_get_all_cached(self, get_cached_user_ways, cache_user_ways, get_generation):
+		"""Provide tests for request to retrieve all user Ways from cache."""
+		get_cached_user_ways.return_value = [{'id': 100, 'name': 'cached', 'user_id': 100, 'routes': []}]
+		url = reverse('way', args=[])
+		response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+
+		self.assertEqual('cached', json.loads(response.content)[0]['name'])
+		get_cached_user_ways.assert_called_with(100, 3)
+		self.assertFalse(cache_user_ways.called)
+
+	@mock.patch('way.views.get_user_ways_generation', return_value=3)
+	@mock.patch('way.views.cache_user_ways')
+	@mock.patch('way.views.get_cached_user_ways')
+	def test_get_all_not_cached(self, get_cached_user_ways, cache_user_ways, get_generation):
+		"""Provide tests for request to retrieve all user Ways which are not cached yet."""
+		get_cached_user_ways.return_value = None
+		url = reverse('way', args=[])
+		response = self.client.get(url)
+		self.assertEqual(response.status_code, 200)
+
+		cache_user_ways.assert_called_with(100, 3, json.loads(response.content))
+
 	def test_get_wrong_id(self):
 		"""Method that tests request to retrieve non existent object."""
 		url = reverse('way', args=[1501])
@@ -172,6 +198,34 @@ class WayViewsTestCase(TestCase):
 		self.assertEqual(response.status_code, 201)
 		self.assertDictEqual(response_dict, expected_data)
 
+	def test_post_stop_snapping(self):
+		"""Method that tests snapping start places of transit routes to the nearest stops."""
+		url = reverse('way', args=[])
+
+		with mock.patch('way.views.find_stop_id') as find_stop_id:
+			find_stop_id.return_value = '5179'
+			response = self.client.post(url, json.dumps(self.data), content_type='application/json')
+
+		self.assertEqual(response.status_code, 201)
+		self.assertEqual(find_stop_id.call_count, 2)
+
+		routes = json.loads(response.content)['routes']
+		start_place = Place.objects.get(id=routes[1]['start_place'])
+		self.assertEqual(start_place.stop_id, 5179)
+
+	def test_post_stop_snapping_invalid_stop_id(self):
+		"""Method that tests snapping to stops which ids do not fit stop_id field of place."""
+		url = reverse('way', args=[])
+
+		for stop_id in ['40000', 'A12', '\u00b2', '-5']:
+			with mock.patch('way.views.find_stop_id', return_value=stop_id):
+				response = self.client.post(url, json.dumps(self.data), content_type='application/json')
+
+			self.assertEqual(response.status_code, 201)
+			routes = json.loads(response.content)['routes']
+			start_place = Place.objects.get(id=routes[1]['start_place'])
+			self.assertIsNone(start_place.stop_id)
+
 	def test_post_create_fail(self):
 		"""Method that tests when way was not created"""
 
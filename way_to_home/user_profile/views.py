@@ -4,9 +4,7 @@ from django.http import JsonResponse
 from django.views import View
 from django.views.decorators.http import require_http_methods
 
-from telegram_bot.bot_helper import (get_access_tokens,
-                                     set_access_tokens,
-                                     remove_user_access_token)
+from telegram_bot.bot_helper import set_user_access_token, remove_user_access_token
 from utils.validators import profile_validator
 from utils.responsehelper import (RESPONSE_200_UPDATED,
                                   RESPONSE_400_EMPTY_JSON,
@@ -65,9 +63,7 @@ def put_access_token(request):
         return RESPONSE_400_OBJECT_NOT_FOUND
 
     token = request.body.get('token')
-    telegram_data = get_access_tokens()
-    telegram_data[user.id] = token
-    if not set_access_tokens(telegram_data):
+    if not token or not set_user_access_token(user.id, token):
         return RESPONSE_400_DB_OPERATION_FAILED
 
     return RESPONSE_200_UPDATED
@@ -41,6 +41,19 @@ class AbstractModel(models.Model):
             LOGGER.error(f'Certain {cls.__name__} with id={obj_id} does not delete. {err}')
             return False
 
+    @classmethod
+    def delete_by_ids(cls, obj_ids):
+        """
+        Delete objects, found by ids, with their cascades, so delete signals are
+        sent for every object. Return number of deleted objects or None.
+        """
+        try:
+            deleted, _ = cls.objects.filter(id__in=obj_ids).delete()
+            return deleted
+        except OperationalError as err:
+            LOGGER.error(f'{cls.__name__} objects with ids={obj_ids} were not deleted. {err}')
+            return None
+
     @classmethod
     @abstractmethod
     def create(cls, **kwargs):
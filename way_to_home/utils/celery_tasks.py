@@ -1,29 +1,44 @@
 """This module provides celery tasks."""
 
+import os
 import pickle
 import time
+from collections import defaultdict
+from datetime import datetime
 
 from celery.schedules import crontab
 from celery.task import periodic_task, task
+from kombu.exceptions import OperationalError
 
 from django.conf import settings
 
 from custom_user.models import CustomUser
 from notification.models import Notification
-from way.models import Way
-from .notificationhelper import get_route_id_by_name
+from .notificationhelper import (get_route_id_by_name, pop_due_notifications,
+                                 schedule_notifications, KIEV_TZ, ROUTES_INDEX_KEY)
 from .loggerhelper import LOGGER
-from .file_handlers import load_file, unzip_file
+from .file_handlers import load_file, parse_zip_members, NOT_MODIFIED
 from .redishelper import REDIS_HELPER
-from .easy_way import parse_routes_data, parse_trips_data, parse_stops_data, prettify_gtfs
-from .mapshelper import find_closest_bus_time
-from .senderhelper import send_sms, send_telegram_message
+from .easy_way import (parse_routes_data, parse_trips_data, parse_stops_data,
+                       parse_stop_times_data, build_route_patterns, build_routes_index)
+from .etahelper import get_route_patterns, ROUTE_PATTERNS_KEY
+from .gtfs_snapshot import get_route_vehicles, GTFS_DATA_KEY
+from .feeds import find_city, get_city_key, get_feeds
+from .stop_index import StopIndex, STOP_INDEX_KEY
+from .mapshelper import find_closest_time, get_arrival_times
+from .vehicle_history import get_vehicles_motion, VEHICLES_HISTORY_KEY
+from .senderhelper import send_batch, send_sms, get_channels_stats, SMS_CHANNEL, TELEGRAM_CHANNEL
+from .telegram_queue import enqueue_telegram_messages
 
 
 DEFAULT_RETRY_DELAY = 60
 CLEANER_CTONTAB = crontab(hour=1, minute=30)
+CLEANER_BATCH_SIZE = 1000
 EASYWAY_CTONTAB = crontab(hour=2, day_of_week=1)
+DISPATCHER_CTONTAB = crontab()
+DISPATCH_BATCH_SIZE = 100
 EASYWAY_DIR = settings.EASY_WAY_DIR
+STATIC_VALIDATORS_KEY = 'static_validators'
 EASYWAY_PARSERS = {
     'stops': parse_stops_data,
     'routes': parse_routes_data,
@@ -36,100 +51,264 @@ EASYWAY_PARSERS = {
                run_every=CLEANER_CTONTAB,
                default_retry_delay=DEFAULT_RETRY_DELAY)
 def delete_expired_notifications(self):
-    """Delete notifications that have expired datetime every day at 1:30 a.m."""
-    retry = False
+    """
+    Delete notifications that have expired datetime every day at 1:30 a.m.
+    Notifications are deleted in batches of `CLEANER_BATCH_SIZE` ids with
+    a single statement per batch, so locks are held only for a short time.
+    """
+    expired_ids = list(Notification.get_expired().values_list('id', flat=True))
+    deleted_count = 0
+    failed_batches = 0
+
+    for index in range(0, len(expired_ids), CLEANER_BATCH_SIZE):
+        deleted = Notification.delete_by_ids(expired_ids[index:index + CLEANER_BATCH_SIZE])
+        if deleted is None:
+            failed_batches += 1
+            continue
 
-    notifications = Notification.get_expired()
-    for notification_id in notifications.values_list('id', flat=True):
-        if not Notification.delete_by_id(obj_id=notification_id):
-            LOGGER.error(f'Expired notification with id={notification_id} was not deleted')
-            retry = True
+        deleted_count += deleted
+        LOGGER.info(f'Deleted {deleted_count} of {len(expired_ids)} expired notifications')
 
-    if retry:
+    if failed_batches:
+        LOGGER.error(f'{failed_batches} batches of expired notifications were not deleted')
         raise self.retry()
 
     LOGGER.info('Expired notifications was successfully deleted')
     return True
 
 
-@periodic_task(bind=True,
-               name='prepare static easy way data',
-               run_every=EASYWAY_CTONTAB,
-               default_retry_delay=DEFAULT_RETRY_DELAY)
-def prepare_static_easyway_data(self):
+@periodic_task(name='prepare static easy way data', run_every=EASYWAY_CTONTAB)
+def prepare_static_feeds():
+    """Assign tasks to prepare static data of every registered city every Monday at 2 a.m."""
+    for city in get_feeds():
+        prepare_static_easyway_data.delay(city)
+
+    return True
+
+
+@task(bind=True, default_retry_delay=DEFAULT_RETRY_DELAY)
+def prepare_static_easyway_data(self, city):
     """
-    Provide preparing static data from EasyWay every Monday at 2 a.m.
-    Defines commands to download static files, unzip it, parse necessary data
-    from appropriate files and insert it into Redis in pickled representation.
+    Provide preparing static data of the city from EasyWay.
+    Defines commands to download static files, parse necessary data from
+    appropriate files streamed directly from zip archive and insert it into
+    Redis in pickled representation along with spatial index of stops and
+    stop patterns of every route used for arrival time estimation.
+    All of the data is stored in the namespace of the city.
+    Archive is not downloaded and parsed again if it was not changed.
     """
-    url = 'http://track.ua-gis.com/gtfs/lviv/static.zip'
+    pickled_validators = REDIS_HELPER.get(get_city_key(city, STATIC_VALIDATORS_KEY))
+    validators = pickle.loads(pickled_validators) if pickled_validators else {}
 
-    loaded_file = load_file(url, save_to=EASYWAY_DIR)
+    loaded_file = load_file(get_feeds()[city]['static_url'],
+                            save_to=os.path.join(EASYWAY_DIR, city),
+                            validators=validators)
+    if loaded_file == NOT_MODIFIED:
+        LOGGER.info(f'EasyWay static data of {city} was not changed since the last preparing')
+        return True
     if not loaded_file:
         LOGGER.error('File with static data was not loaded from EasyWay')
         raise self.retry()
 
-    is_unzipped = unzip_file(loaded_file, unzip_to=EASYWAY_DIR)
-    if not is_unzipped:
-        LOGGER.error('File with static data was not unzipped')
+    parsers = {f'{data_identifier}.txt': parser
+               for data_identifier, parser in EASYWAY_PARSERS.items()}
+    parsers['stop_times.txt'] = parse_stop_times_data
+    parsed_members = parse_zip_members(loaded_file, parsers)
+    if not parsed_members:
+        LOGGER.error('Files with static data were not read from zip archive')
         raise self.retry()
 
-    for data_identifier, parser in EASYWAY_PARSERS.items():
-        file_path = f'{EASYWAY_DIR}/{data_identifier}.txt'
-        parsed_data = parser(file_path)
-        pickled_data = pickle.dumps(parsed_data)
-        REDIS_HELPER.set(data_identifier, pickled_data)
+    static_data = {}
+    for data_identifier in EASYWAY_PARSERS:
+        parsed_data = parsed_members[f'{data_identifier}.txt']
+        REDIS_HELPER.set(get_city_key(city, data_identifier), pickle.dumps(parsed_data))
+        static_data[data_identifier] = parsed_data
 
-    LOGGER.info('EasyWay static data was successfully prepared')
+    routes_index = build_routes_index(static_data['routes'])
+    if not REDIS_HELPER.update_hash(get_city_key(city, ROUTES_INDEX_KEY),
+                                    mapping=routes_index,
+                                    replace=True):
+        LOGGER.error('Routes index was not inserted into redis')
+        raise self.retry()
+
+    stop_index = StopIndex(static_data['stops'])
+    REDIS_HELPER.set(get_city_key(city, STOP_INDEX_KEY), pickle.dumps(stop_index))
+
+    route_patterns = build_route_patterns(static_data['trips'],
+                                          static_data['stops'],
+                                          parsed_members['stop_times.txt'])
+    pickled_patterns = {route_id: pickle.dumps(patterns)
+                        for route_id, patterns in route_patterns.items()}
+    if not REDIS_HELPER.update_hash(get_city_key(city, ROUTE_PATTERNS_KEY),
+                                    mapping=pickled_patterns,
+                                    replace=True):
+        LOGGER.error('Routes stop patterns were not inserted into redis')
+        raise self.retry()
+
+    REDIS_HELPER.set(get_city_key(city, STATIC_VALIDATORS_KEY), pickle.dumps(validators))
+    LOGGER.info(f'EasyWay static data of {city} was successfully prepared')
     return True
 
 
+def _group_notifications(notifications):
+    """
+    Return tuple with dictionary of notifications grouped by transport route
+    and flag whether every notification was grouped. Key of the dictionary is
+    tuple with city, id of route, id and coordinates of the stop and value is list
+    of tuples with notification, name of route and time to get to the stop.
+    """
+    groups = defaultdict(list)
+    routes_ids = {}
+    grouped = True
+
+    for notification in notifications:
+        routes = {route.position: route for route in notification.way.routes.all()}
+        if 0 not in routes or 1 not in routes:
+            LOGGER.error(f'Failed to find routes of notification with id={notification.id}')
+            grouped = False
+            continue
+
+        route_name = routes[1].transport_name
+        bus_stop = routes[1].start_place
+        stop_coords = (float(bus_stop.latitude), float(bus_stop.longitude))
+
+        city = find_city(*stop_coords)
+        if not city:
+            LOGGER.error(f'Failed to find city of the stop with coordinates={stop_coords}')
+            grouped = False
+            continue
+
+        if (city, route_name) not in routes_ids:
+            routes_ids[(city, route_name)] = get_route_id_by_name(
+                route_name,
+                key=get_city_key(city, ROUTES_INDEX_KEY)
+            )
+        route_id = routes_ids[(city, route_name)]
+        if not route_id:
+            LOGGER.error(f'Failed to find route with name={route_name} from routes data')
+            grouped = False
+            continue
+
+        groups[(city, route_id, bus_stop.stop_id, stop_coords)].append(
+            (notification, route_name, routes[0].time)
+        )
+
+    return groups, grouped
+
+
+def _prepare_group(group, notifications):
+    """
+    Estimate arrival times of vehicles of the route to the stop of the group
+    once and assign sending of notification to every user of the group.
+    """
+    city, route_id, stop_id, stop_coords = group
+
+    buses = get_route_vehicles(route_id, key=get_city_key(city, GTFS_DATA_KEY))
+    if not buses:
+        LOGGER.error(f'Failed to retrieve route with id={route_id} from GTFS data')
+        return False
+
+    vehicles_time = get_arrival_times(
+        buses,
+        stop_coords,
+        get_route_patterns(route_id, key=get_city_key(city, ROUTE_PATTERNS_KEY)),
+        stop_id=stop_id,
+        motions=get_vehicles_motion([bus['vehicle_id'] for bus in buses],
+                                    key=get_city_key(city, VEHICLES_HISTORY_KEY))
+    )
+
+    prepared = True
+    messages = []
+    for notification, route_name, time_to_stop in notifications:
+        bus_time = find_closest_time(vehicles_time, time_to_stop)
+        if bus_time is None:
+            LOGGER.error(f'Failed to find arriving bus of route with id={route_id}')
+            prepared = False
+            continue
+
+        arriving_time = int(time.strftime("%M", time.gmtime(bus_time)))
+        messages.append((notification.way.user_id, arriving_time, route_name))
+
+        LOGGER.info(f'Notification with id={notification.id} was successfully prepared')
+
+    if messages:
+        send_notifications.delay(messages)
+
+    return prepared
+
+
 @task
 def prepare_notification(notification_id):
     """Prepare data about transport arrival time before notifying the user."""
-    way = Way.get_by_notification(notification_id)
-
-    route = way.get_route_by_position(position=1)
-    route_name = route.transport_name
-    bus_stop = route.start_place
-    stop_coords = f'{bus_stop.latitude},{bus_stop.longitude}'
-
-    pickled_routes_data = REDIS_HELPER.get('routes')
-    routes_data = pickle.loads(pickled_routes_data)
-    route_id = get_route_id_by_name(routes_data, route_name)
-    if not route_id:
-        LOGGER.error(f'Failed to find route with name={route_name} from routes data')
-        return False
+    return prepare_notifications([notification_id])
 
-    gtfs_data = pickle.loads(REDIS_HELPER.get('gtfs_data'))
-    buses = gtfs_data.get(route_id)
-    if not buses:
-        LOGGER.error(f'Failed to retrieve route with id={route_id} from GTFS data')
+
+@task
+def prepare_notifications(notifications_ids):
+    """
+    Prepare data about transport arrival time for batch of notifications.
+    Notifications are grouped by route and stop, so vehicles of the route are
+    retrieved and their arrival times to the stop are estimated once per group
+    and sending of notifications is assigned for every user of the group.
+    Notifications deleted after dispatching are skipped as revoked ones.
+    """
+    notifications = Notification.get_with_routes(notifications_ids)
+    groups, prepared = _group_notifications(notifications)
+
+    deleted_ids = set(notifications_ids) - {notification.id for notification in notifications}
+    if deleted_ids:
+        LOGGER.info(f'Notifications with ids={sorted(deleted_ids)} were deleted after dispatching')
+
+    for group, group_notifications in groups.items():
+        if not _prepare_group(group, group_notifications):
+            prepared = False
+
+    return prepared
+
+
+@periodic_task(name='dispatch due notifications', run_every=DISPATCHER_CTONTAB)
+def dispatch_notifications():
+    """
+    Drain buckets of notifications wheel which are due every minute and assign
+    batched tasks to prepare notifications of the drained buckets. Notifications
+    of batches that were not assigned are put back into the wheel.
+    """
+    now = datetime.now(tz=KIEV_TZ)
+    notifications_ids = pop_due_notifications(now)
+    if notifications_ids is None:
+        LOGGER.error('Failed to retrieve due notifications from redis')
         return False
 
-    buses_coords = prettify_gtfs(buses)
-    time_to_stop = way.get_route_by_position(position=0).time
-    bus_time = find_closest_bus_time(buses_coords, stop_coords, time_to_stop)
-    arriving_time = int(time.strftime("%M", time.gmtime(bus_time)))
+    dispatched = True
+    for index in range(0, len(notifications_ids), DISPATCH_BATCH_SIZE):
+        batch = notifications_ids[index:index + DISPATCH_BATCH_SIZE]
+        try:
+            prepare_notifications.delay(batch)
+        except OperationalError as err:
+            LOGGER.error(f'Failed to assign task for notifications batch.{err}')
+            schedule_notifications({notification_id: now for notification_id in batch})
+            dispatched = False
 
-    send_notification.delay(way.user_id, arriving_time, route_name)
+    return dispatched
 
-    LOGGER.info(f'Notification with id={notification_id} was successfully prepared')
-    return True
+
+def _get_notification_message(arriving_time, route_name):
+    """Return text of notification about transport arrival."""
+    return f'Ваш транспорт {route_name} прибуде через {arriving_time} хвилин'
 
 
 @task(bind=True, retry_kwargs={'max_retries': 5})
 def send_notification(self, user_id, arriving_time, route_name):
     """Send notification about transport arrival."""
     user = CustomUser.get_by_id(user_id)
-    message = f'Ваш транспорт {route_name} прибуде через {arriving_time} хвилин'
+    message = _get_notification_message(arriving_time, route_name)
     was_sent = False
 
     chat_id = user.user_profile.telegram_id
     phone_number = user.phone_number
 
     if chat_id:
-        was_sent = send_telegram_message(chat_id, message)
+        was_sent = enqueue_telegram_messages([(chat_id, message)])
     elif phone_number:
         was_sent = send_sms(phone_number, message)
 
@@ -139,3 +318,55 @@ def send_notification(self, user_id, arriving_time, route_name):
 
     LOGGER.info(f'Notification was successfully prepared sent to user with id={user_id}')
     return was_sent
+
+
+@task
+def send_notifications(notifications):
+    """
+    Send batch of notifications about transport arrival, where `notifications`
+    is list of tuples with id of user, arriving time and name of route.
+    Telegram messages are put into the delivery queue, SMS are sent concurrently
+    by the batch sender and every failed notification is assigned to be sent
+    again separately.
+    """
+    users = CustomUser.objects.select_related('user_profile').in_bulk(
+        [user_id for user_id, _, _ in notifications]
+    )
+
+    channels_notifications = {SMS_CHANNEL: [], TELEGRAM_CHANNEL: []}
+    channels_messages = {SMS_CHANNEL: [], TELEGRAM_CHANNEL: []}
+    for notification in notifications:
+        user = users.get(notification[0])
+        if not user:
+            LOGGER.error(f'Notification was not sent to unknown user with id={notification[0]}')
+            continue
+
+        channel, recipient = TELEGRAM_CHANNEL, user.user_profile.telegram_id
+        if not recipient:
+            channel, recipient = SMS_CHANNEL, user.phone_number
+        if not recipient:
+            LOGGER.error(f'Notification was not sent to user with id={user.id} '
+                         f'without telegram and phone number')
+            continue
+
+        channels_notifications[channel].append(notification)
+        channels_messages[channel].append((recipient, _get_notification_message(*notification[1:])))
+
+    sent = True
+    for channel, messages in channels_messages.items():
+        if not messages:
+            continue
+
+        if channel == TELEGRAM_CHANNEL:
+            results = [enqueue_telegram_messages(messages)] * len(messages)
+        else:
+            results = send_batch(channel, messages)
+
+        for notification, was_sent in zip(channels_notifications[channel], results):
+            if not was_sent:
+                LOGGER.error(f'Notification was not sent to user with id={notification[0]}')
+                send_notification.apply_async(args=notification, countdown=5)
+                sent = False
+
+    LOGGER.info(f'Batch of {len(notifications)} notifications was sent. {get_channels_stats()}')
+    return sent
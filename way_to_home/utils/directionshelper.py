@@ -0,0 +1,88 @@
+"""
+Directions helper
+=================
+This module provides pooled client of Google Directions API that requests
+durations concurrently and caches them in Redis by rounded coordinates.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from django.conf import settings
+
+from .executorhelper import LazyExecutor
+from .redishelper import REDIS_HELPER
+
+__all__ = ["DIRECTIONS_CLIENT"]
+
+GOOGLE_DIRECTIONS_JSON_URL = 'https://maps.googleapis.com/maps/api/directions/json'
+MAX_CONCURRENT_REQUESTS = 8
+REQUEST_TIMEOUT = (3.05, 10)
+CACHE_TIME = 60
+CACHE_PRECISION = 3
+
+
+def _format_coords(coords):
+    """Return coordinates in `latitude,longitude` format of Google Maps API."""
+    return '{},{}'.format(*coords)
+
+
+def _get_cache_key(origin, destination):
+    """Return redis key of duration between cells of rounded coordinates."""
+    cells = [round(float(value), CACHE_PRECISION) for value in (*origin, *destination)]
+    return 'directions:{},{}:{},{}'.format(*cells)
+
+
+class DirectionsClient:
+    """Provide concurrent requests to Google Directions API via pooled session."""
+
+    def __init__(self, max_workers=MAX_CONCURRENT_REQUESTS):
+        """Initializes the new DirectionsClient instance."""
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=max_workers))
+        self.__executor = LazyExecutor(max_workers)
+
+    @property
+    def executor(self):
+        """Return thread pool that is lazily created in the current process."""
+        return self.__executor.get()
+
+    def get_duration(self, origin, destination):
+        """
+        Return duration in seconds of the way from `origin` to `destination`,
+        where both are tuples with latitude and longitude. Return None if
+        duration can not be retrieved.
+        """
+        cache_key = _get_cache_key(origin, destination)
+        cached_duration = REDIS_HELPER.get(cache_key)
+        if cached_duration is not None:
+            return int(cached_duration)
+
+        params = {'origin': _format_coords(origin),
+                  'destination': _format_coords(destination),
+                  'key': settings.GOOGLE_API_KEY}
+
+        try:
+            response = self.session.get(GOOGLE_DIRECTIONS_JSON_URL,
+                                        params=params,
+                                        timeout=REQUEST_TIMEOUT)
+            directions = response.json()
+            duration = directions['routes'][0]['legs'][0]['duration']['value']
+        except (RequestException, ValueError, KeyError, IndexError):
+            return None
+
+        REDIS_HELPER.set(cache_key, duration, cache_time=CACHE_TIME)
+        return duration
+
+    def get_durations(self, origins, destination):
+        """
+        Return list of durations from every origin to `destination`,
+        requested concurrently with at most `max_workers` requests.
+        """
+        destinations = [destination] * len(origins)
+        return list(self.executor.map(self.get_duration, origins, destinations))
+
+
+DIRECTIONS_CLIENT = DirectionsClient()
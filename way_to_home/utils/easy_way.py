@@ -1,27 +1,77 @@
 """This module provides functionality to work with data from EasyWay."""
 
+import re
+import sys
 from collections import defaultdict
 
 from google import protobuf  # pylint: disable=no-name-in-module, unused-import
+from google.protobuf.message import DecodeError
 from google.transit import gtfs_realtime_pb2
 
-from .file_handlers import parse_csv_file
+from .file_handlers import iter_csv_file
 
 
-def compile_file(file_gtfs):
-    """This function compile GTFS file to json file."""
-    feed = gtfs_realtime_pb2.FeedMessage()
+ROUTE_NUMBER_PATTERN = re.compile(r'^(.*?)0*(\d+)(\D*)$')
+FEED_HEADER_TAG = 0x0A
+VARINT_MAX_LENGTH = 10
+LATIN_TO_CYRILLIC = str.maketrans('ABCEHKMOPTX', 'АВСЕНКМОРТХ')
+
+
+def get_header_timestamp(content):
+    """
+    Return timestamp from the header of serialized GTFS feed or None if it is absent.
+    Header is the first field of the feed, so only its bytes are parsed.
+    """
+    if not content or content[0] != FEED_HEADER_TAG:
+        return None
+
+    header_length, position, shift = 0, 1, 0
+    for position, byte in enumerate(content[1:VARINT_MAX_LENGTH + 1], start=2):
+        header_length |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+    else:
+        return None
 
+    header = gtfs_realtime_pb2.FeedHeader()
     try:
-        with open(file_gtfs, 'rb') as file:
-            content = file.read()
-    except (FileNotFoundError, PermissionError):
+        header.ParseFromString(content[position:position + header_length])
+    except DecodeError:
         return None
 
-    feed.ParseFromString(content)
-    gtfs_data = _parse_vehicle_data(feed.entity)  # pylint: disable=no-member
+    return header.timestamp or None  # pylint: disable=no-member
 
-    return gtfs_data
+
+def compile_feed(content, last_timestamps=(0, 0)):
+    """
+    Return tuple with timestamps of the feed header and of the latest vehicle
+    position and compiled data about vehicles of every route. Data is None if
+    neither of timestamps is newer than appropriate one from `last_timestamps`,
+    in which case entities of the feed are not parsed if the header was not changed.
+    Return None if content is not valid GTFS feed.
+    """
+    last_header_timestamp, last_vehicles_timestamp = last_timestamps
+
+    header_timestamp = get_header_timestamp(content)
+    if header_timestamp and header_timestamp <= last_header_timestamp:
+        return last_timestamps, None
+
+    feed = gtfs_realtime_pb2.FeedMessage()
+    try:
+        feed.ParseFromString(content)
+    except DecodeError:
+        return None
+
+    feed_entity = feed.entity  # pylint: disable=no-member
+    header_timestamp = feed.header.timestamp  # pylint: disable=no-member
+    vehicles_timestamp = max((entity.vehicle.timestamp for entity in feed_entity), default=0)
+    timestamps = (header_timestamp, vehicles_timestamp)
+
+    if vehicles_timestamp and vehicles_timestamp <= last_vehicles_timestamp:
+        return timestamps, None
+
+    return timestamps, _parse_vehicle_data(feed_entity)
 
 
 def _parse_vehicle_data(feed_entity):
@@ -36,7 +86,8 @@ def _parse_vehicle_data(feed_entity):
             'trip_id': entity.vehicle.trip.trip_id,  # identifier of trip
             'lat': entity.vehicle.position.latitude,  # latitude in WGS-84 coordinate system
             'lon': entity.vehicle.position.longitude,  # longitude in WGS-84 coordinate system
-            'vehicle_id': entity.vehicle.vehicle.id  # identifier of vehicle
+            'vehicle_id': entity.vehicle.vehicle.id,  # identifier of vehicle
+            'timestamp': entity.vehicle.timestamp  # time of position in POSIX time
         })
 
     return vehicle_data
@@ -47,13 +98,9 @@ def parse_trips_data(file_path='./trips.txt'):
     Return data about trips as dictionary where key
     is id of route and value is list of trips ids.
     """
-    trips_content = parse_csv_file(file_path, ['route_id', 'trip_id'])
-
     trips = defaultdict(list)
-    for trip in trips_content:
-        key = trip.get('route_id')
-        value = trip.get('trip_id')
-        trips[key].append(value)
+    for route_id, trip_id in iter_csv_file(file_path, ['route_id', 'trip_id']):
+        trips[route_id].append(trip_id)
 
     return trips
 
@@ -63,15 +110,7 @@ def parse_routes_data(file_path='./routes.txt'):
     Return data about routes as dictionary where key is id
     of route and value is short name of appropriate route.
     """
-    routes_content = parse_csv_file(file_path, ['route_id', 'route_short_name'])
-
-    routes = {}
-    for route in routes_content:
-        key = route.get('route_id')
-        value = route.get('route_short_name')
-        routes[key] = value
-
-    return routes
+    return dict(iter_csv_file(file_path, ['route_id', 'route_short_name']))
 
 
 def parse_stops_data(file_path='./stops.txt'):
@@ -79,22 +118,134 @@ def parse_stops_data(file_path='./stops.txt'):
     Return data about stops as dictionary where key is id of stop and
     value is tuple with latitude and longitude of appropriate stop.
     """
-    stops_content = parse_csv_file(file_path, ['stop_id', 'stop_lat', 'stop_lon'])
+    stops_content = iter_csv_file(
+        file_path,
+        ['stop_id', 'stop_lat', 'stop_lon'],
+        converters={'stop_lat': float, 'stop_lon': float}
+    )
 
     stops = {}
-    for stop in stops_content:
-        key = stop.get('stop_id')
-        latitude = stop.get('stop_lat')
-        longitude = stop.get('stop_lon')
-        stops[key] = (latitude, longitude)
+    for stop_id, latitude, longitude in stops_content:
+        stops[sys.intern(stop_id)] = (latitude, longitude)
 
     return stops
 
 
-def prettify_gtfs(gtfs_data):
-    """Provide parsing GTFS dict to more comfortable format."""
-    prettified_data = []
-    for vehicle in gtfs_data:
-        prettified_data.append(f'{vehicle["lat"]},{vehicle["lon"]}')
+def _parse_gtfs_time(gtfs_time):
+    """
+    Return number of seconds since midnight from GTFS time like `25:10:00`
+    or None if time is empty, as it is allowed for stops which are not timepoints.
+    """
+    if not gtfs_time.strip():
+        return None
+
+    hours, minutes, seconds = gtfs_time.split(':')
+    return int(hours) * 60 * 60 + int(minutes) * 60 + int(seconds)
+
+
+def _interpolate_times(trip_stops):
+    """
+    Return list of tuples with id of stop and its time from sorted list of trip stops,
+    where empty times are linearly interpolated between the surrounding timepoints.
+    Stops before the first timepoint and after the last one are dropped.
+    """
+    timepoints = [index for index, (_, _, time) in enumerate(trip_stops) if time is not None]
+    if not timepoints:
+        return []
+
+    stops_times = []
+    for start, end in zip(timepoints, timepoints[1:]):
+        start_time, end_time = trip_stops[start][2], trip_stops[end][2]
+        for index in range(start, end):
+            time = start_time + (end_time - start_time) * (index - start) // (end - start)
+            stops_times.append((trip_stops[index][1], time))
+
+    last_timepoint = trip_stops[timepoints[-1]]
+    stops_times.append((last_timepoint[1], last_timepoint[2]))
+
+    return stops_times
+
+
+def parse_stop_times_data(file_path='./stop_times.txt'):
+    """
+    Return data about stop times as dictionary where key is id of trip and value
+    is list of tuples with id of stop and number of seconds since the trip start.
+    Empty times of stops which are not timepoints are interpolated.
+    """
+    stop_times_content = iter_csv_file(
+        file_path,
+        ['trip_id', 'stop_sequence', 'stop_id', 'arrival_time'],
+        converters={'stop_sequence': int, 'stop_id': sys.intern, 'arrival_time': _parse_gtfs_time}
+    )
+
+    trips_stops = defaultdict(list)
+    for trip_id, stop_sequence, stop_id, arrival_time in stop_times_content:
+        trips_stops[trip_id].append((stop_sequence, stop_id, arrival_time))
+
+    stop_times = {}
+    while trips_stops:
+        trip_id, trip_stops = trips_stops.popitem()
+        trip_stops.sort(key=lambda trip_stop: trip_stop[0])
+        stops_times = _interpolate_times(trip_stops)
+        if not stops_times:
+            continue
+
+        start_time = stops_times[0][1]
+        stop_times[trip_id] = [(stop_id, time - start_time) for stop_id, time in stops_times]
+
+    return stop_times
+
+
+def build_route_patterns(trips, stops, stop_times):
+    """
+    Return dictionary where key is id of route and value is dictionary with list of
+    unique stop patterns of the route and mapping of trips ids to pattern positions.
+    Every pattern is list of tuples with stop id, its coordinates and time offset.
+    """
+    route_patterns = {}
+    for route_id, trips_ids in trips.items():
+        patterns, patterns_positions, trips_patterns = [], {}, {}
+        for trip_id in trips_ids:
+            trip_stops = tuple(stop_times.get(trip_id, ()))
+            if not trip_stops:
+                continue
+
+            if trip_stops not in patterns_positions:
+                patterns_positions[trip_stops] = len(patterns)
+                patterns.append([
+                    (stop_id, *stops[stop_id], offset)
+                    for stop_id, offset in trip_stops if stop_id in stops
+                ])
+            trips_patterns[trip_id] = patterns_positions[trip_stops]
+
+        if patterns:
+            route_patterns[route_id] = {'patterns': patterns, 'trips': trips_patterns}
+
+    return route_patterns
+
+
+def normalize_route_name(route_name):
+    """
+    Return route name in the uppercase Cyrillic form where number
+    of the route is padded with zeros to two digits, e.g. `Тр5` -> `ТР05`.
+    """
+    route_name = route_name.strip().upper().translate(LATIN_TO_CYRILLIC)
+
+    matched_name = ROUTE_NUMBER_PATTERN.match(route_name)
+    if not matched_name:
+        return route_name
+
+    prefix, number, suffix = matched_name.groups()
+    return prefix + number.rjust(2, '0') + suffix
+
+
+def build_routes_index(routes):
+    """
+    Return dictionary where key is normalized short name of route
+    and value is comma separated ids of routes with such name.
+    """
+    routes_index = defaultdict(list)
+    for route_id, short_name in sorted(routes.items()):
+        routes_index[normalize_route_name(short_name)].append(route_id)
 
-    return prettified_data
+    return {route_name: ','.join(routes_ids) for route_name, routes_ids in routes_index.items()}
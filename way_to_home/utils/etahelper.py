@@ -0,0 +1,179 @@
+"""
+ETA helper
+==========
+This module provides local estimation of vehicles arrival time to the stop
+based on static GTFS stop patterns of the route and vehicles positions.
+"""
+
+import math
+import pickle
+
+from .redishelper import REDIS_HELPER
+
+
+ROUTE_PATTERNS_KEY = 'route_patterns'
+EARTH_RADIUS = 6371000
+MAX_STOP_DISTANCE = 300
+DEFAULT_VEHICLE_SPEED = 5
+DETOUR_FACTOR = 1.3
+MIN_MOVING_SPEED = 1
+MAX_HEADING_DIFFERENCE = 90
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Return distance in meters between two points in WGS-84 coordinate system."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_phi = phi2 - phi1
+    delta_lambda = math.radians(lon2 - lon1)
+
+    chord = (math.sin(delta_phi / 2) ** 2 +
+             math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2)
+
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(chord))
+
+
+def get_bearing(lat1, lon1, lat2, lon2):
+    """Return initial bearing in degrees from the first point to the second one."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta_lambda = math.radians(lon2 - lon1)
+
+    east = math.sin(delta_lambda) * math.cos(phi2)
+    north = (math.cos(phi1) * math.sin(phi2) -
+             math.sin(phi1) * math.cos(phi2) * math.cos(delta_lambda))
+
+    return math.degrees(math.atan2(east, north)) % 360
+
+
+def is_heading_away(vehicle, stop_coords, motion):
+    """
+    Return True if vehicle with `motion` tuple of speed and bearing
+    is moving in the direction opposite to the stop with `stop_coords`.
+    """
+    if not motion or motion[1] is None or motion[0] < MIN_MOVING_SPEED:
+        return False
+
+    stop_bearing = get_bearing(vehicle['lat'], vehicle['lon'], *stop_coords)
+    difference = abs((motion[1] - stop_bearing + 180) % 360 - 180)
+
+    return difference > MAX_HEADING_DIFFERENCE
+
+
+def _project_on_segment(lat, lon, start, end):
+    """
+    Return tuple with fraction of the segment from `start` to `end` at which
+    the point is projected and distance in meters from point to the segment.
+    """
+    scale = math.cos(math.radians(lat))
+    segment_x = (end[1] - start[1]) * scale
+    segment_y = end[0] - start[0]
+    point_x = (lon - start[1]) * scale
+    point_y = lat - start[0]
+
+    segment_length = segment_x ** 2 + segment_y ** 2
+    fraction = 0.0
+    if segment_length:
+        fraction = (point_x * segment_x + point_y * segment_y) / segment_length
+        fraction = min(max(fraction, 0.0), 1.0)
+
+    projected_lat = start[0] + fraction * (end[0] - start[0])
+    projected_lon = start[1] + fraction * (end[1] - start[1])
+
+    return fraction, haversine(lat, lon, projected_lat, projected_lon)
+
+
+def find_stop_position(pattern, stop_coords, stop_id=None):
+    """
+    Return position of the pattern stop with `stop_id` if it is given and
+    present in the pattern, otherwise position of the stop that is the nearest
+    to `stop_coords` or None if there is no stop closer than `MAX_STOP_DISTANCE`.
+    """
+    if stop_id is not None:
+        for index, pattern_stop in enumerate(pattern):
+            if pattern_stop[0] == str(stop_id):
+                return index
+
+    stop_lat, stop_lon = stop_coords
+    position, min_distance = None, MAX_STOP_DISTANCE
+    for index, (_, lat, lon, _) in enumerate(pattern):
+        distance = haversine(stop_lat, stop_lon, lat, lon)
+        if distance < min_distance:
+            position, min_distance = index, distance
+
+    return position
+
+
+def get_vehicle_progress(pattern, lat, lon):
+    """
+    Return number of seconds from the beginning of the trip
+    which correspond to the vehicle position on the pattern.
+    """
+    if len(pattern) == 1:
+        return pattern[0][3]
+
+    progress, min_distance = None, None
+    for start, end in zip(pattern, pattern[1:]):
+        fraction, distance = _project_on_segment(lat, lon, start[1:3], end[1:3])
+        if min_distance is None or distance < min_distance:
+            min_distance = distance
+            progress = start[3] + fraction * (end[3] - start[3])
+
+    return progress
+
+
+def _estimate_by_distance(vehicle, stop_coords, motion):
+    """
+    Return number of seconds until arrival to the stop estimated by the straight line
+    distance and speed of the vehicle or None if vehicle is heading away from the stop.
+    """
+    if is_heading_away(vehicle, stop_coords, motion):
+        return None
+
+    speed = DEFAULT_VEHICLE_SPEED
+    if motion and motion[0] >= MIN_MOVING_SPEED:
+        speed = motion[0]
+
+    distance = haversine(vehicle['lat'], vehicle['lon'], *stop_coords)
+    return int(distance * DETOUR_FACTOR / speed)
+
+
+def estimate_arrival_times(vehicles, stop_coords, route_patterns, stop_id=None, motions=None):
+    """
+    Return list with estimated number of seconds until arrival to the stop
+    with `stop_coords` for each vehicle which has not passed the stop yet.
+    Vehicles with unknown trip are estimated by the straight line distance
+    and their speed from `motions` dictionary if they are not heading away.
+    """
+    patterns = route_patterns['patterns']
+    trips = route_patterns['trips']
+    motions = motions or {}
+
+    vehicles_time = []
+    for vehicle in vehicles:
+        pattern_index = trips.get(vehicle['trip_id'])
+        if pattern_index is None:
+            arrival_time = _estimate_by_distance(vehicle, stop_coords,
+                                                 motions.get(vehicle.get('vehicle_id')))
+            if arrival_time is not None:
+                vehicles_time.append(arrival_time)
+            continue
+
+        pattern = patterns[pattern_index]
+        stop_position = find_stop_position(pattern, stop_coords, stop_id)
+        if stop_position is None:
+            continue
+
+        progress = get_vehicle_progress(pattern, vehicle['lat'], vehicle['lon'])
+        arrival_time = pattern[stop_position][3] - progress
+        if arrival_time >= 0:
+            vehicles_time.append(int(arrival_time))
+
+    return vehicles_time
+
+
+def get_route_patterns(route_id, key=ROUTE_PATTERNS_KEY):
+    """Retrieve stop patterns of the route with `route_id` from Redis hash `key`."""
+    pickled_patterns = REDIS_HELPER.hget(key, route_id)
+    if not pickled_patterns:
+        return None
+
+    return pickle.loads(pickled_patterns)
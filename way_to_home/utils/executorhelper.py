@@ -0,0 +1,29 @@
+"""
+Executor helper
+===============
+This module provides thread pool that is lazily created on the first use in the
+current process, so it is not created at import time and is not inherited by
+processes forked after import, e.g. by workers of celery or web server.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LazyExecutor:  # pylint: disable=too-few-public-methods
+    """Provides thread pool of at most `max_workers` threads created on the first use."""
+
+    def __init__(self, max_workers=None):
+        """Initializes the new LazyExecutor instance."""
+        self.max_workers = max_workers
+        self.__executor = None
+        self.__lock = threading.Lock()
+
+    def get(self):
+        """Return thread pool creating it once for all threads of the current process."""
+        if self.__executor is None:
+            with self.__lock:
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        return self.__executor
@@ -0,0 +1,31 @@
+"""
+Feeds
+=====
+This module provides registry of GTFS feeds of served cities.
+
+Data of every city is stored in redis under keys prefixed by the name
+of the city, so a task that serves one city never reads data of others.
+"""
+
+from django.conf import settings
+
+
+def get_feeds():
+    """Return dictionary where key is name of city and value is dictionary of its feed settings."""
+    return settings.GTFS_FEEDS
+
+
+def get_city_key(city, key):
+    """Return redis key of data with `key` name in namespace of the city."""
+    return f'{city}:{key}'
+
+
+def find_city(latitude, longitude):
+    """Return name of the city whose bounds contain the point or None."""
+    latitude, longitude = float(latitude), float(longitude)
+    for city, feed in get_feeds().items():
+        min_latitude, min_longitude, max_latitude, max_longitude = feed['bounds']
+        if min_latitude <= latitude <= max_latitude and min_longitude <= longitude <= max_longitude:
+            return city
+
+    return None
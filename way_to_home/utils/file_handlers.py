@@ -1,9 +1,22 @@
 """This module implements helpers functions for work with files."""
 
+import io
+import os
 import pickle
 import csv
+import tempfile
 from zipfile import ZipFile, BadZipFile
 import requests
+from requests.exceptions import RequestException
+
+from .loggerhelper import LOGGER
+
+
+SESSION = requests.Session()
+REQUEST_TIMEOUT = (3.05, 30)
+CHUNK_SIZE = 64 * 1024
+VALIDATOR_HEADERS = {'If-None-Match': 'ETag', 'If-Modified-Since': 'Last-Modified'}
+NOT_MODIFIED = 'not modified'
 
 
 def _get_fields_position(row_header, required_fields):
@@ -18,62 +31,162 @@ def _get_fields_position(row_header, required_fields):
     return fields_position
 
 
-def unzip_file(path_to_file, unzip_to='./'):
-    """Unzip file to directory with path `unzip_to`."""
+def _get_conditional_headers(validators):
+    """Return headers of conditional request built from `ETag` and `Last-Modified` validators."""
+    headers = {}
+    for request_header, response_header in VALIDATOR_HEADERS.items():
+        if validators.get(response_header):
+            headers[request_header] = validators[response_header]
+
+    return headers
+
+
+def _update_validators(validators, response):
+    """Replace values of `validators` dictionary by validators of the response."""
+    validators.clear()
+    for response_header in VALIDATOR_HEADERS.values():
+        if response.headers.get(response_header):
+            validators[response_header] = response.headers[response_header]
+
+
+def load_file(url, save_to='./', validators=None):
+    """
+    Download file from `url` to directory with path `save_to`. Body of response
+    is streamed into temporary file which atomically replaces the previous one.
+    If `validators` dictionary is given, request is conditional on its `ETag`
+    and `Last-Modified` values and the dictionary is updated by the new ones.
+    Return path to the loaded file, `NOT_MODIFIED` if file was not changed
+    since the previous load or None if file was not loaded.
+    """
+    file_path = os.path.join(save_to, url.split('/')[-1])
+
+    headers = {}
+    if validators is not None and os.path.exists(file_path):
+        headers = _get_conditional_headers(validators)
+
     try:
-        with ZipFile(path_to_file, 'r') as zip_file:
-            try:
-                zip_file.extractall(unzip_to)
-            except (ValueError, BadZipFile, PermissionError):
-                return False
-    except (FileNotFoundError, PermissionError):
-        return False
+        with SESSION.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if response.status_code == 304 and headers:
+                return NOT_MODIFIED
+            if not response.status_code == 200:
+                return None
 
-    return True
+            save_content(response.iter_content(chunk_size=CHUNK_SIZE), file_path)
+    except (RequestException, OSError):
+        return None
+
+    if validators is not None:
+        _update_validators(validators, response)
+
+    return file_path
 
 
-def load_file(url, save_to='./'):
-    """Download file from `url` to directory with path `save_to`."""
-    file_name = url.split('/')[-1]
+def load_content(url, validators=None):
+    """
+    Download content from `url` into memory without writing it to disk.
+    If `validators` dictionary is given, request is conditional on its `ETag`
+    and `Last-Modified` values and the dictionary is updated by the new ones.
+    Return bytes of the content, `NOT_MODIFIED` if content was not changed
+    since the previous load or None if content was not loaded.
+    """
+    headers = _get_conditional_headers(validators) if validators else {}
+
+    try:
+        response = SESSION.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    except RequestException:
+        return None
 
-    request = requests.get(url)
-    if not request.status_code == 200:
+    if response.status_code == 304 and headers:
+        return NOT_MODIFIED
+    if not response.status_code == 200:
         return None
 
+    if validators is not None:
+        _update_validators(validators, response)
+
+    return response.content
+
+
+def save_content(chunks, file_path):
+    """
+    Write chunks of bytes into temporary file and atomically move it to `file_path`.
+    Directory of the file is created if it does not exist.
+    """
+    file_dir = os.path.dirname(file_path) or '.'
+    os.makedirs(file_dir, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(dir=file_dir, delete=False)
+    try:
+        with temp_file:
+            for chunk in chunks:
+                temp_file.write(chunk)
+        os.replace(temp_file.name, file_path)
+    except (RequestException, OSError):
+        os.remove(temp_file.name)
+        raise
+
+
+def _iter_csv_rows(csv_file, required_fields, converters):
+    """Yield tuple with converted values of the required fields for every row of csv file."""
+    csv_reader = csv.reader(csv_file, delimiter=',')
     try:
-        with open(f'{save_to}/{file_name}', 'wb') as file:
-            file.write(request.content)
-            return file.name
-    except PermissionError:
-        pass
+        fields_position = _get_fields_position(next(csv_reader), required_fields)
+    except (StopIteration, ValueError):
+        return
+
+    columns = [(fields_position[field], converters.get(field)) for field in required_fields]
+    for row in csv_reader:
+        try:
+            values = tuple(convert(row[position]) if convert else row[position]
+                           for position, convert in columns)
+        except (ValueError, TypeError, IndexError) as err:
+            LOGGER.warning(f'Row {row} of csv file was skipped. {err}')
+            continue
 
+        yield values
 
-def parse_csv_file(path_to_file, required_fields):
-    """Provide csv file parsing with the required fields."""
-    parsed_data = []
+
+def iter_csv_file(csv_file, required_fields, converters=None):
+    """
+    Yield tuple with values of the required fields for every row of csv file
+    without reading the whole file into memory. `csv_file` is either path to
+    file or already opened text file. Values of fields which are present in
+    `converters` dictionary are converted by the appropriate callable.
+    Rows which are too short or can not be converted are logged and skipped.
+    Nothing is yielded if file can not be read or some of fields are absent.
+    """
+    converters = converters or {}
 
     try:
-        with open(path_to_file) as csv_file:
-            try:
-                csv_reader = csv.reader(csv_file, delimiter=',')
-            except csv.Error:
-                return None
+        if not isinstance(csv_file, str):
+            yield from _iter_csv_rows(csv_file, required_fields, converters)
+            return
 
-            for row in csv_reader:
-                if csv_reader.line_num == 1:
-                    fields_position = _get_fields_position(row, required_fields)
-                    continue
+        with open(csv_file, encoding='utf-8-sig', newline='') as opened_file:
+            yield from _iter_csv_rows(opened_file, required_fields, converters)
 
-                item = {}
-                for field, position in fields_position.items():
-                    item[field] = row[position]
+    except (FileNotFoundError, PermissionError, csv.Error):
+        return
 
-                parsed_data.append(item)
 
-    except (FileNotFoundError, PermissionError):
+def parse_zip_members(path_to_file, parsers):
+    """
+    Return dictionary where key is name of member of zip archive and value is
+    result of the appropriate parser from `parsers` dictionary, which reads the
+    member as text file streamed directly from the archive without extraction.
+    Return None if archive or some of required members can not be read.
+    """
+    parsed_members = {}
+
+    try:
+        with ZipFile(path_to_file, 'r') as zip_file:
+            for member_name, parser in parsers.items():
+                with zip_file.open(member_name) as member:
+                    member_file = io.TextIOWrapper(member, encoding='utf-8-sig', newline='')
+                    parsed_members[member_name] = parser(member_file)
+    except (KeyError, BadZipFile, FileNotFoundError, PermissionError):
         return None
 
-    return parsed_data
+    return parsed_members
 
 
 def pickle_data(data, path_to_file):
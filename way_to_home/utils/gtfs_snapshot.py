@@ -0,0 +1,146 @@
+"""
+GTFS snapshot
+=============
+This module provides compact columnar representation of GTFS vehicles data.
+
+A snapshot is a redis hash where every field is id of route and value is
+the route block. Every block stores latitudes and longitudes as float32
+arrays and trips/vehicles identifiers as indexes into the block`s table
+of strings, so a single route is read without touching the rest of snapshot.
+Only changed routes are published unless the hash in redis does not hold the
+previously published snapshot any more, e.g. after it was evicted or flushed.
+"""
+
+import struct
+
+from .loggerhelper import LOGGER
+from .redishelper import REDIS_HELPER
+
+
+GTFS_DATA_KEY = 'gtfs_data'
+SNAPSHOT_VERSION_FIELD = '_version'
+
+_COUNT = struct.Struct('<H')
+_LENGTH = struct.Struct('<H')
+
+
+def _pack_string(value):
+    """Return length-prefixed utf-8 representation of string."""
+    encoded = value.encode('utf-8')
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_string(buffer, offset):
+    """Return string from `buffer` at `offset` and offset of the next item."""
+    length, = _LENGTH.unpack_from(buffer, offset)
+    offset += _LENGTH.size
+    value = bytes(buffer[offset:offset + length]).decode('utf-8')
+
+    return value, offset + length
+
+
+def pack_route(vehicles):
+    """
+    Return bytes with columnar representation of vehicles of a certain route,
+    where `vehicles` is list of dictionaries with `trip_id`, `lat`, `lon`
+    and `vehicle_id` keys as produced by `easy_way._parse_vehicle_data`.
+    """
+    strings = {}
+    latitudes, longitudes, trips, vehicles_ids = [], [], [], []
+
+    for vehicle in vehicles:
+        latitudes.append(vehicle['lat'])
+        longitudes.append(vehicle['lon'])
+        trips.append(strings.setdefault(vehicle['trip_id'], len(strings)))
+        vehicles_ids.append(strings.setdefault(vehicle['vehicle_id'], len(strings)))
+
+    count = len(latitudes)
+    columns = struct.pack(f'<{count}f{count}f{count}H{count}H',
+                          *latitudes, *longitudes, *trips, *vehicles_ids)
+    strings_table = b''.join(_pack_string(value) for value in strings)
+
+    return _COUNT.pack(count) + columns + _COUNT.pack(len(strings)) + strings_table
+
+
+def unpack_route(block):
+    """
+    Return list of vehicles dictionaries from bytes created by `pack_route`.
+    Return None if block is corrupted.
+    """
+    buffer = memoryview(block)
+    try:
+        count, = _COUNT.unpack_from(buffer, 0)
+        columns = struct.Struct(f'<{count}f{count}f{count}H{count}H')
+        values = columns.unpack_from(buffer, _COUNT.size)
+
+        offset = _COUNT.size + columns.size
+        strings_count, = _COUNT.unpack_from(buffer, offset)
+        offset += _COUNT.size
+
+        strings = []
+        for _ in range(strings_count):
+            value, offset = _unpack_string(buffer, offset)
+            strings.append(value)
+
+        vehicles = []
+        for position in range(count):
+            vehicles.append({
+                'trip_id': strings[values[2 * count + position]],
+                'lat': values[position],
+                'lon': values[count + position],
+                'vehicle_id': strings[values[3 * count + position]]
+            })
+    except (struct.error, IndexError, UnicodeDecodeError):
+        return None
+
+    return vehicles
+
+
+def is_snapshot_published(published_blocks, published_version, key=GTFS_DATA_KEY):
+    """
+    Return True if redis hash `key` still holds snapshot of `published_version`
+    with the same number of routes as `published_blocks`.
+    """
+    version = REDIS_HELPER.hget(key, SNAPSHOT_VERSION_FIELD)
+    if version is None or int(version) != published_version:
+        return False
+
+    return REDIS_HELPER.hlen(key) == len(published_blocks) + 1
+
+
+def publish_snapshot(blocks, published_blocks, version, key=GTFS_DATA_KEY, published_version=None):
+    """
+    Publish packed route blocks into redis hash `key` in a single transaction,
+    rewriting only routes whose blocks differ from `published_blocks`.
+    The whole hash is rewritten if it does not match the published snapshot.
+    Return True if snapshot was successfully published.
+    """
+    if published_blocks and not is_snapshot_published(published_blocks, published_version, key):
+        LOGGER.warning(f'Snapshot {key} does not match the published one and is rewritten.')
+        published_blocks = {}
+
+    changed_blocks = {
+        route_id: block for route_id, block in blocks.items()
+        if published_blocks.get(route_id) != block
+    }
+    changed_blocks[SNAPSHOT_VERSION_FIELD] = version
+    removed_routes = [route_id for route_id in published_blocks if route_id not in blocks]
+
+    return REDIS_HELPER.update_hash(
+        key,
+        mapping=changed_blocks,
+        removed_keys=removed_routes,
+        replace=not published_blocks
+    )
+
+
+def get_route_vehicles(route_id, key=GTFS_DATA_KEY):
+    """
+    Return list of vehicles of the route with `route_id` from the latest
+    published snapshot or None if route is absent in the snapshot.
+    """
+    block = REDIS_HELPER.hget(key, route_id)
+    if not block:
+        return None
+
+    return unpack_route(block)
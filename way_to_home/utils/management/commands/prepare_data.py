@@ -3,6 +3,7 @@
 from django.core.management.base import BaseCommand
 
 from utils.celery_tasks import prepare_static_easyway_data
+from utils.feeds import get_feeds
 
 
 class Command(BaseCommand):
@@ -10,7 +11,14 @@ class Command(BaseCommand):
 
     help = 'Prepare static data from Easy Way'
 
+    def add_arguments(self, parser):
+        """Defines arguments of `prepare_data` custom command."""
+        parser.add_argument('--city', choices=list(get_feeds()),
+                            help='City to prepare data of, all registered cities by default')
+
     def handle(self, *args, **kwargs):  # pylint: disable=unused-argument
         """Defines commands that handle `prepare_data` custom command."""
-        prepare_static_easyway_data.run()
-        print('Easy Way data was successfully prepared.')
+        cities = [kwargs['city']] if kwargs.get('city') else list(get_feeds())
+        for city in cities:
+            prepare_static_easyway_data.run(city)
+            print(f'Easy Way data of {city} was successfully prepared.')
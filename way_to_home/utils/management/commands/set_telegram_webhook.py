@@ -0,0 +1,30 @@
+"""This module provides the custom command `set_telegram_webhook`."""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from telebot.apihelper import ApiException
+
+from telegram_bot.bot_handler import BOT
+
+
+class Command(BaseCommand):
+    """Custom command to register webhook of telegram bot."""
+
+    help = 'Register webhook which receives updates of telegram bot'
+
+    def add_arguments(self, parser):
+        """Defines arguments of `set_telegram_webhook` custom command."""
+        parser.add_argument('--domain', default=settings.DOMAIN,
+                            help='Public domain of the site which serves the webhook over HTTPS')
+
+    def handle(self, *args, **kwargs):  # pylint: disable=unused-argument
+        """Defines commands that handle `set_telegram_webhook` custom command."""
+        path = reverse('telegram_webhook', args=[settings.TELEGRAM_WEBHOOK_SECRET])
+        try:
+            BOT.set_webhook(url=f'https://{kwargs["domain"]}{path}',
+                            max_connections=settings.TELEGRAM_WEBHOOK_WORKERS)
+        except ApiException as err:
+            raise CommandError(f'Telegram webhook was not set. {err}')
+
+        print('Telegram webhook was successfully set.')
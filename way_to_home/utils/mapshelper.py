@@ -1,39 +1,46 @@
 """This module provides helper functionality to work with google maps data."""
 
-import requests
-
-from django.conf import settings
-
+from utils.directionshelper import DIRECTIONS_CLIENT
+from utils.etahelper import estimate_arrival_times, is_heading_away
 from utils.notificationhelper import get_preparing_time
 
-GOOGLE_DIRECTIONS_JSON_URL = 'https://maps.googleapis.com/maps/api/directions/json'
-
 
-def find_closest_bus_time(buses_coords, bus_stop_coords, time_to_stop):
-    """Return arriving time of the closest bus to the stop."""
+def get_arrival_times(buses, bus_stop_coords, route_patterns=None, stop_id=None, motions=None):
+    """
+    Return sorted list with arriving time of buses to the stop. Time is estimated
+    locally by stop patterns of the route if they are given, otherwise
+    Google Directions API is requested for every bus which is not heading
+    away from the stop according to `motions` of buses.
+    """
+    if route_patterns:
+        vehicles_time = estimate_arrival_times(buses, bus_stop_coords, route_patterns,
+                                               stop_id, motions)
+    else:
+        motions = motions or {}
+        buses = [bus for bus in buses
+                 if not is_heading_away(bus, bus_stop_coords, motions.get(bus.get('vehicle_id')))]
+        vehicles_time = get_vehicles_time(buses, bus_stop_coords)
+
+    return sorted(vehicles_time)
+
+
+def find_closest_time(vehicles_time, time_to_stop):
+    """
+    Return the first of sorted arriving times of buses which leaves
+    enough time for the user to prepare and get to the stop.
+    """
     preparing_time = get_preparing_time(time_to_stop)
 
-    vehicles_time = []
-    for bus in buses_coords:
-        time = get_vehicle_time(bus, bus_stop_coords)
-        vehicles_time.append(time)
-
-    sorted_time = sorted(vehicles_time)
-    for time in sorted_time:
+    for time in vehicles_time:
         if time > preparing_time:
             return time
 
     return None
 
 
-def get_vehicle_time(bus_coords, bus_stop_coords):
-    """Return arriving time of the bus to the appropriate bus stop."""
-    params = {'origin': bus_coords,
-              'destination': bus_stop_coords,
-              'key': settings.GOOGLE_API_KEY}
-
-    response = requests.get(GOOGLE_DIRECTIONS_JSON_URL, params=params)
-    vehicle = response.json()
-    time = vehicle['routes'][0]['legs'][0]['duration']['value']
+def get_vehicles_time(buses, bus_stop_coords):
+    """Return arriving time of every bus to the appropriate bus stop."""
+    buses_coords = [(bus['lat'], bus['lon']) for bus in buses]
+    vehicles_time = DIRECTIONS_CLIENT.get_durations(buses_coords, bus_stop_coords)
 
-    return time
+    return [time for time in vehicles_time if time is not None]
@@ -1,16 +1,23 @@
 """This module provides helper functionality to work with notifications."""
 
-import pickle
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 
 import pytz
 
+from .easy_way import normalize_route_name
+from .loggerhelper import LOGGER
 from .redishelper import REDIS_HELPER
 
 
+ROUTES_INDEX_KEY = 'routes_index'
 KIEV_TZ = pytz.timezone('Europe/Kiev')
 DEFAULT_PREPARING_TIME = 60 * 10
-NOTIFICATIONS_TASKS_KEY = 'notifications'
+NOTIFICATIONS_WHEEL_KEY = 'notifications_wheel'
+WHEEL_BUCKET_SIZE = 60
+
+_UNSCHEDULING = threading.local()
 
 
 def get_seconds_until_midnight():
@@ -22,26 +29,77 @@ def get_seconds_until_midnight():
     return (midnight - today).seconds
 
 
-def get_notifications_tasks():
-    """Retrieve dictionary with data about notifications tasks from Redis."""
-    pickled_notifications = REDIS_HELPER.get(NOTIFICATIONS_TASKS_KEY)
-    if not pickled_notifications:
-        return {}
+def get_wheel_bucket(task_time):
+    """Return timestamp of the minute bucket of notifications wheel that contains `task_time`."""
+    timestamp = int(task_time.timestamp())
+    return timestamp - timestamp % WHEEL_BUCKET_SIZE
+
 
-    notifications_tasks = pickle.loads(pickled_notifications)
-    return notifications_tasks
+def schedule_notifications(notifications_times, replace=False):
+    """
+    Put notifications into buckets of notifications wheel stored in Redis sorted set
+    where `notifications_times` is dictionary with notifications ids and times at
+    which they have to be prepared. Notification that is already in the wheel is
+    moved to the new bucket. If `replace` is True the whole wheel is replaced.
+    """
+    buckets = {notification_id: get_wheel_bucket(task_time)
+               for notification_id, task_time in notifications_times.items()}
 
+    return REDIS_HELPER.zadd(NOTIFICATIONS_WHEEL_KEY, mapping=buckets, replace=replace)
 
-def set_notifications_tasks(notifications_tasks):
-    """Set pickled dictionary with data about notification tasks to Redis."""
-    cache_time = get_seconds_until_midnight()
-    inserted = REDIS_HELPER.set(
-        NOTIFICATIONS_TASKS_KEY,
-        pickle.dumps(notifications_tasks),
-        cache_time=cache_time
-    )
 
-    return inserted
+def unschedule_notifications(notifications_ids):
+    """Remove notifications with `notifications_ids` from notifications wheel."""
+    return REDIS_HELPER.zrem(NOTIFICATIONS_WHEEL_KEY, notifications_ids)
+
+
+@contextmanager
+def unscheduling_batch():
+    """
+    Collect ids of notifications deferred with `defer_unscheduling` within the block
+    and remove them from notifications wheel with a single command when the block
+    succeeds. Nested blocks are joined into the outermost one.
+    """
+    if getattr(_UNSCHEDULING, 'ids', None) is not None:
+        yield
+        return
+
+    _UNSCHEDULING.ids = []
+    try:
+        yield
+        notifications_ids = _UNSCHEDULING.ids
+    finally:
+        _UNSCHEDULING.ids = None
+
+    if notifications_ids and not unschedule_notifications(notifications_ids):
+        LOGGER.error(f'Failed to unschedule notifications (ids={notifications_ids}).')
+
+
+def defer_unscheduling(notification_id):
+    """
+    Add notification to the batch of the current `unscheduling_batch` block.
+    Return False if there is no such block, so it has to be unscheduled at once.
+    """
+    notifications_ids = getattr(_UNSCHEDULING, 'ids', None)
+    if notifications_ids is None:
+        return False
+
+    notifications_ids.append(notification_id)
+    return True
+
+
+def pop_due_notifications(now=None):
+    """
+    Retrieve and remove ids of notifications from every bucket of notifications
+    wheel up to the bucket of the current minute. Return None if wheel is unavailable.
+    """
+    now = now or datetime.now(tz=KIEV_TZ)
+    notifications_ids = REDIS_HELPER.pop_range_by_score(NOTIFICATIONS_WHEEL_KEY,
+                                                        get_wheel_bucket(now))
+    if notifications_ids is None:
+        return None
+
+    return [int(notification_id) for notification_id in notifications_ids]
 
 
 def get_prepare_task_time(notification_time, time_to_stop=None,
@@ -64,12 +122,13 @@ def get_prepare_task_time(notification_time, time_to_stop=None,
     return task_time
 
 
-def get_route_id_by_name(routes_data, route_name):
-    """Find route id by route name."""
-    for route_id, short_name in routes_data.items():
-        if route_name == short_name:
-            return route_id
-    return None
+def get_route_id_by_name(route_name, key=ROUTES_INDEX_KEY):
+    """Find route id by route name in the reverse index of routes from Redis hash `key`."""
+    routes_ids = REDIS_HELPER.hget(key, normalize_route_name(route_name))
+    if not routes_ids:
+        return None
+
+    return routes_ids.decode().split(',')[0]
 
 
 def get_preparing_time(time_to_stop):
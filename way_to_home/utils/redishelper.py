@@ -38,5 +38,160 @@ class RedisWorker:
 
         return obj
 
+    def set_many(self, mapping, cache_time=None):
+        """Atomically sets every key of `mapping` with specifying the expire time."""
+        try:
+            pipeline = self.__redis.pipeline(transaction=True)
+            for key, value in mapping.items():
+                pipeline.set(key, value, cache_time)
+
+            pipeline.execute()
+        except RedisError:
+            return False
+
+        return True
+
+    def delete(self, keys):
+        """Removes `keys` from redis database."""
+        try:
+            self.__redis.delete(*keys)
+        except RedisError:
+            return False
+
+        return True
+
+    def incr(self, key):
+        """Increments integer value of `key` and returns the new value."""
+        try:
+            value = self.__redis.incr(key)
+        except RedisError:
+            return None
+
+        return value
+
+    def hget(self, name, key):
+        """Retrieves value of `key` field from redis hash `name`."""
+        try:
+            value = self.__redis.hget(name, key)
+        except RedisError:
+            return None
+
+        return value
+
+    def hlen(self, name):
+        """Retrieves number of fields of redis hash `name`."""
+        try:
+            length = self.__redis.hlen(name)
+        except RedisError:
+            return None
+
+        return length
+
+    def hmget(self, name, keys):
+        """Retrieves list of values of `keys` fields from redis hash `name`."""
+        try:
+            values = self.__redis.hmget(name, keys)
+        except RedisError:
+            return None
+
+        return values
+
+    def update_hash(self, name, mapping=None, removed_keys=None, replace=False):
+        """
+        Atomically sets `mapping` fields and removes `removed_keys` fields of redis
+        hash `name`. If `replace` is True all previous fields are removed as well.
+        """
+        try:
+            pipeline = self.__redis.pipeline(transaction=True)
+            if replace:
+                pipeline.delete(name)
+            elif removed_keys:
+                pipeline.hdel(name, *removed_keys)
+
+            if mapping:
+                pipeline.hmset(name, mapping)
+
+            pipeline.execute()
+        except RedisError:
+            return False
+
+        return True
+
+    def zadd(self, name, mapping=None, replace=False):
+        """
+        Atomically adds `mapping` members with their scores into redis sorted set
+        `name`. If `replace` is True all previous members are removed as well.
+        """
+        try:
+            pipeline = self.__redis.pipeline(transaction=True)
+            if replace:
+                pipeline.delete(name)
+
+            if mapping:
+                pipeline.zadd(name, mapping)
+
+            pipeline.execute()
+        except RedisError:
+            return False
+
+        return True
+
+    def zrem(self, name, members):
+        """Removes `members` from redis sorted set `name`."""
+        try:
+            self.__redis.zrem(name, *members)
+        except RedisError:
+            return False
+
+        return True
+
+    def pop_range_by_score(self, name, max_score):
+        """
+        Atomically retrieves and removes members of redis sorted
+        set `name` whose scores are not greater than `max_score`.
+        """
+        try:
+            pipeline = self.__redis.pipeline(transaction=True)
+            pipeline.zrangebyscore(name, '-inf', max_score)
+            pipeline.zremrangebyscore(name, '-inf', max_score)
+            members, _ = pipeline.execute()
+        except RedisError:
+            return None
+
+        return members
+
+    def lpush(self, name, values):
+        """Prepends `values` to the head of redis list `name`."""
+        try:
+            self.__redis.lpush(name, *values)
+        except RedisError:
+            return False
+
+        return True
+
+    def move_many(self, source, destination, count):
+        """
+        Moves up to `count` values one by one from the tail of list `source` to the head
+        of list `destination`, every move is atomic. Return list of moved values.
+        """
+        try:
+            pipeline = self.__redis.pipeline(transaction=False)
+            for _ in range(count):
+                pipeline.rpoplpush(source, destination)
+            values = pipeline.execute()
+        except RedisError:
+            return None
+
+        return [value for value in values if value is not None]
+
+    def lrem(self, name, value):
+        """Removes the first occurrence of `value` from redis list `name`."""
+        try:
+            self.__redis.lrem(name, 1, value)
+        except RedisError:
+            return False
+
+        return True
+
 
 REDIS_HELPER = RedisWorker()
@@ -1,22 +1,132 @@
-"""This module provides helper functions to send SMS and emails."""
+"""
+Sender helper
+=============
+This module provides helper functions to send SMS, telegram messages and emails.
+Messages are sent by long-lived clients of the current process which keep their
+HTTP connections alive, batches of messages are sent concurrently with at most
+`CHANNEL_WORKERS` requests of a channel and latency of every channel is measured.
+"""
 
+import threading
+import time
+from functools import wraps
 from smtplib import SMTPRecipientsRefused
+
 import nexmo
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 
 from django.conf import settings
 from django.core.mail import send_mail
 from telebot import TeleBot, apihelper
 
+from .executorhelper import LazyExecutor
+
+
+SMS_CHANNEL = 'sms'
+TELEGRAM_CHANNEL = 'telegram'
+CHANNEL_WORKERS = {
+    SMS_CHANNEL: 5,
+    TELEGRAM_CHANNEL: 10
+}
+REQUEST_TIMEOUT = (3.05, 10)
+TOO_MANY_REQUESTS = 429
+
+
+class SMSClient(nexmo.Client):
+    """Nexmo client which sends requests through the long-lived keep-alive session."""
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the new SMSClient instance."""
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_maxsize=CHANNEL_WORKERS[SMS_CHANNEL]))
+
+    def post(self, host, request_uri, params, header_auth=False):
+        """Send POST request authenticated by params through the session."""
+        if header_auth:
+            return super().post(host, request_uri, params, header_auth)
+
+        params = dict(params, api_key=self.api_key, api_secret=self.api_secret)
+        response = self.session.post(f'https://{host}{request_uri}',
+                                     data=params,
+                                     headers=self.headers,
+                                     timeout=REQUEST_TIMEOUT)
+
+        return self.parse(host, response)
+
+
+class ChannelStats:
+    """Provide thread safe statistics of latency of messages sent through the channel."""
+
+    def __init__(self):
+        """Initializes the new ChannelStats instance."""
+        self.sent = 0
+        self.failed = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.__lock = threading.Lock()
+
+    def observe(self, latency, was_sent):
+        """Take into account message that was sent or failed in `latency` seconds."""
+        with self.__lock:
+            if was_sent:
+                self.sent += 1
+            else:
+                self.failed += 1
+            self.total_time += latency
+            self.max_time = max(self.max_time, latency)
+
+    @property
+    def average_time(self):
+        """Return average latency of message of the channel in seconds."""
+        count = self.sent + self.failed
+        return self.total_time / count if count else 0.0
+
+    def to_dict(self):
+        """Return dict with statistics of the channel."""
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'average_time': self.average_time,
+            'max_time': self.max_time
+        }
+
+
+SMS_CLIENT = SMSClient(key=settings.NEXMO_API_KEY, secret=settings.NEXMO_API_SECRET)
+TELEGRAM_BOT = TeleBot(settings.TELEGRAM_BOT_TOKEN)
+CHANNEL_STATS = {channel: ChannelStats() for channel in CHANNEL_WORKERS}
+_EXECUTORS = {channel: LazyExecutor(workers) for channel, workers in CHANNEL_WORKERS.items()}
+
+
+def _measured(channel):
+    """Return decorator that observes latency of send function in statistics of `channel`."""
+    def decorator(send_function):
+        @wraps(send_function)
+        def wrapper(*args, **kwargs):
+            started_at = time.monotonic()
+            was_sent = send_function(*args, **kwargs)
+            CHANNEL_STATS[channel].observe(time.monotonic() - started_at, was_sent)
+            return was_sent
 
+        return wrapper
+
+    return decorator
+
+
+@_measured(SMS_CHANNEL)
 def send_sms(phone_number, message):
     """Send message to the specific phone number."""
-    client = nexmo.Client(key=settings.NEXMO_API_KEY, secret=settings.NEXMO_API_SECRET)
-    response = client.send_message({
-        'from': 'Way to Home',
-        'to': phone_number,
-        'text': message,
-        'type': 'unicode'
-    })
+    try:
+        response = SMS_CLIENT.send_message({
+            'from': 'Way to Home',
+            'to': phone_number,
+            'text': message,
+            'type': 'unicode'
+        })
+    except (nexmo.Error, RequestException):
+        return False
 
     response = response['messages'][0]
     if response['status'] != '0':
@@ -39,11 +149,55 @@ def send_email(to_email, html_message, mail_subject, message):
     return True
 
 
-def send_telegram_message(chat_id, text):
-    """This function sends telegram message with given text to user"""
-    bot = TeleBot(settings.TELEGRAM_BOT_TOKEN)
+def get_retry_after(error):
+    """Return number of seconds from `retry_after` hint of Telegram API error or None."""
+    response = getattr(error, 'result', None)
+    if getattr(response, 'status_code', None) != TOO_MANY_REQUESTS:
+        return None
+
     try:
-        bot.send_message(chat_id=chat_id, text=text)
-    except apihelper.ApiException:
-        return False
-    return True
+        return response.json()['parameters']['retry_after']
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def deliver_telegram_message(chat_id, text):
+    """
+    Send telegram message with given text to user. Return tuple with flag whether
+    message was sent and number of seconds to wait before the next attempt given
+    by Telegram if message was rejected because of rate limits, otherwise None.
+    """
+    started_at = time.monotonic()
+    try:
+        TELEGRAM_BOT.send_message(chat_id=chat_id, text=text)
+        result = True, None
+    except apihelper.ApiException as err:
+        result = False, get_retry_after(err)
+    except RequestException:
+        result = False, None
+
+    CHANNEL_STATS[TELEGRAM_CHANNEL].observe(time.monotonic() - started_at, result[0])
+    return result
+
+
+CHANNEL_SENDERS = {
+    SMS_CHANNEL: send_sms
+}
+
+
+def send_batch(channel, messages):
+    """
+    Send list of tuples with recipient and text of message through the channel
+    concurrently with at most `CHANNEL_WORKERS` requests at the same time.
+    Return list with flags whether every message was sent in the same order.
+    """
+    send_function = CHANNEL_SENDERS[channel]
+    recipients = [recipient for recipient, _ in messages]
+    texts = [text for _, text in messages]
+
+    return list(_EXECUTORS[channel].get().map(send_function, recipients, texts))
+
+
+def get_channels_stats():
+    """Return dictionary with latency statistics of every channel."""
+    return {channel: stats.to_dict() for channel, stats in CHANNEL_STATS.items()}
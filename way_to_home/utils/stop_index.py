@@ -0,0 +1,162 @@
+"""
+Stop index
+==========
+This module provides spatial index of static stops built on grid buckets,
+that allows to find the nearest stops and stops within the radius
+without scanning all of the stops.
+"""
+
+import math
+import pickle
+import time
+from collections import defaultdict
+
+from .etahelper import haversine
+from .feeds import find_city, get_city_key
+from .redishelper import REDIS_HELPER
+
+
+STOP_INDEX_KEY = 'stops_index'
+STOP_INDEX_CACHE_TIME = 60 * 60
+SNAP_DISTANCE = 100
+CELL_SIZE = 0.005
+METERS_PER_DEGREE = 111320
+
+_STOP_INDEX_CACHE = {}
+
+
+class StopIndex:
+    """Grid index of stops coordinates."""
+
+    def __init__(self, stops, cell_size=CELL_SIZE):
+        """
+        Initializes the new StopIndex instance from dictionary where
+        key is id of stop and value is tuple with its coordinates.
+        """
+        self.cell_size = cell_size
+        self.buckets = defaultdict(list)
+        for stop_id, (latitude, longitude) in stops.items():
+            latitude, longitude = float(latitude), float(longitude)
+            self.buckets[self._get_cell(latitude, longitude)].append((stop_id, latitude, longitude))
+
+        self.buckets = dict(self.buckets)
+        rows = [row for row, _ in self.buckets] or [0]
+        columns = [column for _, column in self.buckets] or [0]
+        self.bounds = (min(rows), min(columns), max(rows), max(columns))
+
+    def __len__(self):
+        """Return number of indexed stops."""
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    def _get_cell(self, latitude, longitude):
+        """Return grid cell that contains the point."""
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def _get_ring(self, cell, radius):
+        """Return stops of indexed cells that are exactly `radius` cells away from `cell`."""
+        row, column = cell
+        min_row, min_column, max_row, max_column = self.bounds
+
+        stops = []
+        for current_row in range(max(row - radius, min_row), min(row + radius, max_row) + 1):
+            if abs(current_row - row) == radius:
+                columns = range(max(column - radius, min_column),
+                                min(column + radius, max_column) + 1)
+            else:
+                columns = {column - radius, column + radius}
+
+            for current_column in columns:
+                stops.extend(self.buckets.get((current_row, current_column), ()))
+
+        return stops
+
+    def _get_rings_range(self, cell):
+        """Return range of rings around `cell` that intersect indexed cells."""
+        row, column = cell
+        min_row, min_column, max_row, max_column = self.bounds
+
+        first_ring = max(0, min_row - row, row - max_row, min_column - column, column - max_column)
+        last_ring = max(abs(row - min_row), abs(row - max_row),
+                        abs(column - min_column), abs(column - max_column))
+
+        return range(first_ring, last_ring + 1)
+
+    def _get_cell_meters(self, latitude):
+        """Return the smallest dimension of grid cell in meters at `latitude`."""
+        return self.cell_size * METERS_PER_DEGREE * math.cos(math.radians(latitude))
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+        Return list of up to `k` tuples with id of stop and distance
+        in meters to the point, sorted by the distance.
+        """
+        cell = self._get_cell(latitude, longitude)
+        cell_meters = self._get_cell_meters(latitude)
+
+        candidates = []
+        for radius in self._get_rings_range(cell):
+            for stop_id, stop_latitude, stop_longitude in self._get_ring(cell, radius):
+                distance = haversine(latitude, longitude, stop_latitude, stop_longitude)
+                candidates.append((distance, stop_id))
+
+            candidates.sort()
+            if len(candidates) >= k and candidates[k - 1][0] <= radius * cell_meters:
+                break
+
+        return [(stop_id, distance) for distance, stop_id in candidates[:k]]
+
+    def within_radius(self, latitude, longitude, radius):
+        """
+        Return list of tuples with id of stop and distance in meters
+        for every stop within `radius` meters, sorted by the distance.
+        """
+        cell = self._get_cell(latitude, longitude)
+        rings = math.ceil(radius / self._get_cell_meters(latitude))
+
+        stops = []
+        for ring in self._get_rings_range(cell):
+            if ring > rings:
+                break
+            for stop_id, stop_latitude, stop_longitude in self._get_ring(cell, ring):
+                distance = haversine(latitude, longitude, stop_latitude, stop_longitude)
+                if distance <= radius:
+                    stops.append((distance, stop_id))
+
+        return [(stop_id, distance) for distance, stop_id in sorted(stops)]
+
+
+def get_stop_index(key=STOP_INDEX_KEY):
+    """Return stop index stored under `key` in Redis which is cached in the current process."""
+    now = time.monotonic()
+    cached_index = _STOP_INDEX_CACHE.get(key)
+    if cached_index and now - cached_index['loaded_at'] < STOP_INDEX_CACHE_TIME:
+        return cached_index['index']
+
+    pickled_index = REDIS_HELPER.get(key)
+    if not pickled_index:
+        return None
+
+    stop_index = pickle.loads(pickled_index)
+    _STOP_INDEX_CACHE[key] = {'index': stop_index, 'loaded_at': now}
+
+    return stop_index
+
+
+def find_stop_id(latitude, longitude, max_distance=SNAP_DISTANCE):
+    """
+    Return id of the nearest stop of the city which contains the point
+    within `max_distance` meters or None.
+    """
+    city = find_city(latitude, longitude)
+    if not city:
+        return None
+
+    stop_index = get_stop_index(get_city_key(city, STOP_INDEX_KEY))
+    if not stop_index:
+        return None
+
+    nearest_stops = stop_index.nearest(float(latitude), float(longitude))
+    if not nearest_stops or nearest_stops[0][1] > max_distance:
+        return None
+
+    return nearest_stops[0][0]
@@ -0,0 +1,99 @@
+"""
+Telegram queue
+==============
+This module provides queue of telegram messages in Redis list, to which celery
+workers enqueue messages without waiting for Telegram, and token buckets used
+by the consumer of the queue to deliver messages within rate limits of Telegram.
+Dequeued messages are kept in the processing list until they are acknowledged,
+so messages which were in flight when the single consumer stopped are restored
+into the queue on its start and delivered at least once.
+"""
+
+import json
+import time
+
+from .redishelper import REDIS_HELPER
+
+
+TELEGRAM_QUEUE_KEY = 'telegram_queue'
+TELEGRAM_PROCESSING_KEY = 'telegram_processing'
+RESTORE_BATCH_SIZE = 100
+GLOBAL_RATE = 30
+CHAT_RATE = 1
+
+
+class TokenBucket:
+    """Provide token bucket that is refilled with `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """Initializes the new TokenBucket instance."""
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated_at = clock()
+
+    def reserve(self):
+        """
+        Take a token from the bucket and return number of seconds to wait until it is
+        available. Token is borrowed from the future if bucket is empty, so callers
+        that wait for the returned delay are spread evenly according to the rate.
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+
+        return -self.tokens / self.rate
+
+    def is_idle(self):
+        """Return True if bucket would be full now, so it can be dropped."""
+        return self.tokens + (self.clock() - self.updated_at) * self.rate >= self.capacity
+
+
+def _dump_message(chat_id, text, attempt):
+    """Return JSON representation of message stored in the queue."""
+    return json.dumps([chat_id, text, attempt])
+
+
+def enqueue_telegram_messages(messages, attempt=0):
+    """Put list of tuples with id of chat and text of message into the queue."""
+    values = [_dump_message(chat_id, text, attempt) for chat_id, text in messages]
+    return REDIS_HELPER.lpush(TELEGRAM_QUEUE_KEY, values)
+
+
+def dequeue_telegram_messages(count):
+    """
+    Move up to `count` the oldest messages from the queue into the processing list.
+    Return list of tuples with id of chat, text of message and number
+    of previous attempts of its sending or None if queue is unavailable.
+    """
+    values = REDIS_HELPER.move_many(TELEGRAM_QUEUE_KEY, TELEGRAM_PROCESSING_KEY, count)
+    if values is None:
+        return None
+
+    return [tuple(json.loads(value)) for value in values]
+
+
+def acknowledge_telegram_message(message):
+    """Remove message which was delivered or enqueued again from the processing list."""
+    return REDIS_HELPER.lrem(TELEGRAM_PROCESSING_KEY, _dump_message(*message))
+
+
+def restore_telegram_messages():
+    """
+    Move messages which were not acknowledged by the previous run of the consumer
+    from the processing list back into the queue. Return number of restored messages.
+    """
+    restored = 0
+    values = REDIS_HELPER.move_many(TELEGRAM_PROCESSING_KEY, TELEGRAM_QUEUE_KEY,
+                                    RESTORE_BATCH_SIZE)
+    while values:
+        restored += len(values)
+        values = REDIS_HELPER.move_many(TELEGRAM_PROCESSING_KEY, TELEGRAM_QUEUE_KEY,
+                                        RESTORE_BATCH_SIZE)
+
+    return restored
@@ -0,0 +1,138 @@
+"""
+Vehicle history
+===============
+This module provides bounded history of the latest positions of every vehicle
+and estimation of vehicle speed and bearing from it.
+
+History of a vehicle is stored in redis hash as a compact block of uint32
+timestamps followed by float32 latitudes and longitudes, so a single vehicle
+is read without touching the rest of vehicles.
+"""
+
+import struct
+from collections import deque
+
+from .etahelper import haversine, get_bearing
+from .redishelper import REDIS_HELPER
+
+
+VEHICLES_HISTORY_KEY = 'vehicles_history'
+HISTORY_SIZE = 6
+STALE_TIME = 60 * 10
+MIN_DISPLACEMENT = 15
+
+_POSITION_SIZE = struct.calcsize('<Iff')
+
+
+def pack_history(positions):
+    """Return bytes with columnar representation of list of (timestamp, lat, lon) tuples."""
+    count = len(positions)
+    timestamps, latitudes, longitudes = zip(*positions)
+
+    return struct.pack(f'<{count}I{count}f{count}f', *timestamps, *latitudes, *longitudes)
+
+
+def unpack_history(block):
+    """
+    Return list of (timestamp, lat, lon) tuples from bytes created by `pack_history`.
+    Return None if block is corrupted.
+    """
+    count, remainder = divmod(len(block), _POSITION_SIZE)
+    if remainder:
+        return None
+
+    values = struct.unpack(f'<{count}I{count}f{count}f', block)
+    return list(zip(values[:count], values[count:2 * count], values[2 * count:]))
+
+
+def get_motion(positions):
+    """
+    Return tuple with speed in meters per second and bearing in degrees of
+    the vehicle smoothed over its history positions. Speed is the length of
+    the path divided by elapsed time and bearing is the direction from the
+    oldest position to the latest one, which is None if vehicle did not move.
+    Return None if history does not allow to estimate motion.
+    """
+    if len(positions) < 2:
+        return None
+
+    elapsed_time = positions[-1][0] - positions[0][0]
+    if elapsed_time <= 0:
+        return None
+
+    path_length = sum(haversine(*start[1:], *end[1:])
+                      for start, end in zip(positions, positions[1:]))
+
+    bearing = None
+    if haversine(*positions[0][1:], *positions[-1][1:]) >= MIN_DISPLACEMENT:
+        bearing = get_bearing(*positions[0][1:], *positions[-1][1:])
+
+    return path_length / elapsed_time, bearing
+
+
+class VehicleHistory:
+    """Ring buffers with the latest positions of every vehicle."""
+
+    def __init__(self, size=HISTORY_SIZE, stale_time=STALE_TIME):
+        """Initializes the new VehicleHistory instance."""
+        self.size = size
+        self.stale_time = stale_time
+        self.positions = {}
+
+    def update(self, gtfs_data, timestamp):
+        """
+        Append positions of vehicles from compiled GTFS data, where vehicle
+        without own timestamp is considered to be located at `timestamp`.
+        Forget vehicles which were not updated for `stale_time` seconds.
+        Return tuple with lists of ids of updated and forgotten vehicles.
+        """
+        updated_vehicles = []
+        for vehicles in gtfs_data.values():
+            for vehicle in vehicles:
+                vehicle_id = vehicle['vehicle_id']
+                position = (vehicle.get('timestamp') or timestamp, vehicle['lat'], vehicle['lon'])
+
+                history = self.positions.setdefault(vehicle_id, deque(maxlen=self.size))
+                if history and history[-1][0] >= position[0]:
+                    continue
+
+                history.append(position)
+                updated_vehicles.append(vehicle_id)
+
+        stale_vehicles = [vehicle_id for vehicle_id, history in self.positions.items()
+                          if timestamp - history[-1][0] > self.stale_time]
+        for vehicle_id in stale_vehicles:
+            del self.positions[vehicle_id]
+
+        return updated_vehicles, stale_vehicles
+
+    def publish(self, updated_vehicles, stale_vehicles, replace=False, key=VEHICLES_HISTORY_KEY):
+        """
+        Publish history of updated vehicles into redis hash `key` in a single
+        transaction, removing stale vehicles or all of the previous ones if `replace`.
+        """
+        mapping = {vehicle_id: pack_history(self.positions[vehicle_id])
+                   for vehicle_id in updated_vehicles}
+
+        return REDIS_HELPER.update_hash(key, mapping=mapping,
+                                        removed_keys=stale_vehicles, replace=replace)
+
+
+def get_vehicles_motion(vehicles_ids, key=VEHICLES_HISTORY_KEY):
+    """
+    Return dictionary where key is id of vehicle and value is tuple with its
+    speed and bearing for every vehicle whose motion can be estimated.
+    """
+    if not vehicles_ids:
+        return {}
+
+    blocks = REDIS_HELPER.hmget(key, vehicles_ids) or []
+
+    motions = {}
+    for vehicle_id, block in zip(vehicles_ids, blocks):
+        positions = unpack_history(block) if block else None
+        motion = get_motion(positions) if positions else None
+        if motion:
+            motions[vehicle_id] = motion
+
+    return motions
@@ -0,0 +1,49 @@
+"""
+Way cache
+=========
+This module provides per-user cache of ways with their routes in Redis.
+Ways are cached under the current generation of the user, which is bumped
+by signals on writes of ways and routes. So ways which were built from the
+data read before such write and cached after it are never read again.
+"""
+
+import pickle
+
+from .redishelper import REDIS_HELPER
+
+
+USER_WAYS_KEY = 'user_ways'
+USER_WAYS_GENERATION_KEY = 'user_ways_generation'
+USER_WAYS_CACHE_TIME = 60 * 60
+
+
+def get_user_ways_key(user_id, generation):
+    """Return redis key which stores ways of the user of the certain generation."""
+    return f'{USER_WAYS_KEY}:{user_id}:{generation}'
+
+
+def get_user_ways_generation(user_id):
+    """Retrieve the current generation of cached ways of the user from redis."""
+    generation = REDIS_HELPER.get(f'{USER_WAYS_GENERATION_KEY}:{user_id}')
+    return int(generation) if generation else 0
+
+
+def get_cached_user_ways(user_id, generation):
+    """Retrieve list of ways with routes of the user of the generation from redis or None."""
+    pickled_ways = REDIS_HELPER.get(get_user_ways_key(user_id, generation))
+    if not pickled_ways:
+        return None
+
+    return pickle.loads(pickled_ways)
+
+
+def cache_user_ways(user_id, generation, ways):
+    """Store list of ways with routes of the user built during the generation in redis."""
+    return REDIS_HELPER.set(get_user_ways_key(user_id, generation),
+                            pickle.dumps(ways),
+                            USER_WAYS_CACHE_TIME)
+
+
+def invalidate_user_ways(user_id):
+    """Bump generation of cached ways of the user, so the cached ways are not read anymore."""
+    return REDIS_HELPER.incr(f'{USER_WAYS_GENERATION_KEY}:{user_id}') is not None
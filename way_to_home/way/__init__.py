@@ -0,0 +1,3 @@
+"""Initialization module of Way app."""
+
+default_app_config = 'way.apps.WayConfig'  # pylint: disable=invalid-name
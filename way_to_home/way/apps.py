@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class WayConfig(AppConfig):
     name = 'way'
+
+    def ready(self):
+        import way.signals
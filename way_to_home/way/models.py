@@ -5,6 +5,7 @@ from django.db.utils import OperationalError
 from custom_user.models import CustomUser
 from utils.abstract_models import AbstractModel
 from utils.loggerhelper import LOGGER
+from utils.notificationhelper import unscheduling_batch
 
 
 class Way(AbstractModel):
@@ -16,12 +17,17 @@ class Way(AbstractModel):
         """Method that returns route instance as string."""
         return f'Way id: {self.id}, user id: {self.user.id}'
 
+    def delete(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Delete the way and unschedule its notifications with a single command."""
+        with unscheduling_batch():
+            return super().delete(*args, **kwargs)
+
     def to_dict(self):
         """Method that returns dict with object's attributes."""
         return {
             'id': self.id,
             'name': self.name,
-            'user_id': self.user.id
+            'user_id': self.user_id
         }
 
     def get_way_with_routes(self):
@@ -30,6 +36,15 @@ class Way(AbstractModel):
         way['routes'] = [route.to_dict() for route in self.routes.all()]
         return way
 
+    @classmethod
+    def get_user_ways_with_routes(cls, user_id):
+        """
+        Return list of dictionaries with info of every way of the user and its routes,
+        that is built with two queries as routes of all ways are prefetched at once.
+        """
+        ways = cls.objects.filter(user_id=user_id).prefetch_related('routes')
+        return [way.get_way_with_routes() for way in ways]
+
     @classmethod
     def create(cls, user, name=None):  # pylint: disable=arguments-differ
         """Method for object creation."""
@@ -49,8 +64,3 @@ class Way(AbstractModel):
             return self.routes.get(position=position)
         except (ObjectDoesNotExist, OperationalError, ValueError):
             pass
-
-    @classmethod
-    def get_by_notification(cls, notification_id):
-        """Return Way object by notification_id"""
-        return cls.objects.get(notifications__id=notification_id)
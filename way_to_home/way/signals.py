@@ -0,0 +1,46 @@
+"""
+This module provides signals which invalidate cached ways of the user on writes
+of Way and Route models. Places are represented in cached ways only by ids of
+routes places, so they are invalidated by deleting of routes on places deletion.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from route.models import Route
+from utils.loggerhelper import LOGGER
+from utils.way_cache import invalidate_user_ways
+from .models import Way
+
+
+def _invalidate_on_commit(user_id):
+    """
+    Remove cached ways of the user after the current transaction is committed,
+    so ways are not cached again with uncommitted data in the meantime.
+    """
+    def invalidate():
+        if not invalidate_user_ways(user_id):
+            LOGGER.error(f'Failed to invalidate cached ways of user (id={user_id}).')
+
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_delete, sender=Way)
+@receiver(post_save, sender=Way)
+def invalidate_way(sender, instance, **kwargs):  # pylint:disable=unused-argument
+    """Provides invalidation of cached ways of the way owner."""
+    _invalidate_on_commit(instance.user_id)
+
+
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Route)
+def invalidate_route(sender, instance, **kwargs):  # pylint:disable=unused-argument
+    """Provides invalidation of cached ways of the owner of the route way."""
+    try:
+        user_id = instance.way.user_id
+    except Way.DoesNotExist:
+        return False
+
+    _invalidate_on_commit(user_id)
+    return True
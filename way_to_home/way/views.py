@@ -15,9 +15,14 @@ from utils.responsehelper import (RESPONSE_403_ACCESS_DENIED,
                                   RESPONSE_400_INVALID_DATA,
                                   RESPONSE_200_DELETED)
 
+from utils.stop_index import find_stop_id
+from utils.way_cache import get_user_ways_generation, get_cached_user_ways, cache_user_ways
 from utils.validators import way_data_validator, route_data_validator
 
 
+MAX_STOP_ID = 32767
+
+
 class WayView(View):
     """Class-based view for way model."""
 
@@ -38,7 +43,11 @@ class WayView(View):
         """
         user = request.user
         if not way_id:
-            data = [way.get_way_with_routes() for way in user.ways.all()]
+            generation = get_user_ways_generation(user.id)
+            data = get_cached_user_ways(user.id, generation)
+            if data is None:
+                data = Way.get_user_ways_with_routes(user.id)
+                cache_user_ways(user.id, generation, data)
 
             return JsonResponse(data, status=200, safe=False)
 
@@ -188,6 +197,7 @@ def _create_route(way, position, **kwargs):
     """
     start_place = kwargs.get('start_place')
     end_place = kwargs.get('end_place')
+    transport_name = kwargs.get('transport_name')
 
     if isinstance(start_place, int):
         start_place = Place.get_by_id(start_place)
@@ -195,8 +205,10 @@ def _create_route(way, position, **kwargs):
         start_place.user_id = None
         start_place.save()
     else:
+        stop_id = _find_place_stop_id(start_place) if transport_name else None
         start_place = Place.create(longitude=start_place['longitude'],
-                                   latitude=start_place['latitude'])
+                                   latitude=start_place['latitude'],
+                                   stop_id=stop_id)
 
     if isinstance(end_place, int):
         end_place = Place.get_by_id(end_place)
@@ -211,10 +223,35 @@ def _create_route(way, position, **kwargs):
         return False
 
     time = kwargs.get('time')
-    transport_name = kwargs.get('transport_name')
     route_obj = Route.create(way=way, start_place=start_place, end_place=end_place,
                              time=time, position=position, transport_name=transport_name)
 
     if not route_obj:
         return False
     return True
+
+
+def _find_place_stop_id(place):
+    """
+        Function for snapping place to the nearest static stop
+
+        :param place: Dict with place coordinates. Is required
+        :type place: dict
+
+        :return id of the nearest stop as int or None
+                if there is no stop near the place or its id
+                is not a number which fits `Place.stop_id` field
+    """
+    stop_id = find_stop_id(latitude=place['latitude'], longitude=place['longitude'])
+    if not stop_id:
+        return None
+
+    try:
+        stop_id = int(stop_id)
+    except ValueError:
+        return None
+
+    if not 0 <= stop_id <= MAX_STOP_ID:
+        return None
+
+    return stop_id
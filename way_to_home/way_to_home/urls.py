@@ -19,5 +19,6 @@ urlpatterns = [
     path('api/v1/user/', include('custom_user.urls')),
     path('api/v1/way/', include('way.urls')),
     path('api/v1/place/', include('place.urls')),
+    path('api/v1/telegram/', include('telegram_bot.urls')),
     re_path('.*', include('home.urls'))
 ]